@@ -0,0 +1,274 @@
+"""Load and latency benchmark for the auth and user APIs, with a regression check.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_api                       # run and compare with the baseline
+    python -m benchmarks.bench_api --save-baseline       # run and store the result as the baseline
+
+The full application (main.app, with its middleware) is driven in-process over ASGI with
+httpx. Secrets come from the environment secret provider, and the database is a temporary
+SQLite file unless --database-url points at a scratch MySQL-compatible server; its tables
+are dropped and recreated. Each endpoint is driven by --concurrency clients for --requests
+requests after a short warm-up, and throughput and p50/p95/p99 latencies are reported.
+
+When a baseline exists, the run fails (exit status 1) if an endpoint's throughput drops,
+or its p95 latency grows, by more than --tolerance. Baselines are machine specific: store
+one on the machine that runs the comparison. With --ci (or CI set in the environment), a
+missing baseline fails the run instead of skipping the comparison. Logins hash with BCRYPT_ROUNDS (default 4 here,
+so the run measures the service rather than bcrypt).
+"""
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+os.environ.setdefault('SECRET_PROVIDER', 'env')
+os.environ.setdefault('SECRET_PROJECT_WATCH', '{"username": "bench", "password": "bench", "host": "localhost"}')
+os.environ.setdefault('SECRET_JWT', '{"KEY": "benchmark-key"}')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+os.environ.setdefault('LOGIN_THROTTLE_ENABLED', 'false')  # Every login comes from one client address
+os.environ.setdefault('LOG_LEVEL', 'ERROR')  # SQLite lock waits would log as slow queries
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import scoped_session  # noqa: E402
+
+from models.SQLModel import Base  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline_api.json")
+ENDPOINTS = ("login", "me", "read", "create")
+PASSWORD = "Passw0rd!bench"
+
+# SQLite DDL with real CURRENT_TIMESTAMP defaults, so /user/create can refresh its row
+SQLITE_SCHEMA = (
+    """CREATE TABLE users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username VARCHAR(50) NOT NULL UNIQUE,
+        password_hash VARCHAR(255) NOT NULL,
+        is_active BOOLEAN,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""",
+    """CREATE TABLE user_profiles (
+        user_id INTEGER PRIMARY KEY REFERENCES users (user_id),
+        first_name VARCHAR(50),
+        last_name VARCHAR(50))""",
+)
+
+
+def prepare_database(url: str, users: int, password_hash: str):
+    """Create the schema and seed `users` active users sharing one password."""
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        if engine.dialect.name == "sqlite":
+            connection.execute(text("PRAGMA journal_mode=WAL"))
+            for statement in SQLITE_SCHEMA:
+                connection.execute(text(statement))
+        else:
+            Base.metadata.drop_all(connection)
+            Base.metadata.create_all(connection)
+        now = datetime.datetime.now()
+        connection.execute(
+            Base.metadata.tables["users"].insert(),
+            [{"username": f"bench{i}", "password_hash": password_hash, "is_active": True,
+              "created_at": now, "updated_at": now} for i in range(users)],
+        )
+        connection.execute(
+            Base.metadata.tables["user_profiles"].insert(),
+            [{"user_id": user_id, "first_name": "First", "last_name": "Last"}
+             for user_id in connection.execute(text("SELECT user_id FROM users")).scalars()],
+        )
+    engine.dispose()
+
+
+def bind_application(url: str, pool_size: int):
+    """Point the ServerManager at the benchmark database and return the application."""
+    from main import app
+    from utils.PoolMetrics import TimedQueuePool, label_pool
+    from utils.QueryInstrumentation import instrument_engine
+    from utils.ServerManager import ServerManager
+
+    manager = ServerManager()
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    manager.engine = create_engine(url, poolclass=TimedQueuePool, pool_size=pool_size, max_overflow=pool_size,
+                                   connect_args=connect_args)
+    manager.default_schema = manager.engine.url.database
+    label_pool(manager.engine, "bench")
+    instrument_engine(manager.engine)
+    manager.SessionLocal.configure(bind=manager.engine)
+    manager.scoped_session = scoped_session(manager.SessionLocal)
+    return app
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+class Scenarios:
+    """One request per endpoint, each checked for its expected status."""
+
+    def __init__(self, client: httpx.AsyncClient, users: int):
+        self.client = client
+        self.users = users
+        self.tokens: List[str] = []
+        self._new_user = itertools.count()
+
+    async def _login(self, username: str) -> httpx.Response:
+        return await self.client.post("/auth/login", data={"username": username, "password": PASSWORD})
+
+    async def issue_tokens(self, count: int):
+        for i in range(min(count, self.users)):
+            response = await self._login(f"bench{i}")
+            response.raise_for_status()
+            self.tokens.append(response.json()["access_token"])
+
+    async def login(self):
+        return await self._login(f"bench{random.randrange(self.users)}"), 200
+
+    async def me(self):
+        token = random.choice(self.tokens)
+        return await self.client.get("/auth/me", headers={"Authorization": f"Bearer {token}"}), 200
+
+    async def read(self):
+        return await self.client.get(f"/user/read/{random.randint(1, self.users)}"), 200
+
+    async def create(self):
+        payload = {"username": f"new{next(self._new_user)}", "password": PASSWORD,
+                   "first_name": "First", "last_name": "Last"}
+        return await self.client.post("/user/create", json=payload), 201
+
+
+async def drive(call: Callable[[], Awaitable], requests: int, concurrency: int) -> dict:
+    latencies = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            response, expected = await call()
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != expected:
+                raise RuntimeError(f"{response.request.method} {response.request.url.path} returned "
+                                   f"{response.status_code}: {response.text[:200]}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Regressions beyond `tolerance` (a fraction) in throughput or p95 latency."""
+    regressions = []
+    for endpoint, result in results.items():
+        reference = baseline.get(endpoint)
+        if reference is None:
+            continue
+        if result["rps"] < reference["rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: throughput {result['rps']} req/s, baseline {reference['rps']} req/s")
+        if result["p95_ms"] > reference["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {result['p95_ms']} ms, baseline {reference['p95_ms']} ms")
+    return regressions
+
+
+def run_settings(args, dialect: str) -> dict:
+    return {"requests": args.requests, "concurrency": args.concurrency, "users": args.users,
+            "bcrypt_rounds": int(os.environ['BCRYPT_ROUNDS']), "database": dialect,
+            "python": platform.python_version()}
+
+
+async def run(args, url: str) -> Dict[str, dict]:
+    from security.AuthConfig import AuthConfig
+
+    prepare_database(url, args.users, AuthConfig().pwd_context.hash(PASSWORD))
+    app = bind_application(url, pool_size=min(args.concurrency, 40))
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            scenarios = Scenarios(client, args.users)
+            await scenarios.issue_tokens(args.concurrency)
+            for endpoint in args.endpoints:
+                call = getattr(scenarios, endpoint)
+                await drive(call, args.warmup, args.concurrency)
+                results[endpoint] = await drive(call, args.requests, args.concurrency)
+    finally:
+        from utils.ServerManager import ServerManager
+        ServerManager().engine.dispose()
+        AuthConfig().password_hasher.shutdown()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the auth and user APIs in-process.")
+    parser.add_argument("--requests", type=int, default=int(os.getenv('BENCH_REQUESTS', '1000')),
+                        help="Measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv('BENCH_CONCURRENCY', '32')))
+    parser.add_argument("--warmup", type=int, default=100, help="Unmeasured requests per endpoint")
+    parser.add_argument("--users", type=int, default=int(os.getenv('BENCH_USERS', '1000')), help="Seeded users")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--database-url", default=os.getenv('BENCH_DATABASE_URL'),
+                        help="Scratch database to use instead of a temporary SQLite file (it is reset)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed throughput drop / p95 growth before failing (fraction)")
+    parser.add_argument("--ci", action="store_true", default=os.getenv('CI', '').lower() in ('1', 'true', 'yes'),
+                        help="Fail when there is no baseline to compare with (default: on when CI is set)")
+    args = parser.parse_args(argv)
+    # Let every client wait for the hashing pool instead of being turned away with 503
+    os.environ.setdefault('HASH_QUEUE_SIZE', str(args.concurrency * 2))
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.database_url or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        dialect = url.split(":", 1)[0]
+        results = asyncio.run(run(args, url))
+
+    settings = run_settings(args, dialect)
+    print(f"requests={args.requests} concurrency={args.concurrency} users={args.users} "
+          f"database={dialect} bcrypt_rounds={settings['bcrypt_rounds']}")
+    for endpoint, result in results.items():
+        print(f"{endpoint:<7} {result['rps']:8.1f} req/s   p50 {result['p50_ms']:8.2f} ms   "
+              f"p95 {result['p95_ms']:8.2f} ms   p99 {result['p99_ms']:8.2f} ms")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"settings": settings, "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 1 if args.ci else 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != settings:
+        print(f"Warning: baseline was recorded with different settings: {baseline.get('settings')}")
+    regressions = compare(results, baseline["results"], args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
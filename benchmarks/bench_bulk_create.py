@@ -0,0 +1,122 @@
+"""Benchmark: N calls to POST /user/create vs one POST /user/bulk-create.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_bulk_create
+
+The app is driven in-process over ASGI with httpx against a temporary SQLite file.
+Passwords are hashed with real bcrypt on the hashing pool; BENCH_BCRYPT_ROUNDS (default 4)
+keeps the run short, raise it to 12 to see production hashing cost.
+BENCH_USERS, BENCH_CONCURRENCY (parallel single-create clients) and HASH_POOL_WORKERS tune the run.
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault('SECRET_PROVIDER', 'env')
+os.environ.setdefault('SECRET_PROJECT_WATCH', '{"username": "bench", "password": "bench", "host": "localhost"}')
+os.environ.setdefault('SECRET_JWT', '{"KEY": "benchmark-key"}')
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from passlib.context import CryptContext  # noqa: E402
+from sqlalchemy import create_engine, func, select, text  # noqa: E402
+from sqlalchemy.orm import scoped_session  # noqa: E402
+
+from models.SQLModel import User  # noqa: E402
+from security.AuthConfig import AuthConfig  # noqa: E402
+from security.PasswordHasher import PasswordHasher  # noqa: E402
+from utils.ServerManager import ServerManager  # noqa: E402
+
+USERS = int(os.getenv('BENCH_USERS', '1000'))
+CONCURRENCY = int(os.getenv('BENCH_CONCURRENCY', '8'))
+BCRYPT_ROUNDS = int(os.getenv('BENCH_BCRYPT_ROUNDS', '4'))
+
+# SQLite DDL with real CURRENT_TIMESTAMP defaults, so the single-create path can refresh its row
+SCHEMA = (
+    """CREATE TABLE users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username VARCHAR(50) NOT NULL UNIQUE,
+        password_hash VARCHAR(255) NOT NULL,
+        is_active BOOLEAN,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""",
+    """CREATE TABLE user_profiles (
+        user_id INTEGER PRIMARY KEY REFERENCES users (user_id),
+        first_name VARCHAR(50),
+        last_name VARCHAR(50))""",
+)
+
+
+def build_app(path: str) -> FastAPI:
+    from controllers import UserController
+    manager = ServerManager()
+    manager.engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False},
+                                   pool_size=10, max_overflow=30)
+    with manager.engine.begin() as connection:
+        for statement in SCHEMA:
+            connection.execute(text(statement))
+    manager.SessionLocal.configure(bind=manager.engine)
+    manager.scoped_session = scoped_session(manager.SessionLocal)
+
+    config = AuthConfig()
+    workers = config.password_hasher.workers
+    config.password_hasher = PasswordHasher(CryptContext(schemes=["bcrypt"], bcrypt__rounds=BCRYPT_ROUNDS),
+                                            workers=workers, max_pending=max(CONCURRENCY, 1) * 2)
+
+    app = FastAPI()
+    app.include_router(UserController.router, prefix="/user")
+    return app
+
+
+def payload(prefix: str, i: int) -> dict:
+    return {"username": f"{prefix}{i}", "password": f"Passw0rd!{i}", "first_name": "First", "last_name": "Last"}
+
+
+async def single_create(client: httpx.AsyncClient) -> float:
+    queue = asyncio.Queue()
+    for i in range(USERS):
+        queue.put_nowait(payload("single", i))
+
+    async def worker():
+        while not queue.empty():
+            response = await client.post("/user/create", json=queue.get_nowait())
+            assert response.status_code == 201, response.text
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return time.perf_counter() - started
+
+
+async def bulk_create(client: httpx.AsyncClient) -> float:
+    started = time.perf_counter()
+    response = await client.post("/user/bulk-create", json=[payload("bulk", i) for i in range(USERS)])
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200 and response.json()["created"] == USERS, response.text
+    return elapsed
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        app = build_app(os.path.join(directory, "bench.db"))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            results = {
+                f"create x{USERS} (concurrency {CONCURRENCY})": await single_create(client),
+                "bulk-create": await bulk_create(client),
+            }
+        manager = ServerManager()
+        with manager.engine.connect() as connection:
+            assert connection.scalar(select(func.count()).select_from(User)) == USERS * 2
+        manager.engine.dispose()
+        AuthConfig().password_hasher.shutdown()
+
+    print(f"Creating {USERS} users, bcrypt rounds={BCRYPT_ROUNDS}, "
+          f"hashing workers={AuthConfig().password_hasher.workers}")
+    for name, elapsed in results.items():
+        print(f"{name:<36} {elapsed:8.2f} s   {USERS / elapsed:9.1f} users/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
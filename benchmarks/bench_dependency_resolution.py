@@ -0,0 +1,56 @@
+"""Microbenchmark: per-request service construction, before and after sharing AuthConfig.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_dependency_resolution
+
+Secrets come from the env provider so no AWS access is needed. The legacy path
+therefore under-reports its real cost, which also included a Secrets Manager
+round trip per request.
+"""
+import os
+import timeit
+
+os.environ.setdefault('SECRET_PROVIDER', 'env')
+os.environ.setdefault('SECRET_PROJECT_WATCH', '{"username": "bench", "password": "bench", "host": "localhost"}')
+os.environ.setdefault('SECRET_JWT', '{"KEY": "benchmark-key"}')
+
+from passlib.context import CryptContext  # noqa: E402
+
+from security.AuthService import AuthService  # noqa: E402
+from services.UserService import UserService  # noqa: E402
+from utils.SecretProvider import EnvSecretProvider  # noqa: E402
+
+ITERATIONS = int(os.getenv('BENCH_ITERATIONS', '2000'))
+
+
+def legacy_auth_service():
+    """What AuthService.__init__ used to do on every request."""
+    CryptContext(schemes=["bcrypt"], deprecated="auto")
+    EnvSecretProvider().fetch("JWT")["KEY"]
+
+
+def legacy_user_service():
+    CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def shared_auth_service():
+    service = AuthService(None)
+    return service.secret_key
+
+
+def shared_user_service():
+    UserService(None)
+
+
+def _report(name, legacy, shared):
+    legacy_us = min(timeit.repeat(legacy, number=ITERATIONS, repeat=3)) / ITERATIONS * 1e6
+    shared_us = min(timeit.repeat(shared, number=ITERATIONS, repeat=3)) / ITERATIONS * 1e6
+    print(f"{name:<12} legacy {legacy_us:9.2f} us/req   shared {shared_us:9.2f} us/req   "
+          f"speedup {legacy_us / shared_us:6.1f}x")
+
+
+if __name__ == "__main__":
+    shared_auth_service()  # Warm the singletons and the secret cache
+    _report("AuthService", legacy_auth_service, shared_auth_service)
+    _report("UserService", legacy_user_service, shared_user_service)
@@ -0,0 +1,119 @@
+"""Benchmark: sync (threadpool) routes vs async routes on the same SQLite database.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sync_vs_async
+
+The app is driven in-process over ASGI with httpx, so no server or MySQL is needed.
+The sync stack uses pysqlite through the threadpool, the async stack uses aiosqlite.
+BENCH_REQUESTS, BENCH_CONCURRENCY and BENCH_USERS tune the run.
+"""
+import asyncio
+import datetime
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault('SECRET_PROVIDER', 'env')
+os.environ.setdefault('SECRET_PROJECT_WATCH', '{"username": "bench", "password": "bench", "host": "localhost"}')
+os.environ.setdefault('SECRET_JWT', '{"KEY": "benchmark-key"}')
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import scoped_session, sessionmaker  # noqa: E402
+
+from models.SQLModel import Base, User, UserProfile  # noqa: E402
+from utils.AsyncServerManager import AsyncServerManager  # noqa: E402
+from utils.ServerManager import ServerManager  # noqa: E402
+
+REQUESTS = int(os.getenv('BENCH_REQUESTS', '2000'))
+CONCURRENCY = int(os.getenv('BENCH_CONCURRENCY', '64'))
+USERS = int(os.getenv('BENCH_USERS', '500'))
+
+
+def seed_database(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    now = datetime.datetime.now()
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        User(username=f"user{i}", password_hash="x", is_active=True, created_at=now, updated_at=now,
+             profile=UserProfile(first_name="First", last_name="Last"))
+        for i in range(USERS)
+    )
+    session.commit()
+    session.close()
+    engine.dispose()
+
+
+def build_sync_app(path: str) -> FastAPI:
+    from controllers import UserController
+    manager = ServerManager()
+    # Sized to the threadpool (40 tokens) so blocked request threads cannot starve session teardown
+    manager.engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False},
+                                   pool_size=10, max_overflow=30)
+    manager.SessionLocal.configure(bind=manager.engine)
+    manager.scoped_session = scoped_session(manager.SessionLocal)
+    app = FastAPI()
+    app.include_router(UserController.router, prefix="/user")
+    return app
+
+
+async def build_async_app(path: str) -> FastAPI:
+    from controllers import AsyncUserController
+    os.environ['ASYNC_DATABASE_URL'] = f"sqlite+aiosqlite:///{path}"
+    await AsyncServerManager().set_schema(None)
+    app = FastAPI()
+    app.include_router(AsyncUserController.router, prefix="/user")
+    return app
+
+
+async def drive(app: FastAPI) -> dict:
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(REQUESTS):
+        queue.put_nowait(f"/user/read/{random.randint(1, USERS)}")
+
+    async def worker(client):
+        while not queue.empty():
+            path = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        seed_database(path)
+        results = {
+            "sync": await drive(build_sync_app(path)),
+            "async": await drive(await build_async_app(path)),
+        }
+        await AsyncServerManager().dispose()
+        ServerManager().engine.dispose()
+
+    print(f"GET /user/read/{{id}}  requests={REQUESTS} concurrency={CONCURRENCY}")
+    for name, result in results.items():
+        print(f"{name:<6} {result['rps']:8.1f} req/s   p50 {result['p50_ms']:7.2f} ms   p95 {result['p95_ms']:7.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""Benchmark: CPU per GET /auth/me request with and without the verified-token cache.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_token_cache
+
+The app is driven in-process over ASGI (see bench_api) by one client re-using a small
+set of tokens, as real clients do. CPU time is measured with time.process_time(), so
+waiting does not count. The cost of token verification alone is measured too.
+Each setting is measured in alternating rounds and the lowest figure is kept, since
+per-request CPU is noisy. BENCH_REQUESTS, BENCH_TOKENS and BENCH_ROUNDS tune the run.
+"""
+import asyncio
+import os
+import tempfile
+import time
+import timeit
+
+# Imported first: bench_api sets up the offline environment (secrets, bcrypt rounds, logging)
+from benchmarks.bench_api import PASSWORD, Scenarios, bind_application, prepare_database
+
+import httpx
+
+REQUESTS = int(os.getenv('BENCH_REQUESTS', '2000'))
+TOKENS = int(os.getenv('BENCH_TOKENS', '20'))
+ROUNDS = int(os.getenv('BENCH_ROUNDS', '5'))
+
+
+async def cpu_per_request(client: httpx.AsyncClient, tokens: list) -> float:
+    """Process CPU seconds per /auth/me request, sequentially so nothing else runs."""
+    headers = [{"Authorization": f"Bearer {token}"} for token in tokens]
+    for header in headers:  # Warm the user cache (and the token cache when enabled)
+        assert (await client.get("/auth/me", headers=header)).status_code == 200
+    start = time.process_time()
+    for i in range(REQUESTS):
+        response = await client.get("/auth/me", headers=headers[i % len(headers)])
+        assert response.status_code == 200, response.text
+    return (time.process_time() - start) / REQUESTS
+
+
+def verify_cost(token: str) -> float:
+    """Seconds per AuthService.decode_claims call on an already seen token."""
+    from security.AuthService import AuthService
+    from utils.ServerManager import ServerManager
+
+    session = ServerManager().get_session()
+    try:
+        service = AuthService(session)
+        service.decode_claims(token)
+        runs = 5000
+        return timeit.timeit(lambda: service.decode_claims(token), number=runs) / runs
+    finally:
+        ServerManager().close_session()
+
+
+async def main():
+    from security.AuthConfig import AuthConfig
+
+    config = AuthConfig()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        prepare_database(url, TOKENS, config.pwd_context.hash(PASSWORD))
+        app = bind_application(url, pool_size=4)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            scenarios = Scenarios(client, TOKENS)
+            await scenarios.issue_tokens(TOKENS)
+            for _ in range(ROUNDS):
+                for enabled in (False, True):
+                    config.token_cache.enabled = enabled
+                    config.token_cache.clear()
+                    measured = (await cpu_per_request(client, scenarios.tokens), verify_cost(scenarios.tokens[0]))
+                    best = results.get(enabled, measured)
+                    results[enabled] = (min(best[0], measured[0]), min(best[1], measured[1]))
+        from utils.ServerManager import ServerManager
+        ServerManager().engine.dispose()
+        config.password_hasher.shutdown()
+
+    print(f"GET /auth/me  requests={REQUESTS} distinct tokens={TOKENS} rounds={ROUNDS}")
+    for enabled, (request_cpu, verify) in results.items():
+        label = "cache on" if enabled else "cache off"
+        print(f"{label:<10} {request_cpu * 1e6:8.1f} us CPU/request   {verify * 1e6:8.1f} us/token verification")
+    saved = results[False][0] - results[True][0]
+    print(f"saved      {saved * 1e6:8.1f} us CPU/request ({saved / results[False][0]:.0%})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,167 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from schemas import UserSchema as schema
+from services.AsyncUserService import AsyncUserService
+from utils.AsyncServerManager import AsyncServerManager
+from utils.ServiceDependency import get_async_service_dependency, GenericDependencies, reject_async_routing
+from controllers.UserController import BULK_MAX_ROWS, EXPORT_FORMAT_PATTERN, MAX_PAGE_SIZE, STREAM_CHUNK_SIZE, \
+    read_bulk_items
+from services.UserService import parse_export_columns
+from utils.ExportWriter import FORMATS, encode_header, encode_rows, gzip_chunks_async
+
+# Async counterpart of controllers/UserController.py, mounted when DB_MODE=async
+router = APIRouter()
+user_service_dependency = get_async_service_dependency(AsyncUserService)
+
+
+# Endpoint to create a new user
+@router.post("/create", response_model=schema.User, status_code=status.HTTP_201_CREATED)
+async def create_user(
+        user: schema.UserCreate,
+        user_deps: GenericDependencies[AsyncUserService] = Depends(user_service_dependency)
+):
+    """Create a new user, ensuring no duplicates."""
+    try:
+        return await user_deps.get_service().create_user(user)
+    except HTTPException as e:
+        raise e
+
+
+# Endpoint to create many users from a JSON array or NDJSON body
+@router.post("/bulk-create", response_model=schema.BulkCreateResult, status_code=status.HTTP_200_OK)
+async def bulk_create_users(
+        request: Request,
+        user_deps: GenericDependencies[AsyncUserService] = Depends(user_service_dependency)
+):
+    """Create many users in batches and report the outcome of every row."""
+    return await user_deps.get_service().bulk_create_users(await read_bulk_items(request))
+
+
+# Endpoint to deactivate many users by ID list and/or filter
+@router.post("/bulk-deactivate", response_model=schema.BulkUpdateResult, status_code=status.HTTP_200_OK)
+async def bulk_deactivate_users(
+        request: schema.BulkDeactivateRequest,
+        user_deps: GenericDependencies[AsyncUserService] = Depends(user_service_dependency)
+):
+    """Deactivate users with chunked set-based UPDATEs and report how many changed."""
+    if request.user_ids is not None and len(request.user_ids) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ROWS} user IDs can be sent per request")
+    return await user_deps.get_service().bulk_deactivate_users(request)
+
+
+# Endpoint to delete many users by ID list
+@router.post("/bulk-delete", response_model=schema.BulkDeleteResult, status_code=status.HTTP_200_OK)
+async def bulk_delete_users(
+        request: schema.BulkDeleteRequest,
+        user_deps: GenericDependencies[AsyncUserService] = Depends(user_service_dependency)
+):
+    """Delete users and their profiles with chunked set-based DELETEs and report the counts."""
+    if len(request.user_ids) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ROWS} user IDs can be sent per request")
+    return await user_deps.get_service().bulk_delete_users(request.user_ids)
+
+
+# Endpoint to stream all users as NDJSON (declared before /read/{user_id} so it is matched first)
+@router.get("/read/stream", status_code=status.HTTP_200_OK)
+async def stream_users(request: Request, chunk_size: int = Query(STREAM_CHUNK_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """Stream all users as newline-delimited JSON from a server-side cursor."""
+    reject_async_routing(request)
+
+    async def generate():
+        # The request-scoped session is closed before the body is sent, so use a dedicated one
+        session = AsyncServerManager().get_session()
+        try:
+            async for user in AsyncUserService(session).stream_users(chunk_size):
+                yield user.model_dump_json() + "\n"
+        finally:
+            await session.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+# Endpoint to export all users as NDJSON or CSV
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_users(
+        request: Request,
+        export_format: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+        columns: Optional[str] = Query(None, description="Comma-separated columns to export"),
+        gzip: bool = Query(False, description="Gzip the response body"),
+        chunk_size: int = Query(STREAM_CHUNK_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Stream the users table from a server-side cursor with chunked encoding and constant memory."""
+    reject_async_routing(request)
+    selected = parse_export_columns(columns)
+
+    async def generate():
+        # The request-scoped session is closed before the body is sent, so use a dedicated one
+        session = AsyncServerManager().get_session()
+        try:
+            header = encode_header(export_format, selected)
+            if header:
+                yield header
+            async for rows in AsyncUserService(session).export_users(selected, chunk_size):
+                yield encode_rows(export_format, selected, rows)
+        finally:
+            await session.close()
+
+    headers = {"Content-Disposition": f'attachment; filename="users.{export_format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(gzip_chunks_async(generate()) if gzip else generate(),
+                             media_type=FORMATS[export_format], headers=headers)
+
+
+# Endpoint to read a user by ID
+@router.get("/read/{user_id}", response_model=schema.User, status_code=status.HTTP_200_OK)
+async def read_user(
+        user_id: int,
+        user_deps: GenericDependencies[AsyncUserService] = Depends(user_service_dependency)
+):
+    """Read a user by ID."""
+    try:
+        return await user_deps.get_service().get_user(user_id)
+    except HTTPException as e:
+        raise e
+
+
+# Endpoint to read users one keyset page at a time
+@router.get("/read", response_model=schema.UserPage, status_code=status.HTTP_200_OK)
+async def read_users(
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+        after: Optional[int] = Query(None, description="next_cursor from the previous page"),
+        user_deps: GenericDependencies[AsyncUserService] = Depends(user_service_dependency)
+):
+    """Read a page of users ordered by user_id."""
+    try:
+        return await user_deps.get_service().get_users_page(limit, after)
+    except HTTPException as e:
+        raise e
+
+
+# Endpoint to update an existing user
+@router.put("/update/{user_id}", response_model=schema.User, status_code=status.HTTP_200_OK)
+async def update_user(
+        user_id: int,
+        user: schema.UserUpdate,
+        user_deps: GenericDependencies[AsyncUserService] = Depends(user_service_dependency)
+):
+    """Update an existing user."""
+    try:
+        return await user_deps.get_service().update_user(user_id, user)
+    except HTTPException as e:
+        raise e
+
+
+# Endpoint to delete a user by ID
+@router.delete("/delete/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_user(
+        user_id: int,
+        user_deps: GenericDependencies[AsyncUserService] = Depends(user_service_dependency)
+):
+    """Delete a user by ID."""
+    try:
+        await user_deps.get_service().delete_user(user_id)
+        return
+    except HTTPException as e:
+        raise e
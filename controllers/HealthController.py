@@ -0,0 +1,79 @@
+import time
+
+from fastapi import APIRouter, Response, status
+from sqlalchemy import text
+
+from utils.AsyncServerManager import AsyncServerManager, is_async_mode
+from utils.LoggingConfig import LoggerManager
+from utils.PoolMetrics import wait_summary
+from utils.ServerManager import ServerManager
+from utils.WorkerRuntime import worker_info
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+router = APIRouter()
+
+
+def pool_status(engine) -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+@router.get("/pool")
+def pool_health(response: Response):
+    """Live counts and recent checkout wait times for every pool of this worker."""
+    server_manager = ServerManager()
+    response.headers["X-Worker-PID"] = str(worker_info()["pid"])
+    pools = server_manager.pools()
+    if is_async_mode() and AsyncServerManager().engine is not None:
+        pools.append(("async", AsyncServerManager().engine.sync_engine))
+    return {
+        "settings": {
+            "pool_size": server_manager.pool_size,
+            "max_overflow": server_manager.max_overflow,
+            "pool_timeout": server_manager.pool_timeout,
+            "pool_recycle": server_manager.pool_recycle,
+            "pool_pre_ping": server_manager.pool_pre_ping,
+            "connection_budget": server_manager.connection_budget,
+        },
+        "pools": {label: dict(pool_status(engine), wait=wait_summary(engine.pool)) for label, engine in pools},
+        "maintenance": server_manager.pool_maintainer.get_stats(),
+    }
+
+
+@router.get("")
+def worker_health(response: Response):
+    """Health of the worker process that serves this request, including its own database pool.
+
+    With several workers, each request is answered by one of them; the pid identifies which.
+    """
+    server_manager = ServerManager()
+    worker = worker_info()
+    response.headers["X-Worker-PID"] = str(worker["pid"])
+    report = {"status": "ok", "worker": dict(worker, connection_budget=server_manager.connection_budget)}
+
+    if server_manager.engine is None:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        report.update(status="starting", database=None)
+        return report
+
+    start = time.perf_counter()
+    try:
+        with server_manager.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        database = {"reachable": True}
+    except Exception as e:
+        logger.error(f"Health check could not reach the database: {e}")
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        report["status"] = "unavailable"
+        database = {"reachable": False}
+    database.update(schema=server_manager.default_schema, ping_ms=round((time.perf_counter() - start) * 1000, 2),
+                    pool=pool_status(server_manager.engine))
+    report["database"] = database
+    return report
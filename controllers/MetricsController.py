@@ -0,0 +1,62 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from security.AuthConfig import AuthConfig
+from utils.AsyncServerManager import AsyncServerManager, is_async_mode
+from utils.LoggingConfig import LoggerManager
+from utils.Metrics import CONTENT_TYPE, MetricsRegistry, stats_metrics
+from utils.PoolMetrics import collect_pool_metrics
+from utils.ServerManager import ServerManager
+
+router = APIRouter()
+
+
+def collect_application_metrics() -> list:
+    """Read pool, hashing, cache and throttle statistics at scrape time."""
+    server_manager = ServerManager()
+    pools = server_manager.pools()
+    if is_async_mode() and AsyncServerManager().engine is not None:
+        pools.append(("async", AsyncServerManager().engine.sync_engine))
+
+    config = AuthConfig()
+    families = collect_pool_metrics(pools)
+    families += stats_metrics("db_engine_registry", "Schema connection pools", server_manager.engines.get_stats(),
+                              counters=("created", "evicted"), gauges=("engines", "total_capacity"))
+    families += stats_metrics("db_pool_maintenance", "Background pool maintenance",
+                              server_manager.pool_maintainer.get_stats(),
+                              counters=("runs", "pinged", "recycled", "broken", "opened"))
+    families += stats_metrics("password_hash", "Password hashing pool", config.password_hasher.get_stats(),
+                              counters=("completed", "rejected", "failed"),
+                              gauges=("queue_depth", "max_pending", "workers"))
+    families += stats_metrics("secret_cache", "Secret cache", server_manager.get_secret_stats(),
+                              counters=("hits", "misses", "fetches", "refreshes", "refresh_failures", "stale_served",
+                                        "stale_expired"),
+                              gauges=("cached",))
+    families += stats_metrics("user_cache", "User snapshot cache", config.user_cache.get_stats(),
+                              counters=("hits", "misses", "evictions", "expirations", "invalidations"),
+                              gauges=("size",))
+    families += stats_metrics("login_throttle", "Login throttle", config.login_throttle.get_stats(),
+                              counters=("allowed", "rejected_username", "rejected_ip"),
+                              gauges=("tracked_usernames", "tracked_ips"))
+    families += stats_metrics("introspection_clients", "Introspection client authentication",
+                              config.introspection_clients.get_stats(),
+                              counters=("authenticated", "rejected_credentials", "rejected_rate"),
+                              gauges=("tracked_clients",))
+    families += stats_metrics("token_cache", "Verified token cache", config.token_cache.get_stats(),
+                              counters=("hits", "misses", "evictions", "expirations"), gauges=("size",))
+    families += stats_metrics("token_revocations", "Token revocation store", config.revocation_store.get_stats(),
+                              counters=("revoked", "rejected", "expired_evictions", "overflow_evictions",
+                                        "sync_failures"),
+                              gauges=("entries",))
+    families += stats_metrics("log_queue", "Logging queue", LoggerManager().get_stats(),
+                              counters=("dropped",), gauges=("queued",))
+    return families
+
+
+MetricsRegistry().register_collector(collect_application_metrics)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Expose process metrics in the Prometheus text format."""
+    return Response(MetricsRegistry().render(), media_type=CONTENT_TYPE)
@@ -1,16 +1,80 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+import os
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 from schemas import UserSchema as schema
-from services.UserService import UserService
+from services.UserService import UserService, parse_export_columns
 from security.AuthService import AuthService
-from utils.ServiceDependency import get_service_dependency, GenericDependencies
+from utils.ExportWriter import FORMATS, encode_header, encode_rows, gzip_chunks
+from utils.ServerManager import ServerManager
+from utils.ServiceDependency import get_service_dependency, GenericDependencies, open_request_session, \
+    resolve_request_schema, wants_primary
 
 router = APIRouter()
 user_service_dependency = get_service_dependency(UserService)
 auth_service_dependency = get_service_dependency(AuthService)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 1000
+EXPORT_FORMAT_PATTERN = f"^({'|'.join(FORMATS)})$"
+BULK_MAX_ROWS = int(os.getenv('USER_BULK_MAX_ROWS', '10000'))
+# Largest bulk request body accepted, in bytes; a created user takes well under 1 KiB of JSON
+BULK_MAX_BYTES = int(os.getenv('USER_BULK_MAX_BYTES', str(BULK_MAX_ROWS * 1024)))
+
+
+def _append_ndjson_line(items: list, line: bytes):
+    line = line.decode().strip()
+    if line:
+        try:
+            items.append(json.loads(line))
+        except ValueError:
+            items.append(line)  # Unparseable lines are kept as-is and reported as row errors
+
+
+async def read_bulk_items(request: Request) -> list:
+    """Parse a bulk request body sent as a JSON array or as NDJSON (one object per line).
+
+    Oversized bodies get their 413 without being buffered: up front from Content-Length,
+    once USER_BULK_MAX_BYTES have arrived, or, for NDJSON, at the first row past BULK_MAX_ROWS.
+    """
+    too_many_rows = HTTPException(status_code=413, detail=f"At most {BULK_MAX_ROWS} users can be created per request")
+    too_large = HTTPException(status_code=413, detail=f"Request body exceeds {BULK_MAX_BYTES} bytes")
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > BULK_MAX_BYTES:
+        raise too_large
+    ndjson = "ndjson" in request.headers.get("content-type", "")
+    items, chunks, received = [], [], 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > BULK_MAX_BYTES:
+                raise too_large
+            chunks.append(chunk)
+            if ndjson and b"\n" in chunk:
+                # Parse complete lines as they arrive; only the unfinished last line stays buffered
+                *lines, rest = b"".join(chunks).split(b"\n")
+                chunks = [rest]
+                for line in lines:
+                    _append_ndjson_line(items, line)
+                if len(items) > BULK_MAX_ROWS:
+                    raise too_many_rows
+        body = b"".join(chunks)
+        if ndjson:
+            _append_ndjson_line(items, body)
+        else:
+            items = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array or NDJSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array or NDJSON")
+    if len(items) > BULK_MAX_ROWS:
+        raise too_many_rows
+    return items
+
 
 # Endpoint to create a new user
 @router.post("/create", response_model=schema.User, status_code=status.HTTP_201_CREATED)
@@ -25,6 +89,89 @@ def create_user(
         raise e
 
 
+# Endpoint to create many users from a JSON array or NDJSON body
+@router.post("/bulk-create", response_model=schema.BulkCreateResult, status_code=status.HTTP_200_OK)
+async def bulk_create_users(
+        request: Request,
+        user_deps: GenericDependencies[UserService] = Depends(user_service_dependency)
+):
+    """Create many users in batches and report the outcome of every row."""
+    items = await read_bulk_items(request)
+    return await run_in_threadpool(user_deps.get_service().bulk_create_users, items)
+
+
+# Endpoint to deactivate many users by ID list and/or filter
+@router.post("/bulk-deactivate", response_model=schema.BulkUpdateResult, status_code=status.HTTP_200_OK)
+def bulk_deactivate_users(
+        request: schema.BulkDeactivateRequest,
+        user_deps: GenericDependencies[UserService] = Depends(user_service_dependency)
+):
+    """Deactivate users with chunked set-based UPDATEs and report how many changed."""
+    if request.user_ids is not None and len(request.user_ids) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ROWS} user IDs can be sent per request")
+    return user_deps.get_service().bulk_deactivate_users(request)
+
+
+# Endpoint to delete many users by ID list
+@router.post("/bulk-delete", response_model=schema.BulkDeleteResult, status_code=status.HTTP_200_OK)
+def bulk_delete_users(
+        request: schema.BulkDeleteRequest,
+        user_deps: GenericDependencies[UserService] = Depends(user_service_dependency)
+):
+    """Delete users and their profiles with chunked set-based DELETEs and report the counts."""
+    if len(request.user_ids) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ROWS} user IDs can be sent per request")
+    return user_deps.get_service().bulk_delete_users(request.user_ids)
+
+
+# Endpoint to stream all users as NDJSON (declared before /read/{user_id} so it is matched first)
+@router.get("/read/stream", status_code=status.HTTP_200_OK)
+def stream_users(request: Request, chunk_size: int = Query(STREAM_CHUNK_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """Stream all users as newline-delimited JSON from a server-side cursor."""
+    # The request-scoped session is closed before the body is sent, so use a dedicated one
+    session = open_request_session(ServerManager(), resolve_request_schema(request), wants_primary(request))
+
+    def generate():
+        try:
+            for user in UserService(session).stream_users(chunk_size):
+                yield user.model_dump_json() + "\n"
+        finally:
+            session.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+# Endpoint to export all users as NDJSON or CSV
+@router.get("/export", status_code=status.HTTP_200_OK)
+def export_users(
+        request: Request,
+        export_format: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+        columns: Optional[str] = Query(None, description="Comma-separated columns to export"),
+        gzip: bool = Query(False, description="Gzip the response body"),
+        chunk_size: int = Query(STREAM_CHUNK_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Stream the users table from a server-side cursor with chunked encoding and constant memory."""
+    selected = parse_export_columns(columns)
+    # The request-scoped session is closed before the body is sent, so use a dedicated one
+    session = open_request_session(ServerManager(), resolve_request_schema(request), wants_primary(request))
+
+    def generate():
+        try:
+            header = encode_header(export_format, selected)
+            if header:
+                yield header
+            for rows in UserService(session).export_users(selected, chunk_size):
+                yield encode_rows(export_format, selected, rows)
+        finally:
+            session.close()
+
+    headers = {"Content-Disposition": f'attachment; filename="users.{export_format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(gzip_chunks(generate()) if gzip else generate(),
+                             media_type=FORMATS[export_format], headers=headers)
+
+
 # Endpoint to read a user by ID
 @router.get("/read/{user_id}", response_model=schema.User, status_code=status.HTTP_200_OK)
 def read_user(
@@ -38,12 +185,16 @@ def read_user(
         raise e
 
 
-# Endpoint to read all users
-@router.get("/read", response_model=List[schema.User], status_code=status.HTTP_200_OK)
-def read_users(user_deps: GenericDependencies[UserService] = Depends(user_service_dependency)):
-    """Read all users."""
+# Endpoint to read users one keyset page at a time
+@router.get("/read", response_model=schema.UserPage, status_code=status.HTTP_200_OK)
+def read_users(
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+        after: Optional[int] = Query(None, description="next_cursor from the previous page"),
+        user_deps: GenericDependencies[UserService] = Depends(user_service_dependency)
+):
+    """Read a page of users ordered by user_id."""
     try:
-        return user_deps.get_service().get_all_users()
+        return user_deps.get_service().get_users_page(limit, after)
     except HTTPException as e:
         raise e
 
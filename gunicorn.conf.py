@@ -0,0 +1,31 @@
+"""Gunicorn configuration for serving the API with several uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+WEB_CONCURRENCY sets the number of workers (default: one per CPU). The application is
+imported once in the master and forked; post_fork drops everything a worker inherited
+(connection pools, the logging thread, the hashing pool) and each worker's lifespan
+builds its own engine. DB_MAX_TOTAL_CONNECTIONS is the connection budget for all workers
+together; every worker sizes its pools to an equal share of it.
+"""
+import multiprocessing
+import os
+
+workers = int(os.getenv('WEB_CONCURRENCY', str(multiprocessing.cpu_count())))
+# Workers read WEB_CONCURRENCY to work out their share of the connection budget
+os.environ['WEB_CONCURRENCY'] = str(workers)
+
+bind = os.getenv('BIND', '0.0.0.0:80')
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = True  # Importing has no side effects; workers start from a warm interpreter
+timeout = int(os.getenv('WORKER_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('KEEPALIVE', '5'))
+max_requests = int(os.getenv('MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.getenv('MAX_REQUESTS_JITTER', '0'))
+accesslog = None  # Requests are logged by the application
+
+
+def post_fork(server, worker):
+    from utils.WorkerRuntime import after_fork
+    after_fork()
@@ -1,47 +1,87 @@
-from fastapi import FastAPI
-from routes.AppRoute import router as route
-from utils.ServerManager import ServerManager
-import uvicorn
+from dotenv import load_dotenv
 
-app = FastAPI(
-    title="Project Watch API",
-    description="API for managing PW users.",
-    version="1.0.0"
-)
+# Load environment variables before any module below reads its settings
+load_dotenv()
 
-server_manager = ServerManager()
+from utils.StartupProfile import StartupProfile  # noqa: E402
 
+startup_profile = StartupProfile()  # Created before the application imports, so the import phase covers them
 
-@app.on_event("startup")
-async def startup_event():
-    try:
-        default_database = "project_watch"
+from contextlib import asynccontextmanager  # noqa: E402
 
-        if default_database:
-            server_manager._init_once()
+from fastapi import FastAPI  # noqa: E402
+from routes.AppRoute import router as route  # noqa: E402
+from security.AuthConfig import AuthConfig  # noqa: E402
+from utils.AsyncServerManager import AsyncServerManager, is_async_mode  # noqa: E402
+from utils.LoggingConfig import LoggerManager, RequestIdMiddleware  # noqa: E402
+from utils.Metrics import MetricsMiddleware, metrics_enabled  # noqa: E402
+from utils.QueryInstrumentation import QueryStatsMiddleware, instrumentation_enabled  # noqa: E402
+from utils.ServerManager import ServerManager  # noqa: E402
+from utils.WorkerRuntime import size_threadpool  # noqa: E402
 
-            # Check if the schema exists before setting it
-            if server_manager.config.schema_exists(default_database):
-                server_manager.set_schema(default_database)
-                print(f"Default database set to: {default_database}")
-            else:
-                raise RuntimeError(f"The specified database '{default_database}' does not exist.")
-        else:
-            raise RuntimeError("No default database specified.")
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+DEFAULT_DATABASE = "project_watch"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connects to the database on startup and releases every pool on shutdown.
 
+    Nothing is fetched or connected at import time; secrets and engines are set up here.
+    """
+    try:
+        with startup_profile.phase("secrets"):
+            server_manager = ServerManager()
+        with startup_profile.phase("database"):
+            # Check if the schema exists before setting it
+            if not server_manager.config.schema_exists(DEFAULT_DATABASE):
+                raise RuntimeError(f"The specified database '{DEFAULT_DATABASE}' does not exist.")
+            server_manager.set_schema(DEFAULT_DATABASE)
+            if is_async_mode():
+                await AsyncServerManager().set_schema(DEFAULT_DATABASE)
+        with startup_profile.phase("pool_warmup"):
+            server_manager.start_pool_maintenance(warm=not is_async_mode())
+        with startup_profile.phase("revocations"):
+            AuthConfig().revocation_store.start_sync()
+        logger.info(f"Default database set to: {DEFAULT_DATABASE}")
+        # Sync routes hold a thread while bcrypt runs on the hashing pool; keep that many threads spare
+        threads = size_threadpool(AuthConfig().password_hasher.max_pending)
+        logger.info(f"Threadpool sized to {threads} threads")
     except Exception as e:
-        print(f"Failed to set default database: {e}")
-        exit(1)  # Exit the application after a failed attempt
+        logger.error(f"Failed to set default database: {e}")
+        raise  # Startup fails and the server exits
+    startup_profile.report()
 
+    yield
 
-@app.on_event("shutdown")
-async def shutdown_event():
+    AuthConfig().revocation_store.stop_sync()
     # Close any active database sessions
-    server_manager.close_session()
-    print("Database sessions closed successfully.")
+    ServerManager().dispose()
+    if is_async_mode():
+        await AsyncServerManager().dispose()
+    logger.info("Database sessions closed successfully.")
+    AuthConfig().password_hasher.shutdown()
 
 
+app = FastAPI(
+    title="Project Watch API",
+    description="API for managing PW users.",
+    version="1.0.0",
+    lifespan=lifespan,
+)
+
+if instrumentation_enabled():
+    app.add_middleware(QueryStatsMiddleware)
+if metrics_enabled():
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)  # Outermost, so every log line of a request carries its ID
+
 app.include_router(route)
 
+startup_profile.mark_imported()
+
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=80)
@@ -1,8 +1,22 @@
 from fastapi import APIRouter, Depends
-from controllers import UserController
-from security import AuthController
+from controllers import HealthController
+from utils.AsyncServerManager import is_async_mode
+from utils.Metrics import metrics_enabled
 
 router = APIRouter()
 
+# DB_MODE=async serves the same API from async routes on the asyncio database stack
+if is_async_mode():
+    from controllers import AsyncUserController as UserController
+    from security import AsyncAuthController as AuthController
+else:
+    from controllers import UserController
+    from security import AuthController
+
 router.include_router(UserController.router, prefix="/user", tags=["user"])
 router.include_router(AuthController.router, prefix="/auth", tags=["auth"])
+router.include_router(HealthController.router, prefix="/health", tags=["health"])
+
+if metrics_enabled():
+    from controllers import MetricsController
+    router.include_router(MetricsController.router, tags=["metrics"])
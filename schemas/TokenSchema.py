@@ -1,6 +1,32 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
 class TokenSchema(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
+class IntrospectRequest(BaseModel):
+    tokens: List[str]
+
+
+class TokenIntrospection(BaseModel):
+    active: bool
+    user_id: Optional[int] = None
+    claims: Optional[dict] = None
+
+
+class IntrospectResponse(BaseModel):
+    results: List[TokenIntrospection]
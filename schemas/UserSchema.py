@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 from pydantic import BaseModel, constr
 from pydantic import validator
@@ -74,3 +74,44 @@ class User(UserBase):
 
     class Config:
         from_attributes = True  # Use `orm_mode` for compatibility with ORMs
+
+
+class UserPage(BaseModel):
+    items: List[User]
+    next_cursor: Optional[int] = None  # Pass as `after` to fetch the next page; None on the last page
+
+
+class BulkCreateRowResult(BaseModel):
+    index: int  # Position of the row in the submitted batch
+    username: Optional[str] = None
+    status: str  # "created" or "error"
+    user_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkCreateRowResult]
+
+
+class BulkDeactivateRequest(BaseModel):
+    """Deactivate the listed users and/or every user matching the filters (all given conditions apply)."""
+    user_ids: Optional[List[int]] = None
+    username_prefix: Optional[constr(min_length=1, max_length=50)] = None
+    created_before: Optional[datetime] = None
+
+
+class BulkDeleteRequest(BaseModel):
+    user_ids: List[int]
+
+
+class BulkUpdateResult(BaseModel):
+    requested: Optional[int] = None  # Number of IDs sent, when deactivating by ID list
+    affected: int
+
+
+class BulkDeleteResult(BaseModel):
+    requested: int
+    deleted: int
+    profiles_deleted: int
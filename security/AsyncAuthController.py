@@ -0,0 +1,100 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
+from security.AsyncAuthService import AsyncAuthService
+from security.AuthConfig import AuthConfig
+from security.AuthController import INTROSPECT_MAX_TOKENS, authenticate_introspection_client, \
+    enforce_login_throttle, jwks_response
+from services.AsyncUserService import AsyncUserService
+from utils.LoggingConfig import LoggerManager
+from utils.ServiceDependency import get_async_service_dependency, GenericDependencies
+from schemas import UserSchema as schema, TokenSchema
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+# Async counterpart of security/AuthController.py, mounted when DB_MODE=async
+router = APIRouter()
+
+get_auth_service_dependency = get_async_service_dependency(AsyncAuthService)
+get_user_service_dependency = get_async_service_dependency(AsyncUserService)
+
+# Define the OAuth2 scheme
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+
+
+@router.post("/register", response_model=schema.User, status_code=201)
+async def register_user(
+        user: schema.UserCreate,
+        deps: GenericDependencies[AsyncUserService] = Depends(get_user_service_dependency)):
+    """Register a new user."""
+    try:
+        logger.info(f"Attempting to register user: {user.username}")
+        return await deps.get_service().create_user(user)
+    except HTTPException as e:
+        logger.error(f"User registration failed: {e.detail}")
+        raise e
+
+
+@router.post("/login", response_model=TokenSchema.TokenSchema)
+async def login_user(
+        form_data: OAuth2PasswordRequestForm = Depends(),
+        _throttle: None = Depends(enforce_login_throttle),  # Resolved before the service dependency
+        deps: GenericDependencies[AsyncAuthService] = Depends(get_auth_service_dependency)
+):
+    """Authenticate user and return a JWT token."""
+    auth_service = deps.get_service()
+    user = await auth_service.authenticate_user(form_data.username, form_data.password)
+
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    AuthConfig().login_throttle.record_success(form_data.username)
+
+    return auth_service.issue_tokens(user.username)
+
+
+@router.post("/refresh", response_model=TokenSchema.TokenSchema)
+async def refresh_token(
+        body: TokenSchema.RefreshRequest,
+        deps: GenericDependencies[AsyncAuthService] = Depends(get_auth_service_dependency)
+):
+    """Exchange a refresh token for a new token pair, without re-sending the password."""
+    return await deps.get_service().refresh_tokens(body.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_user(
+        body: Optional[TokenSchema.LogoutRequest] = None,
+        token: str = Depends(oauth2_scheme),
+        deps: GenericDependencies[AsyncAuthService] = Depends(get_auth_service_dependency)
+):
+    """Revoke the current access token and, if given, the refresh token."""
+    await deps.get_service().logout(token, body.refresh_token if body else None)
+
+
+@router.post("/introspect", response_model=TokenSchema.IntrospectResponse)
+async def introspect_tokens(
+        body: TokenSchema.IntrospectRequest,
+        _client: str = Depends(authenticate_introspection_client),  # Resolved before the service dependency
+        deps: GenericDependencies[AsyncAuthService] = Depends(get_auth_service_dependency)
+):
+    """Verify a batch of access tokens for an authenticated gateway; results are in request order."""
+    if len(body.tokens) > INTROSPECT_MAX_TOKENS:
+        raise HTTPException(status_code=413, detail=f"At most {INTROSPECT_MAX_TOKENS} tokens can be sent per request")
+    return {"results": await deps.get_service().introspect(body.tokens)}
+
+
+@router.get("/me", response_model=schema.User)
+async def get_current_user(
+        token: str = Depends(oauth2_scheme),
+        deps: GenericDependencies[AsyncAuthService] = Depends(get_auth_service_dependency)
+):
+    """Retrieve the currently authenticated user."""
+    return await deps.get_service().get_current_user(token)
+
+
+@router.get("/.well-known/jwks.json")
+def get_jwks(request: Request):
+    """Public keys that verify this service's tokens, for services that check tokens locally."""
+    return jwks_response(request)
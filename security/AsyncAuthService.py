@@ -0,0 +1,111 @@
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.concurrency import run_in_threadpool
+
+from models.SQLModel import User
+from security.AuthTokens import REFRESH_TOKEN, AuthTokens
+from security.UserSnapshotCache import UserSnapshot
+from services.UserService import profile_loader_options
+from utils.LoggingConfig import LoggerManager
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+
+class AsyncAuthService(AuthTokens):
+    """Asyncio counterpart of AuthService on an AsyncSession; token issuing and claims checks come from AuthTokens."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.config.password_hasher.verify_async(plain_password, hashed_password)
+
+    async def authenticate_user(self, username: str, password: str) -> Optional[User]:
+        """Authenticate a user by username and password."""
+        result = await self.session.execute(select(User).where(User.username == username))
+        user = result.scalars().first()
+        if not user:
+            return None
+        verified, new_hash = await self.config.password_hasher.verify_and_update_async(password, user.password_hash)
+        if not verified:
+            return None
+        if new_hash:
+            await self._store_rehash_async(user, new_hash)
+        return user
+
+    async def _store_rehash_async(self, user: User, new_hash: str):
+        """Persist a hash upgraded to the current hashing policy; a failure never blocks the login."""
+        username, user_id = user.username, user.user_id
+        try:
+            user.password_hash = new_hash
+            await self.session.commit()
+            self.config.user_cache.invalidate(username=username, user_id=user_id, namespace=self.schema)
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Failed to store upgraded password hash for user {username}: {e}")
+
+    async def revoke_claims_async(self, claims: dict):
+        if self.config.revocation_store.persistence is not None:
+            await run_in_threadpool(self.revoke_claims, claims)  # Writes the revoked_tokens row
+        else:
+            self.revoke_claims(claims)
+
+    async def consume_claims_async(self, claims: dict):
+        if self.config.revocation_store.persistence is not None:
+            await run_in_threadpool(self.consume_claims, claims)  # Inserts the revoked_tokens row
+        else:
+            self.consume_claims(claims)
+
+    async def refresh_tokens(self, refresh_token: str) -> dict:
+        """Exchange a refresh token for a new pair without any password hashing."""
+        claims = self.decode_claims(refresh_token, REFRESH_TOKEN)
+        await self.load_user_snapshot(claims["sub"])
+        await self.consume_claims_async(claims)
+        return self.issue_tokens(claims["sub"])
+
+    async def logout(self, access_token: str, refresh_token: Optional[str] = None):
+        """Revoke the caller's access token and, when given, their refresh token."""
+        for claims in self.logout_claims(access_token, refresh_token):
+            await self.revoke_claims_async(claims)
+
+    async def get_current_user(self, token: str) -> UserSnapshot:
+        """Get the current user from a JWT token, served from the user snapshot cache when possible."""
+        return await self.load_user_snapshot(self.decode_subject(token))
+
+    async def load_user_snapshot(self, username: str) -> UserSnapshot:
+        """Active user by username, from the user snapshot cache when possible."""
+        user_cache = self.config.user_cache
+        schema = self.schema
+        snapshot = user_cache.get(username, schema)
+        if snapshot is None:
+            version = user_cache.version
+            result = await self.session.execute(
+                select(User).options(*profile_loader_options()).where(User.username == username)
+            )
+            user = result.scalars().first()
+            if user is None:
+                raise self.credentials_exception()
+            snapshot = user_cache.put(user, version, schema)
+        return self.active_snapshot(snapshot)
+
+    async def introspect(self, tokens: List[str]) -> List[dict]:
+        """Verify a batch of access tokens and resolve all their users with at most one query."""
+        claims = self.verify_tokens(tokens)
+        snapshots = await self.load_user_snapshots({token_claims["sub"] for token_claims in claims if token_claims})
+        return self.introspection_results(claims, snapshots)
+
+    async def load_user_snapshots(self, usernames: Iterable[str]) -> Dict[str, UserSnapshot]:
+        """Users by username, active or not, with one IN query for those not cached; unknown ones are left out."""
+        snapshots, missing = self.cached_user_snapshots(usernames)
+        if missing:
+            user_cache = self.config.user_cache
+            version = user_cache.version
+            result = await self.session.execute(
+                select(User).options(*profile_loader_options()).where(User.username.in_(missing))
+            )
+            for user in result.scalars().all():
+                snapshots[user.username] = user_cache.put(user, version, self.schema)
+        return snapshots
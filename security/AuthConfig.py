@@ -0,0 +1,91 @@
+import os
+import threading
+
+from security.HashingPolicy import HashingPolicy
+from security.IntrospectionClients import IntrospectionClients
+from security.LoginThrottle import LoginThrottle
+from security.PasswordHasher import PasswordHasher
+from security.RevocationStore import DatabaseRevocations, RevocationStore
+from security.SigningKeys import SigningKeyProvider
+from security.TokenCache import VerifiedTokenCache
+from security.UserSnapshotCache import UserSnapshotCache
+from utils.ServerManager import ServerManager
+from utils.WorkerRuntime import worker_count, worker_cpu_share
+
+
+class AuthConfig:
+    """Process-wide holder for the stateless, expensive parts of the auth services.
+
+    The password context and token settings are built once and shared by every
+    request; only the database session is bound per request.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        # Singleton
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(AuthConfig, cls).__new__(cls)
+                cls._instance._init_once()
+        return cls._instance
+
+    def _init_once(self):
+        if not hasattr(self, 'initialized'):
+            self.hashing_policy = HashingPolicy.from_env()
+            self.pwd_context = self.hashing_policy.build_context()
+            # Every server worker has its own hashing pool, so by default they split the CPUs between them
+            workers = int(os.getenv('HASH_POOL_WORKERS', str(worker_cpu_share())))
+            self.password_hasher = PasswordHasher(
+                self.pwd_context,
+                workers=workers,
+                max_pending=int(os.getenv('HASH_QUEUE_SIZE', str(min(max(workers, 1) * 4, 32)))),
+                retry_after=int(os.getenv('HASH_RETRY_AFTER', '1')),
+                batch_wait=float(os.getenv('HASH_BATCH_WAIT', '30')),
+            )
+            self.user_cache = UserSnapshotCache(
+                max_size=int(os.getenv('USER_CACHE_SIZE', '10000')),
+                ttl=float(os.getenv('USER_CACHE_TTL', '30')),
+            )
+            self.login_throttle = LoginThrottle(
+                username_limit=int(os.getenv('LOGIN_USERNAME_LIMIT', '5')),
+                ip_limit=int(os.getenv('LOGIN_IP_LIMIT', '20')),
+                window=float(os.getenv('LOGIN_WINDOW_SECONDS', '60')),
+                max_keys=int(os.getenv('LOGIN_THROTTLE_MAX_KEYS', '100000')),
+                enabled=os.getenv('LOGIN_THROTTLE_ENABLED', 'true').lower() == 'true',
+            )
+            self.token_cache = VerifiedTokenCache(
+                max_size=int(os.getenv('TOKEN_CACHE_SIZE', '10000')),
+                enabled=os.getenv('TOKEN_CACHE_ENABLED', 'true').lower() == 'true',
+            )
+            self.algorithm = os.getenv('JWT_ALGORITHM', 'HS256')
+            self.access_token_expire_minutes = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', '30'))
+            self.refresh_token_expire_days = int(os.getenv('REFRESH_TOKEN_EXPIRE_DAYS', '7'))
+            persist = os.getenv('REVOCATION_PERSIST', 'auto').lower()
+            # Revocations held in memory only reach the worker that made them
+            persist = worker_count() > 1 if persist == 'auto' else persist == 'true'
+            if not persist and worker_count() > 1:
+                raise RuntimeError("REVOCATION_PERSIST=false needs a single worker (WEB_CONCURRENCY=1); "
+                                   "otherwise logouts and refresh rotation only apply in one worker.")
+            self.revocation_store = RevocationStore(
+                max_size=int(os.getenv('REVOCATION_MAX_ENTRIES', '100000')),
+                persistence=DatabaseRevocations(lambda: ServerManager().engine) if persist else None,
+                sync_interval=float(os.getenv('REVOCATION_SYNC_INTERVAL', '10')),
+            )
+            self.jwt_secret_name = os.getenv('JWT_SECRET_NAME', 'JWT')
+            # RS*/ES* sign with the kid-tagged keys in the JWT secret and publish them at /auth/.well-known/jwks.json
+            self.signing_keys = SigningKeyProvider(lambda: ServerManager().get_secret(self.jwt_secret_name),
+                                                   self.algorithm)
+            self.jwks_max_age = int(os.getenv('JWKS_MAX_AGE', '300'))
+            introspect_secret_name = os.getenv('INTROSPECT_SECRET_NAME', 'INTROSPECT')
+            self.introspection_clients = IntrospectionClients(
+                lambda: ServerManager().get_secret(introspect_secret_name),
+                limit=int(os.getenv('INTROSPECT_RATE_LIMIT', '600')),
+                window=float(os.getenv('INTROSPECT_RATE_WINDOW', '60')),
+            )
+            self.initialized = True
+
+    @property
+    def secret_key(self) -> str:
+        """Shared HS* signing key, served from the in-process secret cache."""
+        return ServerManager().get_secret(self.jwt_secret_name)["KEY"]
@@ -1,18 +1,26 @@
+import os
 from datetime import timedelta
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.security import HTTPBasic, HTTPBasicCredentials, OAuth2PasswordRequestForm, OAuth2PasswordBearer
+from security.AuthConfig import AuthConfig
 from security.AuthService import AuthService
+from security.LoginThrottle import client_ip
 from services.UserService import UserService
 from utils.LoggingConfig import LoggerManager
 from utils.ServiceDependency import get_service_dependency, GenericDependencies
 from schemas import UserSchema as schema, TokenSchema
 
 # Initialize logger
-logger = LoggerManager().get_logger()
+logger = LoggerManager().get_logger(__name__)
+# Login attempts are high volume; sample them with LOG_SAMPLING=security.login=<rate>
+login_logger = LoggerManager().get_logger('security.login')
 
 router = APIRouter()
 
+INTROSPECT_MAX_TOKENS = int(os.getenv('INTROSPECT_MAX_TOKENS', '100'))
+
 # Get the dependencies for AuthService and UserService
 get_auth_service_dependency = get_service_dependency(AuthService)
 get_user_service_dependency = get_service_dependency(UserService)
@@ -21,6 +29,35 @@ get_user_service_dependency = get_service_dependency(UserService)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 
+def enforce_login_throttle(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    """Reject over-limit login attempts before the auth service and its session are built."""
+    login_logger.info(f"Login attempt for user: {form_data.username}")
+    AuthConfig().login_throttle.admit(form_data.username, client_ip(request))
+
+
+# Gateways authenticate to /introspect with their client ID and secret (RFC 7662 section 2.1)
+introspection_basic = HTTPBasic(auto_error=False)
+
+
+def authenticate_introspection_client(
+        request: Request, credentials: Optional[HTTPBasicCredentials] = Depends(introspection_basic)) -> str:
+    """Reject unknown or over-limit introspection callers before the auth service and its session are built."""
+    return AuthConfig().introspection_clients.authenticate(credentials, client_ip(request))
+
+
+def jwks_response(request: Request) -> Response:
+    """The pre-rendered JWKS document, with caching headers and a 304 for a matching If-None-Match."""
+    config = AuthConfig()
+    if not config.signing_keys.asymmetric:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail="Tokens are signed with a shared secret; no public keys are published")
+    key_set = config.signing_keys.current()
+    headers = {"Cache-Control": f"public, max-age={config.jwks_max_age}", "ETag": key_set.jwks_etag}
+    if request.headers.get("if-none-match") == key_set.jwks_etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(key_set.jwks_body, media_type="application/json", headers=headers)
+
+
 @router.post("/register", response_model=schema.User, status_code=201)
 def register_user(
         user: schema.UserCreate,
@@ -34,9 +71,10 @@ def register_user(
         raise e
 
 
-@router.post("/login")
+@router.post("/login", response_model=TokenSchema.TokenSchema)
 def login_user(
         form_data: OAuth2PasswordRequestForm = Depends(),
+        _throttle: None = Depends(enforce_login_throttle),  # Resolved before the service dependency
         deps: GenericDependencies[AuthService] = Depends(get_auth_service_dependency)
 ):
     """Authenticate user and return a JWT token."""
@@ -45,10 +83,41 @@ def login_user(
 
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    AuthConfig().login_throttle.record_success(form_data.username)
+
+    # Generate the JWT access and refresh tokens
+    return auth_service.issue_tokens(user.username)
+
+
+@router.post("/refresh", response_model=TokenSchema.TokenSchema)
+def refresh_token(
+        body: TokenSchema.RefreshRequest,
+        deps: GenericDependencies[AuthService] = Depends(get_auth_service_dependency)
+):
+    """Exchange a refresh token for a new token pair, without re-sending the password."""
+    return deps.get_service().refresh_tokens(body.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout_user(
+        body: Optional[TokenSchema.LogoutRequest] = None,
+        token: str = Depends(oauth2_scheme),
+        deps: GenericDependencies[AuthService] = Depends(get_auth_service_dependency)
+):
+    """Revoke the current access token and, if given, the refresh token."""
+    deps.get_service().logout(token, body.refresh_token if body else None)
+
 
-    # Generate JWT token
-    access_token = auth_service.create_access_token(data={"sub": user.username})  # Changed to username
-    return {"access_token": access_token, "token_type": "bearer"}
+@router.post("/introspect", response_model=TokenSchema.IntrospectResponse)
+def introspect_tokens(
+        body: TokenSchema.IntrospectRequest,
+        _client: str = Depends(authenticate_introspection_client),  # Resolved before the service dependency
+        deps: GenericDependencies[AuthService] = Depends(get_auth_service_dependency)
+):
+    """Verify a batch of access tokens for an authenticated gateway; results are in request order."""
+    if len(body.tokens) > INTROSPECT_MAX_TOKENS:
+        raise HTTPException(status_code=413, detail=f"At most {INTROSPECT_MAX_TOKENS} tokens can be sent per request")
+    return {"results": deps.get_service().introspect(body.tokens)}
 
 
 @router.get("/me", response_model=schema.User)
@@ -60,3 +129,9 @@ def get_current_user(
     auth_service = deps.get_service()
     user = auth_service.get_current_user(token)
     return user
+
+
+@router.get("/.well-known/jwks.json")
+def get_jwks(request: Request):
+    """Public keys that verify this service's tokens, for services that check tokens locally."""
+    return jwks_response(request)
@@ -1,64 +1,107 @@
-import os
-from dotenv import load_dotenv
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import HTTPException, status
-from datetime import timedelta, datetime
 from sqlalchemy.orm import Session
-from typing import Optional, Type
+from typing import Dict, Iterable, List, Optional
 from models.SQLModel import User
-from utils.ServerManager import ServerManager
+from security.AuthTokens import REFRESH_TOKEN, AuthTokens
+from security.UserSnapshotCache import UserSnapshot
+from services.UserService import profile_loader_options
+from utils.LoggingConfig import LoggerManager
 
-server_manager = ServerManager()
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+
+class AuthService(AuthTokens):
+    """Authentication on a sync Session; token issuing and claims checks come from AuthTokens."""
 
-load_dotenv()
-class AuthService:
     def __init__(self, session: Session):
-        self.session = session
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        self.secret_key = server_manager.get_secret("JWT")["KEY"]
-        self.algorithm = "HS256"
-        self.access_token_expire_minutes = 30
+        super().__init__(session)
 
     def hash_password(self, password: str) -> str:
         """Hash a plain-text password."""
-        return self.pwd_context.hash(password)
+        return self.config.password_hasher.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify that a plain-text password matches the hashed password."""
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return self.config.password_hasher.verify(plain_password, hashed_password)
 
     def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """Authenticate a user by username and password."""
         user = self.session.query(User).filter(User.username == username).first()  # Change from email to username
-        if not user or not self.verify_password(password, user.password_hash):
+        if not user:
+            return None
+        verified, new_hash = self.config.password_hasher.verify_and_update(password, user.password_hash)
+        if not verified:
             return None
+        if new_hash:
+            self._store_rehash(user, new_hash)
         return user
 
-    def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
-        """Create a JWT token."""
-        to_encode = data.copy()
-        expire = datetime.now() + (
-            expires_delta if expires_delta else timedelta(minutes=self.access_token_expire_minutes))
-        to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
-
-    def get_current_user(self, token: str) -> Type[User]:
-        """Get the current user from a JWT token."""
-        credentials_exception = HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    def _store_rehash(self, user: User, new_hash: str):
+        """Persist a hash upgraded to the current hashing policy; a failure never blocks the login."""
+        username, user_id = user.username, user.user_id
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            username: str = payload.get("sub")
-            if username is None:
-                raise credentials_exception
-        except JWTError:
-            raise credentials_exception
+            user.password_hash = new_hash
+            self.session.commit()
+            self.config.user_cache.invalidate(username=username, user_id=user_id, namespace=self.schema)
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Failed to store upgraded password hash for user {username}: {e}")
 
-        user = self.session.query(User).filter(User.username == username).first()  # Change from email to username
-        if user is None:
-            raise credentials_exception
-        return user
\ No newline at end of file
+    def refresh_tokens(self, refresh_token: str) -> dict:
+        """Exchange a refresh token for a new pair without any password hashing.
+
+        The refresh token is single use: it is revoked as the new pair is issued.
+        """
+        claims = self.decode_claims(refresh_token, REFRESH_TOKEN)
+        self.load_user_snapshot(claims["sub"])  # Deactivated or deleted users cannot refresh
+        self.consume_claims(claims)
+        return self.issue_tokens(claims["sub"])
+
+    def logout(self, access_token: str, refresh_token: Optional[str] = None):
+        """Revoke the caller's access token and, when given, their refresh token."""
+        for claims in self.logout_claims(access_token, refresh_token):
+            self.revoke_claims(claims)
+
+    def introspect(self, tokens: List[str]) -> List[dict]:
+        """Verify a batch of access tokens and resolve all their users with at most one query."""
+        claims = self.verify_tokens(tokens)
+        snapshots = self.load_user_snapshots({token_claims["sub"] for token_claims in claims if token_claims})
+        return self.introspection_results(claims, snapshots)
+
+    def load_user_snapshots(self, usernames: Iterable[str]) -> Dict[str, UserSnapshot]:
+        """Users by username, active or not, with one IN query for those not cached; unknown ones are left out."""
+        snapshots, missing = self.cached_user_snapshots(usernames)
+        if missing:
+            user_cache = self.config.user_cache
+            version = user_cache.version
+            users = (
+                self.session.query(User)
+                .options(*profile_loader_options())  # The snapshot copies the profile
+                .filter(User.username.in_(missing))
+                .all()
+            )
+            for user in users:
+                snapshots[user.username] = user_cache.put(user, version, self.schema)
+        return snapshots
+
+    def get_current_user(self, token: str) -> UserSnapshot:
+        """Get the current user from a JWT token, served from the user snapshot cache when possible."""
+        return self.load_user_snapshot(self.decode_subject(token))
+
+    def load_user_snapshot(self, username: str) -> UserSnapshot:
+        """Active user by username, from the user snapshot cache when possible."""
+        user_cache = self.config.user_cache
+        schema = self.schema
+        snapshot = user_cache.get(username, schema)
+        if snapshot is None:
+            version = user_cache.version
+            user = (
+                self.session.query(User)
+                .options(*profile_loader_options())  # The snapshot copies the profile
+                .filter(User.username == username)
+                .first()
+            )
+            if user is None:
+                raise self.credentials_exception()
+            snapshot = user_cache.put(user, version, schema)
+        return self.active_snapshot(snapshot)
@@ -0,0 +1,178 @@
+import uuid
+from datetime import timedelta, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from jose import JWTError, jwt
+
+from security.AuthConfig import AuthConfig
+from security.UserSnapshotCache import UserSnapshot
+from utils.ServerManager import ServerManager, session_schema
+
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+
+class AuthTokens:
+    """Token issuing and claims checks shared by AuthService and AsyncAuthService.
+
+    Nothing here touches the database, so every method is plain (sync) and both services
+    inherit all of it; their database-backed methods are defined on each service only.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.config = AuthConfig()  # Shared per process; only the session is per request
+        self.pwd_context = self.config.pwd_context
+        self.algorithm = self.config.algorithm
+        self.access_token_expire_minutes = self.config.access_token_expire_minutes
+
+    @property
+    def secret_key(self) -> str:
+        return self.config.secret_key
+
+    @property
+    def schema(self) -> Optional[str]:
+        """Schema this request is served from; scopes cached users and token validity."""
+        return session_schema(self.session)
+
+    def _encode_token(self, data: dict, token_type: str, expires_delta: timedelta) -> str:
+        to_encode = data.copy()
+        to_encode.setdefault("schema", self.schema)  # Tokens are only valid on the schema that issued them
+        now = datetime.now(timezone.utc)
+        # jti identifies the token in the revocation store
+        to_encode.update({"exp": now + expires_delta, "iat": now, "jti": uuid.uuid4().hex, "type": token_type})
+        if self.config.signing_keys.asymmetric:
+            signing_key = self.config.signing_keys.current().active
+            return jwt.encode(to_encode, signing_key.private_key, algorithm=self.algorithm,
+                              headers={"kid": signing_key.kid})
+        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+
+    def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
+        """Create a JWT token."""
+        return self._encode_token(data, ACCESS_TOKEN,
+                                  expires_delta or timedelta(minutes=self.access_token_expire_minutes))
+
+    def create_refresh_token(self, data: dict) -> str:
+        """Create a long-lived token that can only be exchanged at /auth/refresh."""
+        return self._encode_token(data, REFRESH_TOKEN, timedelta(days=self.config.refresh_token_expire_days))
+
+    def issue_tokens(self, username: str) -> dict:
+        """Access and refresh token pair returned by /login and /refresh."""
+        return {
+            "access_token": self.create_access_token(data={"sub": username}),
+            "refresh_token": self.create_refresh_token(data={"sub": username}),
+            "token_type": "bearer",
+            "expires_in": self.access_token_expire_minutes * 60,
+        }
+
+    @staticmethod
+    def credentials_exception() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    def verification_key(self, token: str):
+        """The shared secret, or the public key named by the token's kid when signing is asymmetric."""
+        if not self.config.signing_keys.asymmetric:
+            return self.secret_key
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except JWTError:
+            raise self.credentials_exception()
+        signing_key = self.config.signing_keys.current().get(kid)
+        if signing_key is None:  # Unknown or retired kid
+            raise self.credentials_exception()
+        return signing_key.public_key
+
+    def decode_claims(self, token: str, token_type: str = ACCESS_TOKEN) -> dict:
+        """Verify a JWT token of the given type and return its claims (read-only).
+
+        Signature and expiry checks are skipped for tokens already verified with the
+        current key; the checks below run on every call.
+        """
+        key = self.verification_key(token)
+        payload = self.config.token_cache.get(token, key)
+        if payload is None:
+            try:
+                payload = jwt.decode(token, key, algorithms=[self.algorithm])
+            except JWTError:
+                raise self.credentials_exception()
+            self.config.token_cache.put(token, key, payload)
+        # Tokens issued before refresh tokens existed have no type and are access tokens
+        if payload.get("sub") is None or payload.get("type", ACCESS_TOKEN) != token_type:
+            raise self.credentials_exception()
+        # Tokens issued before the schema claim existed are only valid on the default schema
+        if payload.get("schema", ServerManager().default_schema) != self.schema:
+            raise self.credentials_exception()
+        if self.config.revocation_store.is_revoked(payload.get("jti")):
+            raise self.credentials_exception()
+        return payload
+
+    def decode_subject(self, token: str) -> str:
+        """Verify a JWT token and return its subject (the username)."""
+        return self.decode_claims(token)["sub"]
+
+    def logout_claims(self, access_token: str, refresh_token: Optional[str] = None) -> List[dict]:
+        """Claims of the tokens a logout revokes; the refresh token must belong to the same user."""
+        claims = self.decode_claims(access_token)
+        refresh_claims = self.decode_claims(refresh_token, REFRESH_TOKEN) if refresh_token else None
+        if refresh_claims is None:
+            return [claims]
+        if refresh_claims["sub"] != claims["sub"]:
+            raise self.credentials_exception()
+        return [claims, refresh_claims]
+
+    def revoke_claims(self, claims: dict):
+        """Revoke a verified token until it expires. Tokens without a jti cannot be revoked."""
+        if claims.get("jti"):
+            self.config.revocation_store.revoke(claims["jti"], float(claims["exp"]))
+
+    def consume_claims(self, claims: dict):
+        """Revoke a single-use token, rejecting it if a concurrent call already did."""
+        if not claims.get("jti") or not self.config.revocation_store.consume(claims["jti"], float(claims["exp"])):
+            raise self.credentials_exception()
+
+    def verify_tokens(self, tokens: List[str]) -> List[Optional[dict]]:
+        """Claims of each valid access token, None for the others; each distinct token is verified once."""
+        verified = {}
+        for token in tokens:
+            if token not in verified:
+                try:
+                    verified[token] = self.decode_claims(token)
+                except HTTPException:
+                    verified[token] = None
+        return [verified[token] for token in tokens]
+
+    @staticmethod
+    def introspection_results(claims: List[Optional[dict]], snapshots: Dict[str, UserSnapshot]) -> List[dict]:
+        """Per-token introspection: active only for a valid token of an existing, active user."""
+        results = []
+        for token_claims in claims:
+            snapshot = snapshots.get(token_claims["sub"]) if token_claims is not None else None
+            if snapshot is None or not snapshot.is_active:
+                results.append({"active": False, "claims": token_claims})
+            else:
+                results.append({"active": True, "user_id": snapshot.user_id, "claims": token_claims})
+        return results
+
+    def cached_user_snapshots(self, usernames: Iterable[str]) -> Tuple[Dict[str, UserSnapshot], List[str]]:
+        """(snapshots found in the user cache, usernames that were not)."""
+        user_cache = self.config.user_cache
+        schema = self.schema
+        snapshots, missing = {}, []
+        for username in usernames:
+            snapshot = user_cache.get(username, schema)
+            if snapshot is None:
+                missing.append(username)
+            else:
+                snapshots[username] = snapshot
+        return snapshots, missing
+
+    def active_snapshot(self, snapshot: Optional[UserSnapshot]) -> UserSnapshot:
+        """The snapshot of an existing, active user; anything else fails authentication."""
+        if snapshot is None or not snapshot.is_active:
+            raise self.credentials_exception()
+        return snapshot
@@ -0,0 +1,125 @@
+"""Central password hashing policy.
+
+Run as a module to calibrate the hash cost for a target verify latency on this machine:
+
+    python -m security.HashingPolicy --target-ms 250
+"""
+import argparse
+import os
+import time
+from typing import List
+
+from passlib.context import CryptContext
+
+SUPPORTED_SCHEMES = ("bcrypt", "argon2")
+
+
+class HashingPolicy:
+    """Which scheme new hashes use, at what cost, and which older schemes are still accepted.
+
+    The first scheme hashes new passwords; the others are verify-only and flagged for
+    rehash. Hashes whose cost differs from the configured one are flagged as well, so
+    raising or lowering the cost migrates users as they log in.
+    """
+
+    def __init__(self, schemes: List[str], bcrypt_rounds: int = 12, argon2_time_cost: int = 3,
+                 argon2_memory_cost: int = 65536, argon2_parallelism: int = 4):
+        unknown = [scheme for scheme in schemes if scheme not in SUPPORTED_SCHEMES]
+        if not schemes or unknown:
+            raise ValueError(f"Unsupported password schemes: {unknown or schemes}. "
+                             f"Supported: {', '.join(SUPPORTED_SCHEMES)}")
+        if "argon2" in schemes:
+            from passlib.hash import argon2
+            if not argon2.has_backend():
+                raise RuntimeError("The argon2 password scheme requires the argon2-cffi package.")
+        self.schemes = schemes
+        self.bcrypt_rounds = bcrypt_rounds
+        self.argon2_time_cost = argon2_time_cost
+        self.argon2_memory_cost = argon2_memory_cost
+        self.argon2_parallelism = argon2_parallelism
+
+    @classmethod
+    def from_env(cls) -> "HashingPolicy":
+        return cls(
+            schemes=[scheme.strip() for scheme in os.getenv('PASSWORD_SCHEMES', 'bcrypt').split(",") if scheme.strip()],
+            bcrypt_rounds=int(os.getenv('BCRYPT_ROUNDS', '12')),
+            argon2_time_cost=int(os.getenv('ARGON2_TIME_COST', '3')),
+            argon2_memory_cost=int(os.getenv('ARGON2_MEMORY_COST', '65536')),
+            argon2_parallelism=int(os.getenv('ARGON2_PARALLELISM', '4')),
+        )
+
+    def build_context(self) -> CryptContext:
+        settings = {}
+        if "bcrypt" in self.schemes:
+            # min = max = default, so any other cost is reported by needs_update
+            settings.update(bcrypt__default_rounds=self.bcrypt_rounds, bcrypt__min_rounds=self.bcrypt_rounds,
+                            bcrypt__max_rounds=self.bcrypt_rounds)
+        if "argon2" in self.schemes:
+            settings.update(argon2__time_cost=self.argon2_time_cost, argon2__memory_cost=self.argon2_memory_cost,
+                            argon2__parallelism=self.argon2_parallelism)
+        return CryptContext(schemes=self.schemes, default=self.schemes[0], deprecated="auto", **settings)
+
+    def describe(self) -> dict:
+        return {
+            "schemes": self.schemes,
+            "bcrypt_rounds": self.bcrypt_rounds,
+            "argon2_time_cost": self.argon2_time_cost,
+            "argon2_memory_cost": self.argon2_memory_cost,
+        }
+
+
+def measure_verify(context: CryptContext, samples: int = 3) -> float:
+    """Median seconds to verify a password against a hash made by `context`."""
+    hashed = context.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify("calibration-password", hashed)
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate(scheme: str, target_seconds: float, base: HashingPolicy) -> tuple:
+    """Highest cost whose verify time stays within `target_seconds`, with its measured time.
+
+    bcrypt varies rounds (each step doubles the work); argon2 varies time_cost at the
+    configured memory cost.
+    """
+    if scheme == "bcrypt":
+        costs, field = range(4, 32), "bcrypt_rounds"
+    else:
+        costs, field = range(1, 64), "argon2_time_cost"
+
+    best = None
+    for cost in costs:
+        settings = dict(bcrypt_rounds=base.bcrypt_rounds, argon2_time_cost=base.argon2_time_cost,
+                        argon2_memory_cost=base.argon2_memory_cost, argon2_parallelism=base.argon2_parallelism)
+        settings[field] = cost
+        policy = HashingPolicy([scheme], **settings)
+        elapsed = measure_verify(policy.build_context())
+        print(f"  {field}={cost:<3} {elapsed * 1000:9.1f} ms")
+        if elapsed > target_seconds:
+            break
+        best = (cost, elapsed)
+    if best is None:
+        raise RuntimeError(f"Even the lowest {scheme} cost exceeds {target_seconds * 1000:.0f} ms on this machine.")
+    return field, best[0], best[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick a password hash cost for a target verify latency.")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target verify latency per login")
+    parser.add_argument("--scheme", choices=SUPPORTED_SCHEMES, default=None,
+                        help="Scheme to calibrate (default: first of PASSWORD_SCHEMES)")
+    args = parser.parse_args()
+
+    base = HashingPolicy.from_env()
+    scheme = args.scheme or base.schemes[0]
+    print(f"Calibrating {scheme} for a {args.target_ms:.0f} ms verify on this machine:")
+    field, cost, elapsed = calibrate(scheme, args.target_ms / 1000, base)
+    print(f"\nRecommended: {field.upper()}={cost}  ({elapsed * 1000:.1f} ms per verify)")
+    print("Existing hashes at another cost are rehashed on their next successful login.")
+
+
+if __name__ == "__main__":
+    main()
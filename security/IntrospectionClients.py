@@ -0,0 +1,84 @@
+import hmac
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+from fastapi.security import HTTPBasicCredentials
+
+from security.LoginThrottle import SlidingWindowLimiter
+from utils.LoggingConfig import LoggerManager
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+
+class IntrospectionRateLimitError(HTTPException):
+    """429 raised for an introspection call over its client's or address's limit."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many introspection requests, try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class IntrospectionClients:
+    """Gateways allowed to call /auth/introspect, authenticated with HTTP Basic client credentials.
+
+    Credentials are read from a secret shaped ``{"<client_id>": "<client_secret>", ...}``;
+    without that secret every call is rejected. Each client may make ``limit`` calls per
+    ``window`` seconds, and failed attempts are limited the same way per client address.
+    """
+
+    def __init__(self, secret_loader: Callable[[], Dict[str, str]], limit: int = 600, window: float = 60.0,
+                 retry_unconfigured: float = 60.0):
+        self.secret_loader = secret_loader
+        self.retry_unconfigured = retry_unconfigured
+        self.by_client = SlidingWindowLimiter(limit, window, max_keys=10000)
+        self.by_ip = SlidingWindowLimiter(limit, window)
+        self._unconfigured_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"authenticated": 0, "rejected_credentials": 0, "rejected_rate": 0}
+
+    def _clients(self) -> Dict[str, str]:
+        # A missing secret is remembered for a while, so rejected callers cannot trigger a fetch per request
+        if time.monotonic() < self._unconfigured_until:
+            return {}
+        try:
+            return self.secret_loader()
+        except Exception as e:
+            self._unconfigured_until = time.monotonic() + self.retry_unconfigured
+            logger.warning(f"Introspection clients are not configured, rejecting every caller: {e}")
+            return {}
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _limit(self, limiter: SlidingWindowLimiter, key: str):
+        retry_after = limiter.hit(key)
+        if retry_after:
+            self._count("rejected_rate")
+            raise IntrospectionRateLimitError(retry_after)
+
+    def authenticate(self, credentials: Optional[HTTPBasicCredentials], client_ip: Optional[str]) -> str:
+        """The calling client's ID; raises 401 for missing or wrong credentials and 429 over the limits."""
+        expected = self._clients().get(credentials.username) if credentials else None
+        if expected is None or not hmac.compare_digest(credentials.password.encode(), str(expected).encode()):
+            if client_ip:
+                self._limit(self.by_ip, client_ip)
+            self._count("rejected_credentials")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid introspection client credentials",
+                headers={"WWW-Authenticate": "Basic"},
+            )
+        self._limit(self.by_client, credentials.username)
+        self._count("authenticated")
+        return credentials.username
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, tracked_clients=len(self.by_client))
@@ -0,0 +1,204 @@
+import ipaddress
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from utils.LoggingConfig import LoggerManager
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+# Header carrying the client address when behind a proxy (e.g. X-Forwarded-For); unset trusts the socket peer
+FORWARDED_IP_HEADER = os.getenv('FORWARDED_IP_HEADER')
+# Proxies in front of the app that append to FORWARDED_IP_HEADER; the client address is that many entries from the right
+TRUSTED_PROXY_HOPS = max(int(os.getenv('TRUSTED_PROXY_HOPS', '1')), 1)
+# Peer addresses or networks allowed to set FORWARDED_IP_HEADER (comma separated); unset trusts no peer
+TRUSTED_PROXIES = [ipaddress.ip_network(entry.strip(), strict=False)
+                   for entry in os.getenv('TRUSTED_PROXIES', '').split(',') if entry.strip()]
+if FORWARDED_IP_HEADER and not TRUSTED_PROXIES:
+    logger.warning(f"FORWARDED_IP_HEADER is set but TRUSTED_PROXIES is not; {FORWARDED_IP_HEADER} is ignored")
+
+
+class LoginThrottledError(HTTPException):
+    """429 raised for a login attempt over its username or client IP limit."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class _Window:
+    __slots__ = ('start', 'current', 'previous')
+
+    def __init__(self, start: float):
+        self.start = start
+        self.current = 0
+        self.previous = 0
+
+
+class SlidingWindowLimiter:
+    """Approximate sliding-window counters for many keys in bounded memory.
+
+    Each key keeps the counts of the current and previous fixed windows; the sliding
+    count weights the previous window by how much of it still overlaps. Keys are held
+    in LRU order, dropped once both windows have expired, and the least recently used
+    key is evicted when ``max_keys`` is reached.
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int = 100000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._windows: "OrderedDict[str, _Window]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _roll(self, key: str, now: float) -> _Window:
+        """Return the key's window advanced to `now`. Caller holds the lock."""
+        entry = self._windows.get(key)
+        if entry is None:
+            entry = _Window(now - now % self.window)
+            self._windows[key] = entry
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._windows.move_to_end(key)
+            elapsed = int((now - entry.start) // self.window)
+            if elapsed >= 1:
+                entry.previous = entry.current if elapsed == 1 else 0
+                entry.current = 0
+                entry.start += elapsed * self.window
+        return entry
+
+    def _estimate(self, entry: _Window, now: float) -> float:
+        overlap = 1 - (now - entry.start) / self.window
+        return entry.previous * overlap + entry.current
+
+    def hit(self, key: str, now: Optional[float] = None) -> int:
+        """Count one attempt for `key`. Returns 0 if allowed, else seconds until it would be."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._roll(key, now)
+            if self._estimate(entry, now) + 1 > self.limit:
+                return self._retry_after(entry, now)
+            entry.current += 1
+            return 0
+
+    def _retry_after(self, entry: _Window, now: float) -> int:
+        """Seconds until the weighted previous window has decayed enough to admit one more attempt."""
+        if entry.current + 1 > self.limit or not entry.previous:
+            return max(1, math.ceil(entry.start + self.window - now))
+        # previous * (1 - (t - start) / window) + current + 1 <= limit
+        overlap_allowed = (self.limit - entry.current - 1) / entry.previous
+        return max(1, math.ceil(entry.start + (1 - overlap_allowed) * self.window - now))
+
+    def reset(self, key: str):
+        with self._lock:
+            self._windows.pop(key, None)
+
+    def purge(self, now: Optional[float] = None):
+        """Drop keys whose windows have fully expired."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for key, entry in list(self._windows.items()):
+                if now - entry.start >= 2 * self.window:
+                    del self._windows[key]
+
+    def __len__(self):
+        return len(self._windows)
+
+
+class LoginThrottle:
+    """Admission check in front of authenticate_user, run before any DB or bcrypt work.
+
+    Every attempt counts against both its username and its client IP; a successful
+    login clears the username's counter.
+    """
+
+    def __init__(self, username_limit: int = 5, ip_limit: int = 20, window: float = 60.0,
+                 max_keys: int = 100000, enabled: bool = True):
+        self.enabled = enabled
+        self.by_username = SlidingWindowLimiter(username_limit, window, max_keys)
+        self.by_ip = SlidingWindowLimiter(ip_limit, window, max_keys)
+        self._lock = threading.Lock()
+        self._stats = {"allowed": 0, "rejected_username": 0, "rejected_ip": 0}
+        self._last_purge = time.monotonic()
+
+    def admit(self, username: str, client_ip: Optional[str]):
+        """Count a login attempt or raise LoginThrottledError if it is over a limit."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        self._maybe_purge(now)
+        if client_ip:
+            retry_after = self.by_ip.hit(client_ip, now)
+            if retry_after:
+                self._reject("rejected_ip", f"Login throttled for client {client_ip}", retry_after)
+        retry_after = self.by_username.hit(username.lower(), now)
+        if retry_after:
+            self._reject("rejected_username", f"Login throttled for username: {username}", retry_after)
+        with self._lock:
+            self._stats["allowed"] += 1
+
+    def record_success(self, username: str):
+        if self.enabled:
+            self.by_username.reset(username.lower())
+
+    def _reject(self, counter: str, message: str, retry_after: int):
+        with self._lock:
+            self._stats[counter] += 1
+        logger.warning(message)
+        raise LoginThrottledError(retry_after)
+
+    def _maybe_purge(self, now: float):
+        """Sweep expired keys at most once per window, so idle keys do not linger until LRU eviction."""
+        with self._lock:
+            if now - self._last_purge < self.by_username.window:
+                return
+            self._last_purge = now
+        self.by_username.purge(now)
+        self.by_ip.purge(now)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update(
+            tracked_usernames=len(self.by_username),
+            tracked_ips=len(self.by_ip),
+            evictions=self.by_username.evictions + self.by_ip.evictions,
+        )
+        return stats
+
+
+def _is_trusted_proxy(host: Optional[str]) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except (TypeError, ValueError):
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """Client address of a request, from FORWARDED_IP_HEADER when configured.
+
+    Clients can put anything at the left of the header, so only the entry added by the
+    outermost trusted proxy (TRUSTED_PROXY_HOPS from the right) is used. The socket peer
+    is used when the header is missing, too short, or the peer is not in TRUSTED_PROXIES,
+    which includes every peer while TRUSTED_PROXIES is unset.
+    """
+    peer = request.client.host if request.client else None
+    if FORWARDED_IP_HEADER and _is_trusted_proxy(peer):
+        forwarded = [entry.strip() for entry in request.headers.get(FORWARDED_IP_HEADER, '').split(",")]
+        forwarded = [entry for entry in forwarded if entry]
+        if len(forwarded) >= TRUSTED_PROXY_HOPS:
+            return forwarded[-TRUSTED_PROXY_HOPS]
+    return peer
@@ -0,0 +1,217 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from passlib.context import CryptContext
+
+from utils.Metrics import MetricsRegistry
+
+HASH_DURATION = MetricsRegistry().histogram(
+    "password_hash_duration_seconds", "Password hashing time including queueing, by operation.", ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+# Password context of a pool worker process, built once by _init_worker
+_worker_context = None
+
+
+def _init_worker(context_config: str):
+    global _worker_context
+    _worker_context = CryptContext.from_string(context_config)
+
+
+def _hash_in_worker(password: str) -> str:
+    return _worker_context.hash(password)
+
+
+def _verify_in_worker(password: str, hashed_password: str) -> bool:
+    return _worker_context.verify(password, hashed_password)
+
+
+def _verify_and_update_in_worker(password: str, hashed_password: str) -> tuple:
+    return _worker_context.verify_and_update(password, hashed_password)
+
+
+class HashingCapacityError(HTTPException):
+    """Raised when the hashing queue is full; tells the client when to retry."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password hashing capacity exceeded, please retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class PasswordHasher:
+    """Runs password hashing and verification on a dedicated process pool.
+
+    At most ``max_pending`` operations may be queued or running at once; further
+    calls fail fast with ``HashingCapacityError`` instead of queueing without bound.
+    Batches (``hash_many``) wait up to ``batch_wait`` seconds for room instead.
+    The sync methods block the calling threadpool thread until the result is back, so
+    the lifespan grows the threadpool by ``max_pending``; the async methods do not hold
+    a thread. With ``workers=0`` the work runs inline on the calling thread.
+    """
+
+    def __init__(self, pwd_context: CryptContext, workers: int, max_pending: int, retry_after: int = 1,
+                 batch_wait: float = 30.0):
+        self.pwd_context = pwd_context
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.batch_wait = batch_wait
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._pending = 0
+        self._stats = {"completed": 0, "rejected": 0, "failed": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers only import this module, never the application
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.pwd_context.to_string(),),
+                )
+            return self._executor
+
+    def _admit(self, slots: int = 1, wait: float = 0.0):
+        """Reserve queue slots, waiting up to `wait` seconds for room; fails when the queue stays full."""
+        with self._slot_freed:
+            if wait > 0:
+                self._slot_freed.wait_for(lambda: self._pending + slots <= self.max_pending, timeout=wait)
+            if self._pending + slots > self.max_pending:
+                self._stats["rejected"] += 1
+                raise HashingCapacityError(self.retry_after)
+            self._pending += slots
+
+    def _release(self, operation: str, start: float, ok: bool, slots: int = 1):
+        elapsed = time.perf_counter() - start
+        HASH_DURATION.observe(elapsed, operation=operation)
+        with self._slot_freed:
+            self._pending -= slots
+            self._slot_freed.notify_all()
+            if ok:
+                self._stats["completed"] += 1
+                self._stats["total_seconds"] += elapsed
+                self._stats["max_seconds"] = max(self._stats["max_seconds"], elapsed)
+            else:
+                self._stats["failed"] += 1
+
+    def _run(self, operation: str, worker_fn, inline_fn, *args):
+        self._admit()
+        start = time.perf_counter()
+        ok = False
+        try:
+            if self.workers <= 0:
+                result = inline_fn(*args)
+            else:
+                result = self._get_executor().submit(worker_fn, *args).result()
+            ok = True
+            return result
+        finally:
+            self._release(operation, start, ok)
+
+    async def _run_async(self, operation: str, worker_fn, inline_fn, *args):
+        self._admit()
+        start = time.perf_counter()
+        ok = False
+        try:
+            if self.workers <= 0:
+                result = await run_in_threadpool(inline_fn, *args)
+            else:
+                result = await asyncio.wrap_future(self._get_executor().submit(worker_fn, *args))
+            ok = True
+            return result
+        finally:
+            self._release(operation, start, ok)
+
+    def hash(self, password: str) -> str:
+        """Hash a plain-text password on the pool."""
+        return self._run("hash", _hash_in_worker, self.pwd_context.hash, password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a plain-text password against a hash on the pool."""
+        return self._run("verify", _verify_in_worker, self.pwd_context.verify, password, hashed_password)
+
+    def verify_and_update(self, password: str, hashed_password: str) -> tuple:
+        """Verify a password and, if its hash is outdated under the policy, return a new hash.
+
+        Returns ``(verified, new_hash)``; ``new_hash`` is None when no rehash is needed.
+        """
+        return self._run("verify", _verify_and_update_in_worker, self.pwd_context.verify_and_update,
+                         password, hashed_password)
+
+    def hash_many(self, passwords: list) -> list:
+        """Hash a batch of passwords in parallel across the pool.
+
+        The batch is queued one pool-sized chunk at a time, each admitted like the same
+        number of single hashes, so logins wait behind at most one chunk. A chunk waits up
+        to ``batch_wait`` seconds for room; if there is still none, the rest of the batch is
+        returned as None so the caller keeps the hashes already made. Only when not even
+        the first chunk gets in is ``HashingCapacityError`` raised.
+        """
+        chunk_size = max(min(self.workers, self.max_pending), 1)
+        result = []
+        for offset in range(0, len(passwords), chunk_size):
+            chunk = passwords[offset:offset + chunk_size]
+            try:
+                self._admit(len(chunk), wait=self.batch_wait)
+            except HashingCapacityError:
+                if not result:
+                    raise
+                return result + [None] * (len(passwords) - len(result))
+            start = time.perf_counter()
+            ok = False
+            try:
+                if self.workers <= 0:
+                    result.extend(self.pwd_context.hash(password) for password in chunk)
+                else:
+                    executor = self._get_executor()
+                    futures = [executor.submit(_hash_in_worker, password) for password in chunk]
+                    result.extend(future.result() for future in futures)
+                ok = True
+            finally:
+                self._release("hash_many", start, ok, len(chunk))
+        return result
+
+    async def hash_async(self, password: str) -> str:
+        """Hash a plain-text password on the pool without blocking the event loop."""
+        return await self._run_async("hash", _hash_in_worker, self.pwd_context.hash, password)
+
+    async def verify_and_update_async(self, password: str, hashed_password: str) -> tuple:
+        return await self._run_async("verify", _verify_and_update_in_worker, self.pwd_context.verify_and_update,
+                                     password, hashed_password)
+
+    async def verify_async(self, password: str, hashed_password: str) -> bool:
+        """Verify a password on the pool without blocking the event loop."""
+        return await self._run_async("verify", _verify_in_worker, self.pwd_context.verify, password, hashed_password)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, queue_depth=self._pending, max_pending=self.max_pending, workers=self.workers)
+        completed = stats["completed"]
+        stats["avg_seconds"] = stats["total_seconds"] / completed if completed else 0.0
+        return stats
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def after_fork(self):
+        """Start afresh in a forked child: the parent's worker processes and queue are not ours."""
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._executor = None
+        self._pending = 0
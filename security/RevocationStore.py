@@ -0,0 +1,203 @@
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from models.SQLModel import RevokedToken
+from utils.LoggingConfig import LoggerManager
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    """Naive UTC datetime, as stored in revoked_tokens."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _to_timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class DatabaseRevocations:
+    """The revoked_tokens table, so revocations survive restarts and reach every worker."""
+
+    def __init__(self, engine_provider: Callable[[], Engine]):
+        self.engine_provider = engine_provider
+        self.table = RevokedToken.__table__
+
+    def ensure_table(self):
+        self.table.create(self.engine_provider(), checkfirst=True)
+
+    def add(self, jti: str, expires_at: float) -> bool:
+        """Insert a revocation; False when the jti was already revoked (the primary key makes this atomic)."""
+        try:
+            with self.engine_provider().begin() as connection:
+                connection.execute(insert(self.table).values(
+                    jti=jti, expires_at=_to_datetime(expires_at), revoked_at=_utcnow()))
+        except IntegrityError:
+            return False
+        return True
+
+    def load(self, revoked_after: Optional[datetime], limit: int) -> List[Tuple[str, float, datetime]]:
+        """Unexpired revocations made after `revoked_after` (all when None), latest expiry first."""
+        statement = (
+            select(self.table.c.jti, self.table.c.expires_at, self.table.c.revoked_at)
+            .where(self.table.c.expires_at > _utcnow())
+            .order_by(self.table.c.expires_at.desc())
+            .limit(limit)
+        )
+        if revoked_after is not None:
+            statement = statement.where(self.table.c.revoked_at > revoked_after)
+        with self.engine_provider().connect() as connection:
+            return [(jti, _to_timestamp(expires_at), revoked_at)
+                    for jti, expires_at, revoked_at in connection.execute(statement)]
+
+    def purge_expired(self) -> int:
+        with self.engine_provider().begin() as connection:
+            return connection.execute(delete(self.table).where(self.table.c.expires_at <= _utcnow())).rowcount
+
+
+class RevocationStore:
+    """Revoked token IDs (``jti``), each kept until the token it revokes expires.
+
+    ``is_revoked`` is a single dict lookup. Expired entries are dropped in expiry order
+    from a heap as new revocations arrive; past ``max_size`` the entries closest to
+    expiry are dropped first. With ``persistence`` set, revocations are also written to
+    the database, loaded at startup and polled every ``sync_interval`` seconds, so they
+    survive restarts and reach the other workers within that interval. ``consume`` checks
+    the database row itself, so a single-use token is accepted once across all workers.
+    """
+
+    def __init__(self, max_size: int = 100000, persistence: Optional[DatabaseRevocations] = None,
+                 sync_interval: float = 10.0):
+        self.max_size = max_size
+        self.persistence = persistence
+        self.sync_interval = sync_interval
+        self._expires: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._synced_until: Optional[datetime] = None
+        self._stats = {"revoked": 0, "rejected": 0, "expired_evictions": 0, "overflow_evictions": 0,
+                       "sync_failures": 0}
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if jti is None:
+            return False
+        expires_at = self._expires.get(jti)
+        if expires_at is None or expires_at <= time.time():
+            return False
+        with self._lock:
+            self._stats["rejected"] += 1
+        return True
+
+    def revoke(self, jti: str, expires_at: float):
+        """Revoke a token until `expires_at` (epoch seconds, the token's exp)."""
+        if expires_at <= time.time():
+            return
+        self._add(jti, expires_at)
+        if self.persistence is not None:
+            self.persistence.add(jti, expires_at)
+
+    def consume(self, jti: str, expires_at: float) -> bool:
+        """Revoke a single-use token, atomically: False when it was already revoked here or by another worker."""
+        now = time.time()
+        with self._lock:
+            if expires_at <= now or self._expires.get(jti, 0) > now:
+                self._stats["rejected"] += 1
+                return False
+            self._insert(jti, expires_at, now)
+        if self.persistence is not None and not self.persistence.add(jti, expires_at):
+            with self._lock:
+                self._stats["rejected"] += 1
+            return False
+        return True
+
+    def _add(self, jti: str, expires_at: float):
+        with self._lock:
+            self._insert(jti, expires_at, time.time())
+
+    def _insert(self, jti: str, expires_at: float, now: float):
+        """Record a revocation. Caller holds the lock."""
+        if self._expires.get(jti, 0) >= expires_at:
+            return
+        self._expires[jti] = expires_at
+        heapq.heappush(self._heap, (expires_at, jti))
+        self._stats["revoked"] += 1
+        self._evict(now)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then the soonest-expiring ones beyond max_size. Caller holds the lock."""
+        while self._heap and (self._heap[0][0] <= now or len(self._expires) > self.max_size):
+            expires_at, jti = heapq.heappop(self._heap)
+            if self._expires.get(jti) != expires_at:
+                continue  # Superseded by a later revocation of the same jti
+            del self._expires[jti]
+            if expires_at <= now:
+                self._stats["expired_evictions"] += 1
+            else:
+                self._stats["overflow_evictions"] += 1
+        if len(self._heap) > 2 * self.max_size:
+            # Rebuild after many superseded entries so the heap stays bounded too
+            self._heap = [(expires_at, jti) for jti, expires_at in self._expires.items()]
+            heapq.heapify(self._heap)
+
+    def sync(self):
+        """Pull revocations made by other workers (all unexpired ones on the first call)."""
+        started = _utcnow()
+        # Overlap the previous window a little to allow for clock skew between hosts
+        since = self._synced_until - timedelta(seconds=max(self.sync_interval, 1)) if self._synced_until else None
+        for jti, expires_at, _ in self.persistence.load(since, self.max_size):
+            self._add(jti, expires_at)
+        self._synced_until = started
+
+    def start_sync(self):
+        """Load persisted revocations and keep polling for new ones in the background."""
+        if self.persistence is None or self._thread is not None:
+            return
+        self.persistence.ensure_table()
+        self.sync()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="revocation-sync", daemon=True)
+        self._thread.start()
+
+    def stop_sync(self):
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _run(self):
+        runs = 0
+        while not self._stop.wait(self.sync_interval):
+            runs += 1
+            try:
+                self.sync()
+                if runs % 60 == 0:
+                    self.persistence.purge_expired()
+            except Exception as e:
+                with self._lock:
+                    self._stats["sync_failures"] += 1
+                logger.warning(f"Syncing token revocations failed: {e}")
+
+    def after_fork(self):
+        """Start afresh in a forked child; the parent's sync thread did not survive the fork."""
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, entries=len(self._expires), max_size=self.max_size,
+                        persistent=self.persistence is not None)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import threading
+from typing import Callable, Dict, Optional
+
+from jose import jwk
+from jose.backends.base import Key
+
+from utils.LoggingConfig import LoggerManager
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+SYMMETRIC_ALGORITHMS = ("HS256", "HS384", "HS512")
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512")
+
+
+def check_algorithm(algorithm: str) -> str:
+    """Validate JWT_ALGORITHM against the algorithms python-jose can sign with."""
+    if algorithm in SYMMETRIC_ALGORITHMS or algorithm in ASYMMETRIC_ALGORITHMS:
+        return algorithm
+    if algorithm.upper() == "EDDSA":
+        raise ValueError("JWT_ALGORITHM=EdDSA is not supported by python-jose; use ES256 or RS256.")
+    raise ValueError(f"Unsupported JWT_ALGORITHM: {algorithm}")
+
+
+class SigningKey:
+    """One entry of the key set: a kid with its public key and, when this service signs with it, its private key."""
+    __slots__ = ('kid', 'algorithm', 'private_key', 'public_key', 'public_jwk')
+
+    def __init__(self, kid: str, algorithm: str, private_key: Optional[Key], public_key: Key):
+        self.kid = kid
+        self.algorithm = algorithm
+        self.private_key = private_key
+        self.public_key = public_key
+        self.public_jwk = dict(public_key.to_dict(), kid=kid, use="sig")
+
+    @classmethod
+    def from_entry(cls, entry: dict, algorithm: str) -> "SigningKey":
+        """Build from a secret entry: ``{"kid": ..., "private_key": PEM}`` or ``{"kid": ..., "public_key": PEM}``."""
+        kid = entry.get("kid")
+        if not kid:
+            raise ValueError("Every entry in SIGNING_KEYS needs a kid.")
+        if entry.get("private_key"):
+            private_key = jwk.construct(entry["private_key"], algorithm)
+            return cls(kid, algorithm, private_key, private_key.public_key())
+        if entry.get("public_key"):
+            return cls(kid, algorithm, None, jwk.construct(entry["public_key"], algorithm))
+        raise ValueError(f"Signing key '{kid}' has neither a private_key nor a public_key.")
+
+
+class KeySet:
+    """Parsed signing keys: the active key signs, every key verifies the tokens carrying its kid.
+
+    Rotation is done in the JWT secret without a restart:
+
+    1. add the new key to ``SIGNING_KEYS`` and wait at least ``JWKS_MAX_AGE`` so every
+       verifier has fetched it;
+    2. set ``ACTIVE_KID`` to the new kid; new tokens are signed with it;
+    3. keep the old entry (its ``public_key`` is enough) until the last token it signed
+       has expired, i.e. the refresh token lifetime, then remove it.
+    """
+
+    def __init__(self, algorithm: str, keys: Dict[str, SigningKey], active_kid: str):
+        if active_kid not in keys or keys[active_kid].private_key is None:
+            raise ValueError(f"ACTIVE_KID '{active_kid}' does not name a key with a private_key.")
+        self.algorithm = algorithm
+        self.keys = keys
+        self.active = keys[active_kid]
+        # The JWKS document is served as is, so it is rendered once per key set
+        self.jwks_body = json.dumps({"keys": [key.public_jwk for key in keys.values()]},
+                                    separators=(",", ":")).encode()
+        self.jwks_etag = '"' + hashlib.sha256(self.jwks_body).hexdigest()[:32] + '"'
+
+    @classmethod
+    def from_secret(cls, secret: dict, algorithm: str) -> "KeySet":
+        """Keys from the JWT secret's ``SIGNING_KEYS`` list; ``ACTIVE_KID`` defaults to the first private key."""
+        entries = secret.get("SIGNING_KEYS") or []
+        keys = {}
+        for entry in entries:
+            key = SigningKey.from_entry(entry, algorithm)
+            keys[key.kid] = key
+        active_kid = secret.get("ACTIVE_KID") or next(
+            (entry.get("kid") for entry in entries if entry.get("private_key")), None)
+        return cls(algorithm, keys, active_kid)
+
+    def get(self, kid: Optional[str]) -> Optional[SigningKey]:
+        return self.keys.get(kid) if kid is not None else None
+
+
+class SigningKeyProvider:
+    """The key set for the current JWT secret, parsed again only when its key entries change.
+
+    The secret itself comes from the cached secret provider, so a rotation is picked up
+    within SECRET_CACHE_TTL. Keeping the parsed keys across secret refreshes keeps their
+    identity stable, which the verified-token cache relies on.
+    """
+
+    def __init__(self, secret_loader: Callable[[], dict], algorithm: str):
+        self.secret_loader = secret_loader
+        self.algorithm = check_algorithm(algorithm)
+        self.asymmetric = self.algorithm in ASYMMETRIC_ALGORITHMS
+        self._source = None
+        self._parsed_from = None
+        self._key_set: Optional[KeySet] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> KeySet:
+        secret = self.secret_loader()
+        key_set = self._key_set
+        if secret is self._source and key_set is not None:
+            return key_set
+        with self._lock:
+            source = (secret.get("SIGNING_KEYS"), secret.get("ACTIVE_KID"))
+            if self._key_set is None or source != self._parsed_from:
+                try:
+                    self._key_set = KeySet.from_secret(secret, self.algorithm)
+                    logger.info(f"Loaded {len(self._key_set.keys)} JWT signing keys; "
+                                f"active kid {self._key_set.active.kid}")
+                except Exception as e:
+                    if self._key_set is None:
+                        raise
+                    # A broken rotation must not take signing down; keep the last good keys
+                    logger.error(f"Invalid JWT signing keys in the secret, keeping the previous ones: {e}")
+                self._parsed_from = source
+            self._source = secret
+            return self._key_set
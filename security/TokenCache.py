@@ -0,0 +1,78 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class _VerifiedToken:
+    __slots__ = ('claims', 'expires_at', 'key')
+
+    def __init__(self, claims: dict, expires_at: float, key: object):
+        self.claims = claims
+        self.expires_at = expires_at
+        self.key = key
+
+
+class VerifiedTokenCache:
+    """LRU cache of JWT claims that already passed signature and expiry checks.
+
+    Entries are keyed by a digest of the token, so bearer tokens are never held in
+    memory, and are served only until the token's ``exp`` and only while the signing
+    key they were verified with is current. Per-request checks that can change over
+    a token's life (revocation, schema, token type) are left to the caller. Cached
+    claims are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, max_size: int = 10000, enabled: bool = True):
+        self.max_size = max_size
+        self.enabled = enabled
+        self._entries: "OrderedDict[bytes, _VerifiedToken]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str, key: object) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry.expires_at <= time.time() or entry.key != key:
+                del self._entries[digest]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(digest)
+            self._stats["hits"] += 1
+            return entry.claims
+
+    def put(self, token: str, key: object, claims: dict):
+        """Cache verified claims; tokens without a numeric exp are never cached."""
+        expires_at = claims.get("exp")
+        if not self.enabled or not isinstance(expires_at, (int, float)):
+            return
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = _VerifiedToken(claims, float(expires_at), key)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries), max_size=self.max_size)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
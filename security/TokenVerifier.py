@@ -0,0 +1,138 @@
+"""Local verification of this service's access tokens, for other Python services.
+
+Services that only need to know who is calling can check tokens themselves instead
+of calling ``/auth/me`` on every request. The public keys come from the JWKS endpoint
+and are cached for its ``Cache-Control`` max-age; a token signed with a kid not seen yet
+(after a key rotation) triggers one early refetch, at most every ``min_refresh_interval``
+seconds. This module depends on python-jose and the standard library only, so it can be
+imported or copied as is::
+
+    verifier = TokenVerifier("https://auth.internal/auth/.well-known/jwks.json")
+    claims = verifier.verify(token)  # raises InvalidTokenError
+    username = claims["sub"]
+
+Revocations (``/auth/logout``) are not visible locally: a revoked access token stays
+valid here until it expires (ACCESS_TOKEN_EXPIRE_MINUTES). Keep that lifetime short, and
+call ``/auth/me`` where a logout must take effect immediately.
+"""
+import json
+import logging
+import re
+import threading
+import time
+import urllib.request
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from jose import JWTError, jwk, jwt
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512")
+
+
+class InvalidTokenError(Exception):
+    """The token is malformed, expired, signed by an unknown key or not an access token."""
+
+
+def fetch_jwks(url: str, timeout: float) -> Tuple[dict, Optional[float]]:
+    """GET a JWKS document; returns it with the response's max-age, if any."""
+    request = urllib.request.Request(url, headers={"Accept": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control") or "")
+        return json.loads(response.read()), float(match.group(1)) if match else None
+
+
+class TokenVerifier:
+    """Verifies tokens against a JWKS endpoint, keeping the parsed keys in memory.
+
+    ``fetcher(url, timeout)`` returns ``(jwks, max_age)`` and defaults to a plain HTTP
+    GET. When a refetch fails, the keys already loaded keep being used. ``default_schema``
+    is the auth service's default schema, the only one tokens without a schema claim
+    are accepted for.
+    """
+
+    def __init__(self, jwks_url: str, algorithms: Iterable[str] = DEFAULT_ALGORITHMS, ttl: float = 300.0,
+                 min_refresh_interval: float = 30.0, timeout: float = 5.0, leeway: int = 0,
+                 default_schema: Optional[str] = None,
+                 fetcher: Optional[Callable[[str, float], Tuple[dict, Optional[float]]]] = None):
+        self.jwks_url = jwks_url
+        self.algorithms = tuple(algorithms)
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.leeway = leeway
+        self.default_schema = default_schema
+        self.fetcher = fetcher or fetch_jwks
+        self._keys: Dict[str, tuple] = {}  # kid -> (algorithm, key)
+        self._expires_at = 0.0
+        self._fetched_at = float("-inf")
+        self._lock = threading.Lock()
+        self._stats = {"fetches": 0, "fetch_failures": 0, "verified": 0, "rejected": 0}
+
+    def refresh(self):
+        """Fetch the key set now, replacing the cached keys."""
+        self._fetched_at = time.monotonic()
+        try:
+            document, max_age = self.fetcher(self.jwks_url, self.timeout)
+            keys = {}
+            for entry in document.get("keys", []):
+                algorithm = entry.get("alg")
+                if entry.get("kid") and algorithm in self.algorithms and entry.get("use", "sig") == "sig":
+                    keys[entry["kid"]] = (algorithm, jwk.construct(entry, algorithm))
+        except Exception as e:
+            self._stats["fetch_failures"] += 1
+            # Keep serving the keys we have; try again after min_refresh_interval
+            self._expires_at = self._fetched_at + self.min_refresh_interval
+            logger.warning(f"Fetching JWKS from {self.jwks_url} failed: {e}")
+            if not self._keys:
+                raise InvalidTokenError("No verification keys available") from e
+            return
+        self._stats["fetches"] += 1
+        self._keys = keys
+        self._expires_at = self._fetched_at + (max_age if max_age is not None else self.ttl)
+
+    def _key(self, kid: Optional[str]) -> Optional[tuple]:
+        now = time.monotonic()
+        if now < self._expires_at and kid in self._keys:
+            return self._keys[kid]
+        with self._lock:
+            # Another thread may have refreshed while this one waited
+            now = time.monotonic()
+            expired = now >= self._expires_at
+            unknown_kid = kid not in self._keys and now - self._fetched_at >= self.min_refresh_interval
+            if expired or unknown_kid:
+                self.refresh()
+            return self._keys.get(kid)
+
+    def verify(self, token: str, token_type: str = "access", schema: Optional[str] = None) -> dict:
+        """Claims of a valid token of `token_type`; with `schema`, tokens issued for another schema fail."""
+        try:
+            claims = self._decode(token)
+            # Tokens without a type predate refresh tokens and are access tokens
+            if claims.get("sub") is None or claims.get("type", "access") != token_type:
+                raise InvalidTokenError("Wrong token type")
+            # Tokens without a schema claim predate it and belong to the default schema only
+            if schema is not None and claims.get("schema", self.default_schema) != schema:
+                raise InvalidTokenError("Token was issued for another schema")
+        except InvalidTokenError:
+            self._stats["rejected"] += 1
+            raise
+        self._stats["verified"] += 1
+        return claims
+
+    def _decode(self, token: str) -> dict:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except JWTError as e:
+            raise InvalidTokenError("Malformed token") from e
+        key = self._key(kid)
+        if key is None:
+            raise InvalidTokenError(f"Unknown signing key: {kid}")
+        algorithm, public_key = key
+        try:
+            return jwt.decode(token, public_key, algorithms=[algorithm], options={"leeway": self.leeway})
+        except JWTError as e:
+            raise InvalidTokenError(str(e)) from e
+
+    def get_stats(self) -> dict:
+        return dict(self._stats, keys=len(self._keys))
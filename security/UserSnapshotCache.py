@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from models.SQLModel import User
+
+
+class ProfileSnapshot:
+    __slots__ = ('first_name', 'last_name')
+
+    def __init__(self, first_name: Optional[str], last_name: Optional[str]):
+        self.first_name = first_name
+        self.last_name = last_name
+
+
+class UserSnapshot:
+    """Compact, detached copy of the user fields served by /auth/me."""
+    __slots__ = ('user_id', 'username', 'password_hash', 'is_active', 'created_at', 'updated_at', 'profile',
+                 'expires_at')
+
+    def __init__(self, user: User, expires_at: float):
+        self.user_id = user.user_id
+        self.username = user.username
+        self.password_hash = user.password_hash
+        self.is_active = user.is_active
+        self.created_at = user.created_at
+        self.updated_at = user.updated_at
+        profile = user.profile
+        self.profile = ProfileSnapshot(profile.first_name, profile.last_name) if profile else None
+        self.expires_at = expires_at
+
+
+class UserSnapshotCache:
+    """Process-local TTL + LRU cache of user snapshots, keyed by username and user_id.
+
+    Entries are scoped by ``namespace`` (the schema the user was read from), so tenants
+    served from different schemas never share snapshots.
+
+    Writers must call ``invalidate`` after committing a change. ``version`` is bumped on
+    every invalidation; a loader captures it before querying and passes it to ``put`` so
+    a row read before a concurrent write is never cached after that write's invalidation.
+    Invalidation is per process, so other workers may serve a changed user for up to ``ttl``.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.version = 0
+        self._by_username: "OrderedDict[tuple, UserSnapshot]" = OrderedDict()
+        self._username_by_id = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, username: str, namespace: Optional[str] = None) -> Optional[UserSnapshot]:
+        key = (namespace, username)
+        with self._lock:
+            snapshot = self._by_username.get(key)
+            if snapshot is None:
+                self._stats["misses"] += 1
+                return None
+            if snapshot.expires_at <= time.monotonic():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._by_username.move_to_end(key)
+            self._stats["hits"] += 1
+            return snapshot
+
+    def get_by_id(self, user_id: int, namespace: Optional[str] = None) -> Optional[UserSnapshot]:
+        with self._lock:
+            key = self._username_by_id.get((namespace, user_id))
+        if key is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        return self.get(key[1], namespace)
+
+    def put(self, user: User, version: int, namespace: Optional[str] = None) -> Optional[UserSnapshot]:
+        """Cache a snapshot of ``user`` unless an invalidation happened since ``version``."""
+        snapshot = UserSnapshot(user, time.monotonic() + self.ttl)
+        key = (namespace, snapshot.username)
+        with self._lock:
+            if version != self.version:
+                return snapshot
+            self._remove(key)
+            self._by_username[key] = snapshot
+            self._username_by_id[(namespace, snapshot.user_id)] = key
+            while len(self._by_username) > self.max_size:
+                oldest = next(iter(self._by_username))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+        return snapshot
+
+    def invalidate(self, username: Optional[str] = None, user_id: Optional[int] = None,
+                   namespace: Optional[str] = None):
+        """Drop a user from the cache by username and/or user_id."""
+        with self._lock:
+            self.version += 1
+            self._stats["invalidations"] += 1
+            if user_id is not None:
+                cached_key = self._username_by_id.get((namespace, user_id))
+                if cached_key is not None:
+                    self._remove(cached_key)
+            if username is not None:
+                self._remove((namespace, username))
+
+    def invalidate_many(self, user_ids, namespace: Optional[str] = None):
+        """Drop a batch of users from the cache by user_id, e.g. after a bulk update."""
+        with self._lock:
+            self.version += 1
+            self._stats["invalidations"] += 1
+            for user_id in user_ids:
+                cached_key = self._username_by_id.get((namespace, user_id))
+                if cached_key is not None:
+                    self._remove(cached_key)
+
+    def clear(self):
+        with self._lock:
+            self.version += 1
+            self._by_username.clear()
+            self._username_by_id.clear()
+
+    def _remove(self, key: tuple):
+        """Remove an entry from both indexes. Caller holds the lock."""
+        snapshot = self._by_username.pop(key, None)
+        if snapshot is not None:
+            id_key = (key[0], snapshot.user_id)
+            if self._username_by_id.get(id_key) == key:
+                del self._username_by_id[id_key]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, size=len(self._by_username), max_size=self.max_size)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
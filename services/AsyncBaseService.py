@@ -0,0 +1,212 @@
+import logging
+from fastapi import HTTPException
+from sqlalchemy import delete, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import TypeVar, Generic, Type, List, Optional, Tuple, Any, AsyncIterator, Sequence
+
+from services.BaseService import LoaderOptions, chunked, delete_cascade_targets
+
+T = TypeVar('T')
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+
+def _raise_http_exception(status_code: int, detail: str, log_message: Optional[str] = None) -> None:
+    """Helper function to raise an HTTPException with optional logging."""
+    if log_message:
+        logger.error(log_message)
+    raise HTTPException(status_code=status_code, detail=detail)
+
+
+class AsyncBaseService(Generic[T]):
+    """Asyncio counterpart of BaseService, working on an AsyncSession.
+
+    Async sessions cannot lazy-load, so relationships that will be serialized must be
+    requested through loader options.
+    """
+
+    def __init__(self, model: Type[T], session: AsyncSession):
+        self.model = model
+        self.session = session
+
+    def _select(self, options: LoaderOptions = None):
+        """Start a select on the model with the given per-call loader options."""
+        statement = select(self.model)
+        if options:
+            statement = statement.options(*options)
+        return statement
+
+    def _primary_key(self):
+        """Return the (single) primary key column of the model, used as the keyset cursor."""
+        return inspect(self.model).primary_key[0]
+
+    async def get(self, item_id: int, options: LoaderOptions = None, reload: bool = False) -> T:
+        """Retrieve a single item by ID. `reload` bypasses the identity map."""
+        try:
+            item = await self.session.get(self.model, item_id, options=options, populate_existing=reload)
+            if not item:
+                _raise_http_exception(
+                    status_code=404,
+                    detail=f"Item with ID {item_id} not found",
+                    log_message=f"Item with ID {item_id} not found"
+                )
+            return item
+        except HTTPException:
+            raise
+        except Exception as e:
+            _raise_http_exception(
+                status_code=500,
+                detail="Internal server error",
+                log_message=f"Error retrieving item with ID {item_id}: {e}"
+            )
+
+    async def get_all(self, options: LoaderOptions = None) -> List[T]:
+        """Retrieve all items."""
+        try:
+            result = await self.session.execute(self._select(options))
+            return list(result.scalars().all())
+        except Exception as e:
+            _raise_http_exception(
+                status_code=500,
+                detail="Internal server error",
+                log_message=f"Error retrieving items: {e}"
+            )
+
+    async def get_page(self, limit: int, after: Optional[Any] = None,
+                       options: LoaderOptions = None) -> Tuple[List[T], Optional[Any]]:
+        """Retrieve up to `limit` items ordered by primary key, starting after the `after` cursor."""
+        try:
+            key = self._primary_key()
+            statement = self._select(options).order_by(key)
+            if after is not None:
+                statement = statement.where(key > after)
+            result = await self.session.execute(statement.limit(limit + 1))
+            items = list(result.scalars().all())
+
+            next_cursor = None
+            if len(items) > limit:
+                items = items[:limit]
+                next_cursor = getattr(items[-1], key.key)
+            return items, next_cursor
+        except Exception as e:
+            _raise_http_exception(
+                status_code=500,
+                detail="Internal server error",
+                log_message=f"Error retrieving page of items after {after}: {e}"
+            )
+
+    async def stream_all(self, chunk_size: int = 1000, options: LoaderOptions = None) -> AsyncIterator[T]:
+        """Yield all items from a server-side cursor, `chunk_size` rows at a time."""
+        statement = self._select(options).order_by(self._primary_key()).execution_options(yield_per=chunk_size)
+        result = await self.session.stream_scalars(statement)
+        async for item in result:
+            yield item
+
+    async def create(self, item: T) -> T:
+        """Create a new item."""
+        try:
+            self.session.add(item)
+            await self.session.commit()
+            await self.session.refresh(item)
+            return item
+        except Exception as e:
+            await self.session.rollback()
+            _raise_http_exception(
+                status_code=500,
+                detail="Internal server error",
+                log_message=f"Error creating item: {e}"
+            )
+
+    async def delete(self, item_id: int, options: LoaderOptions = None) -> dict:
+        """Delete an item by ID. `options` must load any relationships the delete cascades to."""
+        try:
+            item = await self.get(item_id, options=options)  # Will raise 404 if not found
+            await self.session.delete(item)
+            await self.session.commit()
+            return {"message": f"Item with ID {item_id} deleted successfully"}
+        except HTTPException:
+            raise
+        except Exception as e:
+            await self.session.rollback()
+            _raise_http_exception(
+                status_code=500,
+                detail="Internal server error",
+                log_message=f"Error deleting item with ID {item_id}: {e}"
+            )
+
+    async def iter_id_chunks(self, criteria: Sequence = (), chunk_size: int = 500) -> AsyncIterator[list]:
+        """Yield the primary keys of rows matching `criteria`, `chunk_size` at a time, by keyset."""
+        key = self._primary_key()
+        after = None
+        while True:
+            statement = select(key).where(*criteria).order_by(key).limit(chunk_size)
+            if after is not None:
+                statement = statement.where(key > after)
+            ids = list(await self.session.scalars(statement))
+            if not ids:
+                return
+            yield ids
+            after = ids[-1]
+
+    async def bulk_update(self, item_ids: Optional[Sequence], values: dict, criteria: Sequence = (),
+                          chunk_size: int = 500) -> int:
+        """Apply `values` with one UPDATE per chunk of IDs, committing after each chunk (see BaseService)."""
+        key = self._primary_key()
+        affected = 0
+
+        async def chunks():
+            if item_ids is None:
+                async for chunk in self.iter_id_chunks(criteria, chunk_size):
+                    yield chunk
+            else:
+                for chunk in chunked(item_ids, chunk_size):
+                    yield chunk
+
+        try:
+            async for chunk in chunks():
+                result = await self.session.execute(
+                    update(self.model).where(key.in_(chunk), *criteria).values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                await self.session.commit()
+                affected += result.rowcount
+            return affected
+        except Exception as e:
+            await self.session.rollback()
+            _raise_http_exception(
+                status_code=500,
+                detail=f"Internal server error after updating {affected} items",
+                log_message=f"Error bulk updating items ({affected} committed): {e}"
+            )
+
+    async def bulk_delete(self, item_ids: Sequence, chunk_size: int = 500) -> dict:
+        """Delete the given IDs and their cascade children chunk by chunk (see BaseService)."""
+        key = self._primary_key()
+        targets = delete_cascade_targets(self.model)
+        deleted = {self.model.__tablename__: 0}
+        deleted.update((child.__tablename__, 0) for child, _, _ in targets)
+        try:
+            for chunk in chunked(item_ids, chunk_size):
+                counts = {}
+                for child, foreign_key, parent_column in targets:
+                    parents = chunk if parent_column is key else select(parent_column).where(key.in_(chunk))
+                    result = await self.session.execute(
+                        delete(child).where(foreign_key.in_(parents)).execution_options(synchronize_session=False)
+                    )
+                    counts[child.__tablename__] = result.rowcount
+                result = await self.session.execute(
+                    delete(self.model).where(key.in_(chunk)).execution_options(synchronize_session=False)
+                )
+                counts[self.model.__tablename__] = result.rowcount
+                await self.session.commit()
+                for table, count in counts.items():
+                    deleted[table] += count
+            return deleted
+        except Exception as e:
+            await self.session.rollback()
+            _raise_http_exception(
+                status_code=500,
+                detail=f"Internal server error after deleting {deleted[self.model.__tablename__]} items",
+                log_message=f"Error bulk deleting items ({deleted} committed): {e}"
+            )
@@ -0,0 +1,273 @@
+import logging
+from fastapi import HTTPException
+from typing import Optional, AsyncIterator, List
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.SQLModel import User, UserProfile
+from security.AuthConfig import AuthConfig
+from security.PasswordHasher import HashingCapacityError
+from schemas import UserSchema as schema
+from services.AsyncBaseService import AsyncBaseService
+from services.UserService import BULK_BATCH_SIZE, bulk_filter_criteria, bulk_report, export_statement, \
+    hashed_rows, profile_loader_options, to_full_response, validate_bulk_rows
+from utils.ServerManager import session_schema
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+
+
+def _raise_http_exception(status_code: int, detail: str, log_message: Optional[str] = None) -> None:
+    """Helper function to raise an HTTPException with optional logging."""
+    if log_message:
+        logger.error(log_message)
+    raise HTTPException(status_code=status_code, detail=detail)
+
+
+class AsyncUserService(AsyncBaseService[User]):
+    """Asyncio counterpart of UserService. Every path eager-loads the profile."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(model=User, session=session)
+        self.password_hasher = AuthConfig().password_hasher
+        self.user_cache = AuthConfig().user_cache
+
+    async def create_user(self, user_data: schema.UserCreate) -> User:
+        """Create a new user."""
+        try:
+            result = await self.session.execute(select(User.user_id).where(User.username == user_data.username))
+            if result.first() is not None:
+                _raise_http_exception(
+                    status_code=409,
+                    detail="Username already exists",
+                    log_message=f"Attempted to create user with existing username: {user_data.username}"
+                )
+
+            hashed_password = await self.password_hasher.hash_async(user_data.password)
+            new_user = User(
+                username=user_data.username,
+                password_hash=hashed_password,
+                profile=UserProfile(
+                    first_name=user_data.first_name or '',
+                    last_name=user_data.last_name or '',
+                ),
+            )
+            await self.create(new_user)  # Reuses the `create` method from AsyncBaseService
+            return await self.get(new_user.user_id, options=profile_loader_options(), reload=True)
+        except HTTPException:
+            raise
+        except Exception as e:
+            await self.session.rollback()
+            _raise_http_exception(
+                status_code=500,
+                detail="Internal server error while creating user",
+                log_message=f"Error creating user: {e}"
+            )
+
+    async def bulk_create_users(self, items: list, batch_size: int = BULK_BATCH_SIZE) -> schema.BulkCreateResult:
+        """Create many users at once and report the outcome of every row (see UserService)."""
+        valid, results = validate_bulk_rows(items)
+        if not valid:
+            return bulk_report(results)
+
+        existing = set(await self.session.scalars(
+            select(User.username).where(User.username.in_([user_data.username for _, user_data in valid]))
+        ))
+        pending = []
+        for index, user_data in valid:
+            if user_data.username in existing:
+                results.append(schema.BulkCreateRowResult(index=index, username=user_data.username, status="error",
+                                                          error="Username already exists"))
+            else:
+                pending.append((index, user_data))
+
+        hashes = await run_in_threadpool(self.password_hasher.hash_many,
+                                         [user_data.password for _, user_data in pending])
+        rows, unhashed = hashed_rows(pending, hashes)
+        results.extend(unhashed)
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                results.extend(await self._insert_user_batch(batch))
+            except IntegrityError as e:
+                # A concurrent writer took one of the usernames; retry the batch row by row
+                await self.session.rollback()
+                logger.error(f"Bulk insert batch failed, retrying rows individually: {e.orig}")
+                for row in batch:
+                    results.append(await self._insert_user_row(row))
+            except Exception as e:
+                await self.session.rollback()
+                logger.error(f"Error bulk creating users: {e}")
+                results.extend(schema.BulkCreateRowResult(index=index, username=user_data.username, status="error",
+                                                          error="Internal server error while creating user")
+                               for index, user_data, _ in batch)
+        return bulk_report(results)
+
+    async def _insert_user_batch(self, batch: list) -> list:
+        """Insert a batch of (index, user_data, password_hash) rows with one statement per table."""
+        await self.session.execute(insert(User), [
+            {"username": user_data.username, "password_hash": hashed} for _, user_data, hashed in batch
+        ])
+        result = await self.session.execute(
+            select(User.username, User.user_id).where(User.username.in_([user_data.username for _, user_data, _ in batch]))
+        )
+        user_ids = dict(result.all())
+        await self.session.execute(insert(UserProfile), [
+            {"user_id": user_ids[user_data.username], "first_name": user_data.first_name or '',
+             "last_name": user_data.last_name or ''}
+            for _, user_data, _ in batch
+        ])
+        await self.session.commit()
+        return [schema.BulkCreateRowResult(index=index, username=user_data.username, status="created",
+                                           user_id=user_ids[user_data.username])
+                for index, user_data, _ in batch]
+
+    async def _insert_user_row(self, row: tuple) -> schema.BulkCreateRowResult:
+        """Insert a single bulk row in its own transaction."""
+        index, user_data, hashed = row
+        try:
+            result = await self.session.execute(insert(User).values(username=user_data.username, password_hash=hashed))
+            user_id = result.inserted_primary_key[0]
+            await self.session.execute(insert(UserProfile).values(
+                user_id=user_id, first_name=user_data.first_name or '', last_name=user_data.last_name or ''
+            ))
+            await self.session.commit()
+            return schema.BulkCreateRowResult(index=index, username=user_data.username, status="created",
+                                              user_id=user_id)
+        except IntegrityError:
+            await self.session.rollback()
+            return schema.BulkCreateRowResult(index=index, username=user_data.username, status="error",
+                                              error="Username already exists")
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error creating user {user_data.username}: {e}")
+            return schema.BulkCreateRowResult(index=index, username=user_data.username, status="error",
+                                              error="Internal server error while creating user")
+
+    async def bulk_deactivate_users(self, request: schema.BulkDeactivateRequest,
+                                    chunk_size: int = BULK_BATCH_SIZE) -> schema.BulkUpdateResult:
+        """Deactivate users by ID list and/or filter with chunked set-based UPDATEs."""
+        criteria = bulk_filter_criteria(request)
+        if request.user_ids is None and not criteria:
+            _raise_http_exception(status_code=400, detail="Provide user_ids or at least one filter")
+        criteria.append(User.is_active.is_(True))  # Count only the users actually deactivated
+
+        try:
+            affected = await self.bulk_update(request.user_ids, {"is_active": False}, criteria, chunk_size)
+        finally:
+            # Chunks commit independently, so invalidate even when a later chunk failed
+            if request.user_ids is None:
+                self.user_cache.clear()
+            else:
+                self.user_cache.invalidate_many(request.user_ids, namespace=session_schema(self.session))
+        requested = len(set(request.user_ids)) if request.user_ids is not None else None
+        return schema.BulkUpdateResult(requested=requested, affected=affected)
+
+    async def bulk_delete_users(self, user_ids: List[int], chunk_size: int = BULK_BATCH_SIZE) -> schema.BulkDeleteResult:
+        """Delete users and their profiles by ID list with chunked set-based DELETEs."""
+        try:
+            deleted = await self.bulk_delete(user_ids, chunk_size)
+        finally:
+            self.user_cache.invalidate_many(user_ids, namespace=session_schema(self.session))
+        return schema.BulkDeleteResult(
+            requested=len(set(user_ids)),
+            deleted=deleted[User.__tablename__],
+            profiles_deleted=deleted[UserProfile.__tablename__],
+        )
+
+    async def get_user(self, user_id: int) -> schema.UserFullResponse:
+        """Retrieve a single user by ID, including profile details."""
+        try:
+            return to_full_response(await self.get(user_id, options=profile_loader_options()))
+        except Exception as e:
+            _raise_http_exception(
+                status_code=404,
+                detail=f"User with ID {user_id} not found",
+                log_message=f"Error retrieving user with ID {user_id}: {e}"
+            )
+
+    async def get_users_page(self, limit: int, after: Optional[int] = None) -> schema.UserPage:
+        """Retrieve one keyset page of users ordered by user_id."""
+        users, next_cursor = await self.get_page(limit, after, options=profile_loader_options())
+        return schema.UserPage(items=[to_full_response(user) for user in users], next_cursor=next_cursor)
+
+    async def stream_users(self, chunk_size: int = 1000) -> AsyncIterator[schema.UserFullResponse]:
+        """Yield every user from a server-side cursor without loading the table into memory."""
+        async for user in self.stream_all(chunk_size, options=profile_loader_options()):
+            yield to_full_response(user)
+
+    async def export_users(self, columns: List[str], chunk_size: int = 1000) -> AsyncIterator[list]:
+        """Yield the projected columns of every user as lists of row tuples from a server-side cursor."""
+        result = await self.session.stream(export_statement(columns).execution_options(yield_per=chunk_size))
+        async for rows in result.partitions():
+            yield rows
+
+    async def get_by_username(self, username: str) -> User:
+        """Retrieve a user by username."""
+        result = await self.session.execute(
+            self._select(profile_loader_options()).where(User.username == username)
+        )
+        user = result.scalars().first()
+        if not user:
+            _raise_http_exception(
+                status_code=404,
+                detail=f"User with username '{username}' not found",
+                log_message=f"Error retrieving user with username '{username}': Not found"
+            )
+        return user
+
+    async def update_user(self, user_id: int, user_data: schema.UserUpdate) -> User:
+        """Update an existing user."""
+        try:
+            existing_user = await self.get(user_id, options=profile_loader_options())
+            previous_username = existing_user.username
+
+            if user_data.username:
+                existing_user.username = user_data.username
+            if user_data.password:
+                existing_user.password_hash = await self.password_hasher.hash_async(user_data.password)
+            if user_data.is_active is not None:
+                existing_user.is_active = user_data.is_active
+            if user_data.first_name or user_data.last_name:
+                if not existing_user.profile:
+                    existing_user.profile = UserProfile()
+                if user_data.first_name:
+                    existing_user.profile.first_name = user_data.first_name
+                if user_data.last_name:
+                    existing_user.profile.last_name = user_data.last_name
+
+            await self.session.commit()
+            self.user_cache.invalidate(username=previous_username, user_id=user_id,
+                                       namespace=session_schema(self.session))
+            return await self.get(user_id, options=profile_loader_options(), reload=True)
+        except HashingCapacityError:
+            raise
+        except HTTPException as e:
+            _raise_http_exception(
+                status_code=404,
+                detail=f"User with ID {user_id} not found for update",
+                log_message=f"Error updating user with ID {user_id}: {e.detail}"
+            )
+        except Exception as e:
+            await self.session.rollback()
+            _raise_http_exception(
+                status_code=500,
+                detail="Internal server error while updating user",
+                log_message=f"Error updating user with ID {user_id}: {e}"
+            )
+
+    async def delete_user(self, user_id: int) -> dict:
+        """Delete a user by ID."""
+        try:
+            # The profile is loaded up front so the delete cascade does not need a lazy load
+            result = await self.delete(user_id, options=profile_loader_options())
+            self.user_cache.invalidate(user_id=user_id, namespace=session_schema(self.session))
+            return result
+        except Exception as e:
+            _raise_http_exception(
+                status_code=404,
+                detail=f"User with ID {user_id} not found for deletion",
+                log_message=f"Error deleting user with ID {user_id}: {e}"
+            )
@@ -1,17 +1,43 @@
 import logging
 from fastapi import HTTPException, Depends
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, delete, inspect, select, update
 from sqlalchemy.orm import Session
-from typing import TypeVar, Generic, Type, List, Optional
+from sqlalchemy.orm.interfaces import ONETOMANY
+from sqlalchemy.orm.interfaces import ORMOption
+from typing import TypeVar, Generic, Type, List, Optional, Iterator, Tuple, Any, Sequence
 
 from utils.ServerManager import ServerManager
 
 T = TypeVar('T')
 
+# Loader options (e.g. selectinload(...), joinedload(...)) applied to a single call
+LoaderOptions = Optional[Sequence[ORMOption]]
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.ERROR)
 
 
+def chunked(items: Sequence, chunk_size: int) -> Iterator[list]:
+    """Split a sequence into lists of at most `chunk_size` items, dropping repeated values."""
+    items = list(dict.fromkeys(items))
+    for start in range(0, len(items), chunk_size):
+        yield items[start:start + chunk_size]
+
+
+def delete_cascade_targets(model) -> list:
+    """(child model, foreign key column, parent column) for each one-to-many/one-to-one delete cascade.
+
+    Set-based DELETE bypasses ORM cascades, so bulk deletes remove these children first.
+    Only one level is followed.
+    """
+    targets = []
+    for relationship in inspect(model).relationships:
+        if relationship.cascade.delete and relationship.direction is ONETOMANY:
+            for local, remote in relationship.local_remote_pairs:
+                targets.append((relationship.mapper.class_, remote, local))
+    return targets
+
+
 def _raise_http_exception(status_code: int, detail: str, log_message: Optional[str] = None) -> None:
     """Helper function to raise an HTTPException with optional logging."""
     if log_message:
@@ -24,10 +50,23 @@ class BaseService(Generic[T]):
         self.session = session
         self.metadata = MetaData()
 
-    def get(self, item_id: int) -> T:
+    def use_primary(self):
+        """Send the rest of this session's reads to the primary, for read-your-writes paths."""
+        use_primary = getattr(self.session, 'use_primary', None)
+        if use_primary:
+            use_primary()
+
+    def _query(self, options: LoaderOptions = None):
+        """Start a query on the model with the given per-call loader options."""
+        query = self.session.query(self.model)
+        if options:
+            query = query.options(*options)
+        return query
+
+    def get(self, item_id: int, options: LoaderOptions = None) -> T:
         """Retrieve a single item by ID."""
         try:
-            item = self.session.query(self.model).get(item_id)
+            item = self.session.get(self.model, item_id, options=options)
             if not item:
                 _raise_http_exception(
                     status_code=404,
@@ -42,10 +81,10 @@ class BaseService(Generic[T]):
                 log_message=f"Error retrieving item with ID {item_id}: {e}"
             )
 
-    def get_all(self) -> List[T]:
+    def get_all(self, options: LoaderOptions = None) -> List[T]:
         """Retrieve all items."""
         try:
-            return self.session.query(self.model).all()
+            return self._query(options).all()
         except Exception as e:
             _raise_http_exception(
                 status_code=500,
@@ -53,6 +92,46 @@ class BaseService(Generic[T]):
                 log_message=f"Error retrieving items: {e}"
             )
 
+    def _primary_key(self):
+        """Return the (single) primary key column of the model, used as the keyset cursor."""
+        return inspect(self.model).primary_key[0]
+
+    def get_page(self, limit: int, after: Optional[Any] = None,
+                 options: LoaderOptions = None) -> Tuple[List[T], Optional[Any]]:
+        """Retrieve up to `limit` items ordered by primary key, starting after the `after` cursor.
+
+        Returns the items and the cursor for the next page, or None when this is the last page.
+        """
+        try:
+            key = self._primary_key()
+            query = self._query(options).order_by(key)
+            if after is not None:
+                query = query.filter(key > after)
+            items = query.limit(limit + 1).all()  # One extra row tells us whether there is a next page
+
+            next_cursor = None
+            if len(items) > limit:
+                items = items[:limit]
+                next_cursor = getattr(items[-1], key.key)
+            return items, next_cursor
+        except Exception as e:
+            _raise_http_exception(
+                status_code=500,
+                detail="Internal server error",
+                log_message=f"Error retrieving page of items after {after}: {e}"
+            )
+
+    def stream_all(self, chunk_size: int = 1000, options: LoaderOptions = None) -> Iterator[T]:
+        """Yield all items from a server-side cursor, `chunk_size` rows at a time."""
+        query = (
+            self._query(options)
+            .order_by(self._primary_key())
+            .execution_options(stream_results=True)
+            .yield_per(chunk_size)
+        )
+        for item in query:
+            yield item
+
     def get_by_name(self, name: str) -> Optional[T]:
         """Retrieve a single item by name."""
         try:
@@ -89,6 +168,7 @@ class BaseService(Generic[T]):
     def update(self, item_id: int, updated_item: T) -> T:
         """Update an existing item."""
         try:
+            self.use_primary()
             db_item = self.get(item_id)  # Will raise 404 if not found
             for key, value in vars(updated_item).items():
                 if value is not None:
@@ -109,6 +189,7 @@ class BaseService(Generic[T]):
     def delete(self, item_id: int) -> dict:
         """Delete an item by ID."""
         try:
+            self.use_primary()
             item = self.get(item_id)  # Will raise 404 if not found
             self.session.delete(item)
             self.session.commit()
@@ -122,3 +203,81 @@ class BaseService(Generic[T]):
                 detail="Internal server error",
                 log_message=f"Error deleting item with ID {item_id}: {e}"
             )
+
+    def iter_id_chunks(self, criteria: Sequence = (), chunk_size: int = 500) -> Iterator[list]:
+        """Yield the primary keys of rows matching `criteria`, `chunk_size` at a time, by keyset."""
+        key = self._primary_key()
+        after = None
+        while True:
+            statement = select(key).where(*criteria).order_by(key).limit(chunk_size)
+            if after is not None:
+                statement = statement.where(key > after)
+            ids = list(self.session.scalars(statement))
+            if not ids:
+                return
+            yield ids
+            after = ids[-1]
+
+    def bulk_update(self, item_ids: Optional[Sequence], values: dict, criteria: Sequence = (),
+                    chunk_size: int = 500) -> int:
+        """Apply `values` with one UPDATE per chunk of IDs, committing after each chunk.
+
+        `criteria` further restricts the rows; with `item_ids` None every row matching
+        `criteria` is updated. Returns the number of rows matched.
+        """
+        key = self._primary_key()
+        affected = 0
+        try:
+            self.use_primary()
+            chunks = self.iter_id_chunks(criteria, chunk_size) if item_ids is None else chunked(item_ids, chunk_size)
+            for chunk in chunks:
+                result = self.session.execute(
+                    update(self.model).where(key.in_(chunk), *criteria).values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                self.session.commit()
+                affected += result.rowcount
+            return affected
+        except Exception as e:
+            self.session.rollback()
+            _raise_http_exception(
+                status_code=500,
+                detail=f"Internal server error after updating {affected} items",
+                log_message=f"Error bulk updating items ({affected} committed): {e}"
+            )
+
+    def bulk_delete(self, item_ids: Sequence, chunk_size: int = 500) -> dict:
+        """Delete the given IDs with one DELETE per table per chunk, committing after each chunk.
+
+        Children of delete-cascading relationships are removed first. Returns the number of
+        rows deleted per table.
+        """
+        key = self._primary_key()
+        targets = delete_cascade_targets(self.model)
+        deleted = {self.model.__tablename__: 0}
+        deleted.update((child.__tablename__, 0) for child, _, _ in targets)
+        try:
+            self.use_primary()
+            for chunk in chunked(item_ids, chunk_size):
+                counts = {}
+                for child, foreign_key, parent_column in targets:
+                    parents = chunk if parent_column is key else select(parent_column).where(key.in_(chunk))
+                    result = self.session.execute(
+                        delete(child).where(foreign_key.in_(parents)).execution_options(synchronize_session=False)
+                    )
+                    counts[child.__tablename__] = result.rowcount
+                result = self.session.execute(
+                    delete(self.model).where(key.in_(chunk)).execution_options(synchronize_session=False)
+                )
+                counts[self.model.__tablename__] = result.rowcount
+                self.session.commit()
+                for table, count in counts.items():
+                    deleted[table] += count
+            return deleted
+        except Exception as e:
+            self.session.rollback()
+            _raise_http_exception(
+                status_code=500,
+                detail=f"Internal server error after deleting {deleted[self.model.__tablename__]} items",
+                log_message=f"Error bulk deleting items ({deleted} committed): {e}"
+            )
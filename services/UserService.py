@@ -1,18 +1,134 @@
 import logging
+import os
 from fastapi import HTTPException, Depends
-from typing import Optional, List
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from typing import Optional, List, Iterator, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError, OperationalError
 
 from models.SQLModel import User, UserProfile
+from security.AuthConfig import AuthConfig
+from security.PasswordHasher import HashingCapacityError
 from schemas import UserSchema as schema  # Assuming you have a UserSchema defined
 from services.BaseService import BaseService  # Import your BaseService
+from utils.ServerManager import session_schema
 
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.ERROR)
 
+# How User.profile is eager-loaded on paths that serialize it: 'joined' or 'selectin'
+PROFILE_LOADER = os.getenv('USER_PROFILE_LOADER', 'joined')
+
+
+def profile_loader_options() -> list:
+    """Loader options that fetch User.profile with the user instead of one query per row."""
+    if PROFILE_LOADER == 'selectin':
+        return [selectinload(User.profile)]
+    return [joinedload(User.profile)]
+
+# Columns /user/export can project, in default order. password_hash is deliberately not exportable.
+EXPORT_COLUMNS = {
+    "user_id": User.user_id,
+    "username": User.username,
+    "is_active": User.is_active,
+    "created_at": User.created_at,
+    "updated_at": User.updated_at,
+    "first_name": UserProfile.first_name,
+    "last_name": UserProfile.last_name,
+}
+
+# Rows per multi-row INSERT (and per transaction) in bulk creation
+BULK_BATCH_SIZE = int(os.getenv('USER_BULK_BATCH_SIZE', '500'))
+
+
+def to_full_response(user: User) -> schema.UserFullResponse:
+    """Build the API representation of a user whose profile is already loaded."""
+    return schema.UserFullResponse(
+        user_id=user.user_id,
+        username=user.username,
+        password_hash=user.password_hash,
+        is_active=user.is_active,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+        profile=user.profile,
+    )
+
+
+def validate_bulk_rows(items: list) -> Tuple[List[Tuple[int, schema.UserCreate]], List[schema.BulkCreateRowResult]]:
+    """Validate bulk rows, rejecting invalid ones and repeats of a username earlier in the batch."""
+    valid, rejected, seen = [], [], set()
+    for index, item in enumerate(items):
+        username = item.get("username") if isinstance(item, dict) else None
+        try:
+            user_data = schema.UserCreate.model_validate(item)
+        except ValidationError as e:
+            error = "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err['loc'] else err['msg'] for err in e.errors()
+            )
+            rejected.append(schema.BulkCreateRowResult(index=index, username=username, status="error", error=error))
+            continue
+        if user_data.username in seen:
+            rejected.append(schema.BulkCreateRowResult(index=index, username=user_data.username, status="error",
+                                                       error="Duplicate username in request"))
+            continue
+        seen.add(user_data.username)
+        valid.append((index, user_data))
+    return valid, rejected
+
+
+def parse_export_columns(columns: Optional[str]) -> List[str]:
+    """Parse a comma-separated export projection, defaulting to every exportable column."""
+    if not columns:
+        return list(EXPORT_COLUMNS)
+    selected = list(dict.fromkeys(column.strip() for column in columns.split(",") if column.strip()))
+    unknown = [column for column in selected if column not in EXPORT_COLUMNS]
+    if unknown or not selected:
+        _raise_http_exception(
+            status_code=400,
+            detail=f"Unknown export columns: {', '.join(unknown)}. Allowed: {', '.join(EXPORT_COLUMNS)}"
+        )
+    return selected
+
+
+def export_statement(columns: List[str]):
+    """SELECT of only the projected columns, joining profiles only when a profile column is requested."""
+    statement = select(*(EXPORT_COLUMNS[column] for column in columns)).select_from(User)
+    if any(EXPORT_COLUMNS[column].class_ is UserProfile for column in columns):
+        statement = statement.outerjoin(UserProfile, UserProfile.user_id == User.user_id)
+    return statement.order_by(User.user_id)
+
+
+def bulk_filter_criteria(request: schema.BulkDeactivateRequest) -> list:
+    """WHERE criteria for the filters of a bulk deactivate request."""
+    criteria = []
+    if request.username_prefix:
+        criteria.append(User.username.startswith(request.username_prefix, autoescape=True))
+    if request.created_before:
+        criteria.append(User.created_at < request.created_before)
+    return criteria
+
+
+def hashed_rows(pending: list, hashes: list) -> Tuple[list, List[schema.BulkCreateRowResult]]:
+    """Pair pending rows with their hashes; rows the hashing pool had no room for are reported as errors."""
+    rows, unhashed = [], []
+    for (index, user_data), hashed in zip(pending, hashes):
+        if hashed is None:
+            unhashed.append(schema.BulkCreateRowResult(index=index, username=user_data.username, status="error",
+                                                       error="hashing capacity"))
+        else:
+            rows.append((index, user_data, hashed))
+    return rows, unhashed
+
+
+def bulk_report(results: List[schema.BulkCreateRowResult]) -> schema.BulkCreateResult:
+    """Assemble the per-row bulk creation report in request order."""
+    results.sort(key=lambda result: result.index)
+    created = sum(1 for result in results if result.status == "created")
+    return schema.BulkCreateResult(created=created, failed=len(results) - created, results=results)
+
+
 def _raise_http_exception(status_code: int, detail: str, log_message: Optional[str] = None) -> None:
     """Helper function to raise an HTTPException with optional logging."""
     if log_message:
@@ -22,11 +138,15 @@ def _raise_http_exception(status_code: int, detail: str, log_message: Optional[s
 class UserService(BaseService[User]):
     def __init__(self, session: Session):
         super().__init__(model=User, session=session)
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")  # Initialize password context
+        self.pwd_context = AuthConfig().pwd_context  # Shared password context
+        self.password_hasher = AuthConfig().password_hasher
+        self.user_cache = AuthConfig().user_cache
 
     def create_user(self, user_data: schema.UserCreate) -> User:
         """Create a new user."""
         try:
+            self.use_primary()  # The duplicate check must not race a lagging replica
+
             # Check if the username already exists
             existing_user = self.session.query(User).filter(User.username == user_data.username).first()
             if existing_user:
@@ -37,7 +157,7 @@ class UserService(BaseService[User]):
                 )
 
             # Hash the password before saving the user
-            hashed_password = self.pwd_context.hash(user_data.password)
+            hashed_password = self.password_hasher.hash(user_data.password)
 
             # Create the user profile
             profile = UserProfile(
@@ -54,6 +174,8 @@ class UserService(BaseService[User]):
 
             return self.create(new_user)  # Reuses the `create` method from BaseService
 
+        except HashingCapacityError:
+            raise
         except Exception as e:
             self.session.rollback()
 
@@ -101,10 +223,125 @@ class UserService(BaseService[User]):
                     log_message=f"Error creating user: {e}"
                 )
 
+    def bulk_create_users(self, items: list, batch_size: int = BULK_BATCH_SIZE) -> schema.BulkCreateResult:
+        """Create many users at once and report the outcome of every row.
+
+        Usernames are checked in one query, passwords are hashed in parallel on the hashing
+        pool, and users and profiles are inserted in multi-row batches, one transaction per batch.
+        """
+        valid, results = validate_bulk_rows(items)
+        if not valid:
+            return bulk_report(results)
+
+        self.use_primary()  # The duplicate check must not race a lagging replica
+        existing = set(self.session.scalars(
+            select(User.username).where(User.username.in_([user_data.username for _, user_data in valid]))
+        ))
+        pending = []
+        for index, user_data in valid:
+            if user_data.username in existing:
+                results.append(schema.BulkCreateRowResult(index=index, username=user_data.username, status="error",
+                                                          error="Username already exists"))
+            else:
+                pending.append((index, user_data))
+
+        hashes = self.password_hasher.hash_many([user_data.password for _, user_data in pending])
+        rows, unhashed = hashed_rows(pending, hashes)
+        results.extend(unhashed)
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                results.extend(self._insert_user_batch(batch))
+            except IntegrityError as e:
+                # A concurrent writer took one of the usernames; retry the batch row by row
+                self.session.rollback()
+                logger.error(f"Bulk insert batch failed, retrying rows individually: {e.orig}")
+                results.extend(self._insert_user_row(row) for row in batch)
+            except Exception as e:
+                self.session.rollback()
+                logger.error(f"Error bulk creating users: {e}")
+                results.extend(schema.BulkCreateRowResult(index=index, username=user_data.username, status="error",
+                                                          error="Internal server error while creating user")
+                               for index, user_data, _ in batch)
+        return bulk_report(results)
+
+    def _insert_user_batch(self, batch: list) -> List[schema.BulkCreateRowResult]:
+        """Insert a batch of (index, user_data, password_hash) rows with one statement per table."""
+        self.session.execute(insert(User), [
+            {"username": user_data.username, "password_hash": hashed} for _, user_data, hashed in batch
+        ])
+        # MySQL cannot RETURNING the generated keys, so read them back by username
+        user_ids = dict(self.session.execute(
+            select(User.username, User.user_id).where(User.username.in_([user_data.username for _, user_data, _ in batch]))
+        ).all())
+        self.session.execute(insert(UserProfile), [
+            {"user_id": user_ids[user_data.username], "first_name": user_data.first_name or '',
+             "last_name": user_data.last_name or ''}
+            for _, user_data, _ in batch
+        ])
+        self.session.commit()
+        return [schema.BulkCreateRowResult(index=index, username=user_data.username, status="created",
+                                           user_id=user_ids[user_data.username])
+                for index, user_data, _ in batch]
+
+    def _insert_user_row(self, row: tuple) -> schema.BulkCreateRowResult:
+        """Insert a single bulk row in its own transaction."""
+        index, user_data, hashed = row
+        try:
+            user_id = self.session.execute(
+                insert(User).values(username=user_data.username, password_hash=hashed)
+            ).inserted_primary_key[0]
+            self.session.execute(insert(UserProfile).values(
+                user_id=user_id, first_name=user_data.first_name or '', last_name=user_data.last_name or ''
+            ))
+            self.session.commit()
+            return schema.BulkCreateRowResult(index=index, username=user_data.username, status="created",
+                                              user_id=user_id)
+        except IntegrityError:
+            self.session.rollback()
+            return schema.BulkCreateRowResult(index=index, username=user_data.username, status="error",
+                                              error="Username already exists")
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error creating user {user_data.username}: {e}")
+            return schema.BulkCreateRowResult(index=index, username=user_data.username, status="error",
+                                              error="Internal server error while creating user")
+
+    def bulk_deactivate_users(self, request: schema.BulkDeactivateRequest,
+                              chunk_size: int = BULK_BATCH_SIZE) -> schema.BulkUpdateResult:
+        """Deactivate users by ID list and/or filter with chunked set-based UPDATEs."""
+        criteria = bulk_filter_criteria(request)
+        if request.user_ids is None and not criteria:
+            _raise_http_exception(status_code=400, detail="Provide user_ids or at least one filter")
+        criteria.append(User.is_active.is_(True))  # Count only the users actually deactivated
+
+        try:
+            affected = self.bulk_update(request.user_ids, {"is_active": False}, criteria, chunk_size)
+        finally:
+            # Chunks commit independently, so invalidate even when a later chunk failed
+            if request.user_ids is None:
+                self.user_cache.clear()
+            else:
+                self.user_cache.invalidate_many(request.user_ids, namespace=session_schema(self.session))
+        requested = len(set(request.user_ids)) if request.user_ids is not None else None
+        return schema.BulkUpdateResult(requested=requested, affected=affected)
+
+    def bulk_delete_users(self, user_ids: List[int], chunk_size: int = BULK_BATCH_SIZE) -> schema.BulkDeleteResult:
+        """Delete users and their profiles by ID list with chunked set-based DELETEs."""
+        try:
+            deleted = self.bulk_delete(user_ids, chunk_size)
+        finally:
+            self.user_cache.invalidate_many(user_ids, namespace=session_schema(self.session))
+        return schema.BulkDeleteResult(
+            requested=len(set(user_ids)),
+            deleted=deleted[User.__tablename__],
+            profiles_deleted=deleted[UserProfile.__tablename__],
+        )
+
     def get_user(self, user_id: int) -> schema.UserFullResponse:
         """Retrieve a single user by ID, including profile details."""
         try:
-            existing_user = self.get(user_id)  # Reuses the `get` method from BaseService
+            existing_user = self.get(user_id, options=profile_loader_options())  # Reuses `get` from BaseService
             user_profile = existing_user.profile if existing_user.profile else None
 
             user_response = schema.UserFullResponse(
@@ -127,19 +364,8 @@ class UserService(BaseService[User]):
     def get_all_users(self) -> List[schema.UserFullResponse]:
         """Retrieve all users."""
         try:
-            all_users = self.get_all()  # Reuses the `get_all` method from BaseService
-            return [
-                schema.UserFullResponse(
-                    user_id=user.user_id,
-                    username=user.username,
-                    password_hash=user.password_hash,
-                    is_active=user.is_active,
-                    created_at=user.created_at,
-                    updated_at=user.updated_at,
-                    profile=user.profile,
-                )
-                for user in all_users
-            ]
+            all_users = self.get_all(options=profile_loader_options())  # Reuses `get_all` from BaseService
+            return [to_full_response(user) for user in all_users]
         except Exception as e:
             _raise_http_exception(
                 status_code=500,
@@ -147,16 +373,48 @@ class UserService(BaseService[User]):
                 log_message=f"Error retrieving all users: {e}"
             )
 
+    def get_users_page(self, limit: int, after: Optional[int] = None) -> schema.UserPage:
+        """Retrieve one keyset page of users ordered by user_id."""
+        try:
+            # Reuses the `get_page` method from BaseService
+            users, next_cursor = self.get_page(limit, after, options=profile_loader_options())
+            return schema.UserPage(
+                items=[to_full_response(user) for user in users],
+                next_cursor=next_cursor,
+            )
+        except Exception as e:
+            _raise_http_exception(
+                status_code=500,
+                detail="Internal server error while fetching users",
+                log_message=f"Error retrieving users after {after}: {e}"
+            )
+
+    def stream_users(self, chunk_size: int = 1000) -> Iterator[schema.UserFullResponse]:
+        """Yield every user from a server-side cursor without loading the table into memory."""
+        # Reuses the `stream_all` method from BaseService
+        for user in self.stream_all(chunk_size, options=profile_loader_options()):
+            yield to_full_response(user)
+
+    def export_users(self, columns: List[str], chunk_size: int = 1000) -> Iterator[list]:
+        """Yield the projected columns of every user as lists of row tuples from a server-side cursor."""
+        result = self.session.execute(
+            export_statement(columns).execution_options(stream_results=True, yield_per=chunk_size)
+        )
+        for rows in result.partitions():
+            yield rows
+
     def update_user(self, user_id: int, user_data: schema.UserUpdate) -> User:
         """Update an existing user."""
         try:
-            existing_user = self.get(user_id)  # Reuses the `get` method from BaseService
+            self.use_primary()
+            existing_user = self.get(user_id, options=profile_loader_options())  # Reuses `get` from BaseService
+            previous_username = existing_user.username
 
             if user_data.username:
                 existing_user.username = user_data.username
 
             if user_data.password:
-                existing_user.password_hash = self.pwd_context.hash(user_data.password)
+                existing_user.password_hash = self.password_hasher.hash(user_data.password)
 
             if user_data.is_active is not None:
                 existing_user.is_active = user_data.is_active
@@ -171,9 +429,13 @@ class UserService(BaseService[User]):
                     existing_user.profile.last_name = user_data.last_name
 
             self.session.commit()
-            self.session.refresh(existing_user)
+            self.user_cache.invalidate(username=previous_username, user_id=user_id,
+                                       namespace=session_schema(self.session))
 
-            return existing_user
+            # Reload the expired row together with its profile in one query
+            return self.get(user_id, options=profile_loader_options())
+        except HashingCapacityError:
+            raise
         except Exception as e:
             _raise_http_exception(
                 status_code=404,
@@ -184,7 +446,9 @@ class UserService(BaseService[User]):
     def delete_user(self, user_id: int) -> dict:
         """Delete a user by ID."""
         try:
-            return self.delete(user_id)  # Reuses the `delete` method from BaseService
+            result = self.delete(user_id)  # Reuses the `delete` method from BaseService
+            self.user_cache.invalidate(user_id=user_id, namespace=session_schema(self.session))
+            return result
         except Exception as e:
             _raise_http_exception(
                 status_code=404,
@@ -195,7 +459,12 @@ class UserService(BaseService[User]):
     def get_by_username(self, username: str) -> Optional[User]:
         """Retrieve a user by username."""
         try:
-            user = self.session.query(User).filter(User.username == username).first()
+            user = (
+                self.session.query(User)
+                .options(*profile_loader_options())
+                .filter(User.username == username)
+                .first()
+            )
             if not user:
                 _raise_http_exception(
                     status_code=404,
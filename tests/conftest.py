@@ -0,0 +1,84 @@
+"""Shared fixtures: the application on a temporary SQLite database, with offline secrets.
+
+The environment is set before any application module is imported, so nothing here
+needs AWS or a MySQL server. The lifespan is not run; the fixtures bind the engines.
+"""
+import os
+
+os.environ.update(
+    SECRET_PROVIDER='env',
+    SECRET_PROJECT_WATCH='{"username": "test", "password": "test", "host": "localhost"}',
+    SECRET_JWT='{"KEY": "test-key"}',
+    WEB_CONCURRENCY='1',
+    HASH_POOL_WORKERS='0',  # Hash inline; no worker processes in tests
+    BCRYPT_ROUNDS='4',
+    LOGIN_THROTTLE_ENABLED='false',
+    REVOCATION_PERSIST='false',
+    DB_MODE='sync',
+    USER_PROFILE_LOADER='joined',  # Query budgets below assume profiles are joined in
+    LOG_LEVEL='ERROR',
+)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from benchmarks.bench_api import PASSWORD, bind_application, prepare_database  # noqa: E402
+
+USERS = 5
+
+
+@pytest.fixture(scope="session")
+def database_path(tmp_path_factory) -> str:
+    from security.AuthConfig import AuthConfig
+
+    path = str(tmp_path_factory.mktemp("db") / "test.db")
+    prepare_database(f"sqlite:///{path}", USERS, AuthConfig().pwd_context.hash(PASSWORD))
+    return path
+
+
+@pytest.fixture(scope="session")
+def app(database_path):
+    application = bind_application(f"sqlite:///{database_path}", pool_size=5)
+    yield application
+    from utils.ServerManager import ServerManager
+    ServerManager().engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def engine(app):
+    from utils.ServerManager import ServerManager
+    return ServerManager().engine
+
+
+@pytest.fixture(scope="session")
+def client(app) -> TestClient:
+    return TestClient(app)
+
+
+def login(client: TestClient, username: str = "bench0") -> dict:
+    response = client.post("/auth/login", data={"username": username, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def create_user(client: TestClient, username: str, **fields) -> dict:
+    response = client.post("/user/create", json={"username": username, "password": PASSWORD, **fields})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def bearer(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+@pytest.fixture
+def auth_headers(client) -> dict:
+    return bearer(login(client))
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """Each test starts with cold user and token caches, so query counts do not depend on order."""
+    from security.AuthConfig import AuthConfig
+    AuthConfig().user_cache.clear()
+    AuthConfig().token_cache.clear()
@@ -0,0 +1,85 @@
+"""The async stack (DB_MODE=async, aiosqlite) answers like the sync one on the same database."""
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from conftest import PASSWORD, login
+
+
+@pytest.fixture(scope="module")
+def async_client(app, database_path):
+    """The async controllers mounted as DB_MODE=async mounts them, on the test database through aiosqlite."""
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setenv("DB_MODE", "async")
+    monkeypatch.setenv("ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{database_path}")
+    from controllers import AsyncUserController
+    from security import AsyncAuthController
+    from utils.AsyncServerManager import AsyncServerManager
+
+    @asynccontextmanager
+    async def lifespan(_):
+        await AsyncServerManager().set_schema(database_path)
+        yield
+        await AsyncServerManager().dispose()
+
+    async_app = FastAPI(lifespan=lifespan)
+    async_app.include_router(AsyncUserController.router, prefix="/user")
+    async_app.include_router(AsyncAuthController.router, prefix="/auth")
+    with TestClient(async_app) as test_client:
+        yield test_client
+    monkeypatch.undo()
+
+
+@pytest.mark.parametrize("path", ["/user/read?limit=5", "/user/read?limit=2&after=2", "/user/read/3",
+                                  "/user/read/999"])
+def test_reads_match(client, async_client, path):
+    sync_response, async_response = client.get(path), async_client.get(path)
+    assert async_response.status_code == sync_response.status_code
+    assert async_response.json() == sync_response.json()
+
+
+def test_tokens_are_interchangeable(client, async_client):
+    for issuer, verifier in ((client, async_client), (async_client, client)):
+        headers = {"Authorization": f"Bearer {login(issuer, 'bench1')['access_token']}"}
+        sync_me, async_me = client.get("/auth/me", headers=headers), async_client.get("/auth/me", headers=headers)
+        assert sync_me.status_code == async_me.status_code == 200
+        assert async_me.json() == sync_me.json()
+        assert verifier.get("/auth/me", headers=headers).json()["username"] == "bench1"
+
+
+def test_login_rejects_a_wrong_password_on_both(client, async_client):
+    for test_client in (client, async_client):
+        response = test_client.post("/auth/login", data={"username": "bench2", "password": "Wrong-password1"})
+        assert response.status_code == 401
+
+
+def test_refresh_rotation_matches(client, async_client):
+    for test_client in (client, async_client):
+        tokens = login(test_client, "bench2")
+        rotated = test_client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert rotated.status_code == 200
+        assert sorted(rotated.json()) == sorted(tokens)
+        assert test_client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+
+def test_user_created_async_reads_the_same_on_both(client, async_client):
+    created = async_client.post("/user/create", json={"username": "async-created", "password": PASSWORD,
+                                                      "first_name": "Async", "last_name": "Created"})
+    assert created.status_code == 201, created.text
+    path = f"/user/read/{created.json()['user_id']}"
+    assert client.get(path).json() == async_client.get(path).json() == created.json()
+    duplicate = {"username": "async-created", "password": PASSWORD}
+    assert async_client.post("/user/create", json=duplicate).status_code == \
+        client.post("/user/create", json=duplicate).status_code
+
+
+@pytest.mark.parametrize("path", ["/user/read?limit=5", "/user/read/stream", "/user/export", "/auth/me"])
+@pytest.mark.parametrize("header", [{"X-Schema": "tenant_b"}, {"X-Read-Primary": "true"}])
+def test_async_refuses_schema_and_primary_routing(client, async_client, auth_headers, path, header):
+    headers = dict(auth_headers, **header)
+    assert async_client.get(path, headers=headers).status_code == 400
+    if "X-Schema" in header:
+        # The sync stack does not serve an unlisted schema either
+        assert client.get(path, headers=headers).status_code == 400
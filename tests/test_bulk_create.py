@@ -0,0 +1,86 @@
+"""/user/bulk-create: per-row results, NDJSON input, size limits and hashing capacity."""
+import json
+import threading
+import time
+
+import pytest
+from passlib.context import CryptContext
+
+from conftest import PASSWORD
+from security.PasswordHasher import HashingCapacityError, PasswordHasher
+
+
+def row(username: str, **fields) -> dict:
+    return {"username": username, "password": PASSWORD, **fields}
+
+
+def test_reports_existing_repeated_and_invalid_rows(client):
+    body = [row("bulk-a"), row("bench1"), row("bulk-a"), {"username": "bulk-b"}, row("bulk-c", first_name="C")]
+    report = client.post("/user/bulk-create", json=body).json()
+    assert (report["created"], report["failed"]) == (2, 3)
+    results = report["results"]
+    assert [result["index"] for result in results] == [0, 1, 2, 3, 4]
+    assert [result["status"] for result in results] == ["created", "error", "error", "error", "created"]
+    assert results[1]["error"] == "Username already exists"
+    assert results[2]["error"] == "Duplicate username in request"
+    assert "password" in results[3]["error"]
+    created = client.get(f"/user/read/{results[4]['user_id']}").json()
+    assert created["username"] == "bulk-c" and created["profile"]["first_name"] == "C"
+
+
+def test_accepts_ndjson_and_reports_unparseable_lines(client):
+    body = "\n".join([json.dumps(row("bulk-nd-a")), "{not json", "", json.dumps(row("bulk-nd-b"))]) + "\n"
+    response = client.post("/user/bulk-create", content=body, headers={"Content-Type": "application/x-ndjson"})
+    report = response.json()
+    assert (report["created"], report["failed"]) == (2, 1)
+    assert [result["status"] for result in report["results"]] == ["created", "error", "created"]
+
+
+def test_rejects_bodies_that_are_not_arrays(client):
+    assert client.post("/user/bulk-create", json={"username": "x"}).status_code == 400
+
+
+def test_oversized_uploads_get_413(client, monkeypatch):
+    import controllers.UserController as UserController
+    monkeypatch.setattr(UserController, "BULK_MAX_ROWS", 2)
+    monkeypatch.setattr(UserController, "BULK_MAX_BYTES", 4096)
+
+    lines = (json.dumps(row(f"bulk-big-{index}")).encode() + b"\n" for index in range(50))
+    response = client.post("/user/bulk-create", content=lines, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 413 and "users" in response.json()["detail"]
+    response = client.post("/user/bulk-create", content=b" " * 5000, headers={"Content-Type": "application/json"})
+    assert response.status_code == 413 and "bytes" in response.json()["detail"]
+
+
+def test_rows_without_hashing_capacity_are_reported_and_the_rest_created(client, monkeypatch):
+    from security.AuthConfig import AuthConfig
+    hasher = AuthConfig().password_hasher
+    real_hash_many = hasher.hash_many
+    monkeypatch.setattr(hasher, "hash_many", lambda passwords: real_hash_many(passwords[:1]) + [None] * 2)
+
+    report = client.post("/user/bulk-create", json=[row("bulk-cap-a"), row("bulk-cap-b"), row("bulk-cap-c")]).json()
+    assert [result["status"] for result in report["results"]] == ["created", "error", "error"]
+    assert report["results"][1]["error"] == "hashing capacity"
+
+
+def test_hash_many_waits_for_room_and_returns_partial_batches():
+    hasher = PasswordHasher(CryptContext(schemes=["bcrypt"], bcrypt__rounds=4), workers=0, max_pending=1,
+                            batch_wait=5.0)
+    hasher._admit()  # A login holds the only slot for a moment
+    threading.Timer(0.1, hasher._release, args=("verify", time.perf_counter(), True)).start()
+    assert all(hasher.hash_many(["a", "b"]))
+
+    hasher.batch_wait = 0.05
+    real_release = hasher._release
+
+    def release_then_login(*args):
+        real_release(*args)
+        hasher._release = real_release
+        hasher._admit()  # A login takes the slot the first chunk freed, and keeps it
+
+    hasher._release = release_then_login
+    result = hasher.hash_many(["a", "b", "c"])
+    assert result[0] is not None and result[1:] == [None, None]
+
+    with pytest.raises(HashingCapacityError):
+        hasher.hash_many(["d"])  # Nothing gets in at all
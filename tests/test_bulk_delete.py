@@ -0,0 +1,51 @@
+"""/user/bulk-delete removes users with their profiles and reports the counts."""
+from sqlalchemy import text
+
+from conftest import PASSWORD, bearer, login
+
+
+def bulk_create(client, prefix: str, count: int) -> list:
+    body = [{"username": f"{prefix}-{index}", "password": PASSWORD} for index in range(count)]
+    report = client.post("/user/bulk-create", json=body).json()
+    assert report["created"] == count
+    return [result["user_id"] for result in report["results"]]
+
+
+def profile_count(engine, user_ids: list) -> int:
+    with engine.connect() as connection:
+        return connection.execute(text(
+            f"SELECT COUNT(*) FROM user_profiles WHERE user_id IN ({','.join(map(str, user_ids))})"
+        )).scalar()
+
+
+def test_deletes_users_and_cascades_to_profiles(client, engine):
+    user_ids = bulk_create(client, "bulk-del", 3)
+    headers = bearer(login(client, "bulk-del-0"))
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert profile_count(engine, user_ids) == 3
+
+    # An unknown ID and a repeated one are counted once as requested, and deleted as found
+    response = client.post("/user/bulk-delete", json={"user_ids": user_ids + [user_ids[0], 999999]})
+    assert response.json() == {"requested": 4, "deleted": 3, "profiles_deleted": 3}
+    assert profile_count(engine, user_ids) == 0
+    assert all(client.get(f"/user/read/{user_id}").status_code == 404 for user_id in user_ids)
+    assert client.get("/auth/me", headers=headers).status_code == 401  # Not served from the user cache
+
+
+def test_counts_add_up_across_chunks(client, engine):
+    from services.UserService import UserService
+    from utils.ServerManager import ServerManager
+
+    user_ids = bulk_create(client, "bulk-chunk", 5)
+    session = ServerManager().new_session()
+    try:
+        result = UserService(session).bulk_delete_users(user_ids, chunk_size=2)
+    finally:
+        session.close()
+    assert (result.requested, result.deleted, result.profiles_deleted) == (5, 5, 5)
+    assert profile_count(engine, user_ids) == 0
+
+
+def test_nothing_to_delete(client):
+    assert client.post("/user/bulk-delete", json={"user_ids": [999998]}).json() == \
+        {"requested": 1, "deleted": 0, "profiles_deleted": 0}
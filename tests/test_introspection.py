@@ -0,0 +1,68 @@
+"""Token introspection: HTTP Basic client authentication and the per-client and per-address limits."""
+import pytest
+
+from conftest import bearer, login
+from security.LoginThrottle import SlidingWindowLimiter
+
+GATEWAY = ("gateway", "gateway-secret")
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    """One configured gateway and fresh limiters; returns the IntrospectionClients to tighten."""
+    from security.AuthConfig import AuthConfig
+    introspection_clients = AuthConfig().introspection_clients
+    monkeypatch.setattr(introspection_clients, "secret_loader", lambda: dict([GATEWAY]))
+    monkeypatch.setattr(introspection_clients, "_unconfigured_until", 0.0)
+    monkeypatch.setattr(introspection_clients, "by_client", SlidingWindowLimiter(100, 60))
+    monkeypatch.setattr(introspection_clients, "by_ip", SlidingWindowLimiter(100, 60))
+    return introspection_clients
+
+
+def introspect(client, tokens, auth=GATEWAY):
+    return client.post("/auth/introspect", json={"tokens": tokens}, auth=auth)
+
+
+@pytest.mark.parametrize("auth", [None, ("gateway", "wrong"), ("unknown", "gateway-secret")])
+def test_missing_or_wrong_credentials_are_rejected(client, clients, auth):
+    response = introspect(client, [], auth=auth)
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Basic"
+
+
+def test_results_follow_request_order(client, clients):
+    active = login(client, "bench1")
+    revoked = login(client, "bench2")
+    assert client.post("/auth/logout", headers=bearer(revoked)).status_code == 204
+
+    response = introspect(client, [active["access_token"], "not-a-token", revoked["access_token"],
+                                   active["refresh_token"]])
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["active"] for result in results] == [True, False, False, False]
+    assert results[0]["claims"]["sub"] == "bench1"
+    assert results[0]["user_id"]
+
+
+def test_a_client_over_its_limit_gets_retry_after(client, clients, monkeypatch):
+    monkeypatch.setattr(clients, "by_client", SlidingWindowLimiter(2, 60))
+    assert [introspect(client, []).status_code for _ in range(2)] == [200, 200]
+    response = introspect(client, [])
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_failed_attempts_are_limited_per_address(client, clients, monkeypatch):
+    monkeypatch.setattr(clients, "by_ip", SlidingWindowLimiter(2, 60))
+    wrong = ("gateway", "wrong")
+    assert [introspect(client, [], auth=wrong).status_code for _ in range(2)] == [401, 401]
+    assert introspect(client, [], auth=wrong).status_code == 429
+    assert introspect(client, []).status_code == 200  # Valid credentials are limited per client only
+
+
+def test_unconfigured_clients_reject_everyone(client, clients, monkeypatch):
+    def missing_secret():
+        raise KeyError("INTROSPECT")
+
+    monkeypatch.setattr(clients, "secret_loader", missing_secret)
+    assert introspect(client, []).status_code == 401
@@ -0,0 +1,86 @@
+"""Asymmetric signing: tokens verify locally through the JWKS endpoint, across a key rotation."""
+import json
+import re
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from conftest import bearer, login
+from security.SigningKeys import SigningKeyProvider
+from security.TokenVerifier import InvalidTokenError, TokenVerifier
+
+JWKS_PATH = "/auth/.well-known/jwks.json"
+
+
+def private_pem() -> str:
+    key = ec.generate_private_key(ec.SECP256R1())
+    return key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                             serialization.NoEncryption()).decode()
+
+
+@pytest.fixture
+def jwt_secret(monkeypatch) -> dict:
+    """ES256 signing from a mutable JWT secret; replace its dict to rotate keys."""
+    from security.AuthConfig import AuthConfig
+    holder = {"secret": {"SIGNING_KEYS": [{"kid": "k1", "private_key": private_pem()}], "ACTIVE_KID": "k1"}}
+    monkeypatch.setattr(AuthConfig(), "algorithm", "ES256")
+    monkeypatch.setattr(AuthConfig(), "signing_keys", SigningKeyProvider(lambda: holder["secret"], "ES256"))
+    return holder
+
+
+@pytest.fixture
+def verifier(client) -> TokenVerifier:
+    def fetch_from_app(url, timeout):
+        response = client.get(url)
+        match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+        return response.json(), float(match.group(1)) if match else None
+
+    return TokenVerifier(JWKS_PATH, min_refresh_interval=0, fetcher=fetch_from_app)
+
+
+def kid(token: str) -> str:
+    from jose import jwt
+    return jwt.get_unverified_header(token)["kid"]
+
+
+def test_jwks_publishes_the_public_keys_with_caching_headers(client, jwt_secret):
+    response = client.get(JWKS_PATH)
+    assert response.status_code == 200
+    keys = response.json()["keys"]
+    assert [(key["kid"], key["alg"], key["use"]) for key in keys] == [("k1", "ES256", "sig")]
+    assert "d" not in keys[0]  # Never the private part
+    assert "max-age" in response.headers["Cache-Control"]
+    assert client.get(JWKS_PATH, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+
+def test_issued_token_round_trips_through_the_verifier(client, jwt_secret, verifier):
+    token = login(client, "bench1")["access_token"]
+    assert kid(token) == "k1"
+    assert verifier.verify(token)["sub"] == "bench1"
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(login(client, "bench1")["refresh_token"])  # Wrong token type
+
+
+def test_rotation_keeps_old_tokens_valid_until_their_key_is_retired(client, jwt_secret, verifier):
+    old_token = login(client, "bench1")["access_token"]
+    assert verifier.verify(old_token)["sub"] == "bench1"
+
+    jwt_secret["secret"] = {"SIGNING_KEYS": [jwt_secret["secret"]["SIGNING_KEYS"][0],
+                                             {"kid": "k2", "private_key": private_pem()}], "ACTIVE_KID": "k2"}
+    new_token = login(client, "bench1")["access_token"]
+    assert kid(new_token) == "k2"
+    assert verifier.verify(new_token)["sub"] == "bench1"  # Unknown kid: the verifier refetches once
+    assert verifier.get_stats()["fetches"] == 2
+    assert verifier.verify(old_token)["sub"] == "bench1"
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {old_token}"}).status_code == 200
+
+    # Retiring k1 ends its tokens on the server
+    jwt_secret["secret"] = {"SIGNING_KEYS": [jwt_secret["secret"]["SIGNING_KEYS"][1]], "ACTIVE_KID": "k2"}
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {old_token}"}).status_code == 401
+    assert client.get("/auth/me", headers=bearer({"access_token": new_token})).status_code == 200
+    assert [key["kid"] for key in json.loads(client.get(JWKS_PATH).content)["keys"]] == ["k2"]
+
+
+def test_shared_secret_mode_publishes_no_keys(client):
+    assert client.get(JWKS_PATH).status_code == 404
@@ -0,0 +1,73 @@
+"""Login throttling: lockout per username and per client, and which address counts as the client."""
+import ipaddress
+
+import pytest
+from starlette.requests import Request
+
+from conftest import PASSWORD
+from security import LoginThrottle as throttle_module
+from security.LoginThrottle import LoginThrottle, client_ip
+
+
+@pytest.fixture
+def throttle(monkeypatch) -> LoginThrottle:
+    from security.AuthConfig import AuthConfig
+    login_throttle = LoginThrottle(username_limit=3, ip_limit=5, window=60)
+    monkeypatch.setattr(AuthConfig(), "login_throttle", login_throttle)
+    return login_throttle
+
+
+def attempt(client, username: str, password: str = "Wrong-passw0rd"):
+    return client.post("/auth/login", data={"username": username, "password": password})
+
+
+def test_username_is_locked_out_after_the_limit(client, throttle):
+    assert [attempt(client, "bench3").status_code for _ in range(3)] == [401] * 3
+    locked = attempt(client, "bench3", PASSWORD)  # Even the right password is refused while locked out
+    assert locked.status_code == 429 and int(locked.headers["Retry-After"]) >= 1
+    assert throttle.get_stats()["rejected_username"] == 1
+
+
+def test_successful_login_clears_the_username_counter(client, throttle):
+    assert [attempt(client, "bench4").status_code for _ in range(2)] == [401] * 2
+    assert attempt(client, "bench4", PASSWORD).status_code == 200
+    assert [attempt(client, "bench4").status_code for _ in range(2)] == [401] * 2
+
+
+def test_client_is_locked_out_across_usernames(client, throttle):
+    statuses = [attempt(client, f"nobody-{index}").status_code for index in range(6)]
+    assert statuses == [401] * 5 + [429]
+    assert throttle.get_stats()["rejected_ip"] == 1
+
+
+def request_from(peer: str, forwarded: str = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded is not None else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 40000)})
+
+
+@pytest.fixture
+def behind_proxy(monkeypatch):
+    monkeypatch.setattr(throttle_module, "FORWARDED_IP_HEADER", "X-Forwarded-For")
+    monkeypatch.setattr(throttle_module, "TRUSTED_PROXY_HOPS", 1)
+    monkeypatch.setattr(throttle_module, "TRUSTED_PROXIES", [ipaddress.ip_network("10.0.0.0/8")])
+
+
+def test_forwarded_address_is_taken_from_the_trusted_end(behind_proxy):
+    # The client wrote the leftmost entry itself; the proxy appended the real address
+    assert client_ip(request_from("10.0.0.2", "6.6.6.6, 203.0.113.7")) == "203.0.113.7"
+
+
+def test_more_hops_read_further_left(behind_proxy, monkeypatch):
+    monkeypatch.setattr(throttle_module, "TRUSTED_PROXY_HOPS", 2)
+    assert client_ip(request_from("10.0.0.2", "6.6.6.6, 203.0.113.7, 10.0.0.9")) == "203.0.113.7"
+    assert client_ip(request_from("10.0.0.2", "10.0.0.9")) == "10.0.0.2"  # Too short: use the peer
+
+
+def test_untrusted_peers_cannot_choose_their_address(behind_proxy):
+    assert client_ip(request_from("198.51.100.4", "6.6.6.6")) == "198.51.100.4"
+    assert client_ip(request_from("10.0.0.2")) == "10.0.0.2"
+
+
+def test_no_peer_is_trusted_without_trusted_proxies(behind_proxy, monkeypatch):
+    monkeypatch.setattr(throttle_module, "TRUSTED_PROXIES", [])
+    assert client_ip(request_from("10.0.0.2", "6.6.6.6")) == "10.0.0.2"
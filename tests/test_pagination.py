@@ -0,0 +1,52 @@
+"""Keyset pagination of /user/read: page boundaries and the next_cursor contract."""
+import pytest
+
+from conftest import create_user
+
+
+def all_user_ids(client) -> list:
+    page = client.get("/user/read", params={"limit": 1000}).json()
+    assert page["next_cursor"] is None
+    return [item["user_id"] for item in page["items"]]
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_walking_the_cursor_visits_every_user_once_in_order(client, limit):
+    # A deleted row leaves a gap in the IDs, which the cursor must step over
+    gap = create_user(client, f"page-gap-{limit}")
+    create_user(client, f"page-after-gap-{limit}")
+    assert client.delete(f"/user/delete/{gap['user_id']}").status_code == 204
+    expected = all_user_ids(client)
+
+    seen, after = [], None
+    while True:
+        params = {"limit": limit} if after is None else {"limit": limit, "after": after}
+        page = client.get("/user/read", params=params).json()
+        assert 0 < len(page["items"]) <= limit
+        seen += [item["user_id"] for item in page["items"]]
+        after = page["next_cursor"]
+        if after is None:
+            break
+        assert after == seen[-1]
+    assert seen == expected
+
+
+def test_exactly_full_last_page_has_no_cursor(client):
+    ids = all_user_ids(client)
+    page = client.get("/user/read", params={"limit": len(ids)}).json()
+    assert len(page["items"]) == len(ids) and page["next_cursor"] is None
+
+    page = client.get("/user/read", params={"limit": len(ids) - 1}).json()
+    assert page["next_cursor"] == ids[-2]
+    last = client.get("/user/read", params={"limit": len(ids) - 1, "after": page["next_cursor"]}).json()
+    assert [item["user_id"] for item in last["items"]] == ids[-1:] and last["next_cursor"] is None
+
+
+def test_cursor_past_the_end_is_an_empty_last_page(client):
+    page = client.get("/user/read", params={"limit": 5, "after": all_user_ids(client)[-1]}).json()
+    assert page == {"items": [], "next_cursor": None}
+
+
+@pytest.mark.parametrize("limit", [0, 100000])
+def test_page_size_is_bounded(client, limit):
+    assert client.get("/user/read", params={"limit": limit}).status_code == 422
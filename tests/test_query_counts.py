@@ -0,0 +1,36 @@
+"""Query budgets of the read endpoints, so an N+1 regression fails the build."""
+import pytest
+
+from utils.QueryCounter import assert_max_queries
+
+
+@pytest.mark.parametrize("limit", [1, 5])
+def test_read_page_is_one_query_whatever_the_page_size(client, engine, limit):
+    with assert_max_queries(engine, 1):
+        response = client.get("/user/read", params={"limit": limit})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == limit
+    assert all(item["profile"]["first_name"] == "First" for item in items)
+
+
+def test_read_user_by_id_is_one_query(client, engine):
+    with assert_max_queries(engine, 1):
+        response = client.get("/user/read/1")
+    assert response.status_code == 200
+    assert response.json()["profile"] is not None
+
+
+def test_me_loads_user_and_profile_in_one_query(client, engine, auth_headers):
+    with assert_max_queries(engine, 1):
+        response = client.get("/auth/me", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["username"] == "bench0"
+    assert response.json()["profile"]["last_name"] == "Last"
+
+
+def test_me_is_served_from_the_user_cache(client, engine, auth_headers):
+    assert client.get("/auth/me", headers=auth_headers).status_code == 200
+    with assert_max_queries(engine, 0):
+        response = client.get("/auth/me", headers=auth_headers)
+    assert response.status_code == 200
@@ -0,0 +1,57 @@
+"""Refresh token rotation and logout revocation."""
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import bearer, create_user, login
+
+
+def refresh(client, refresh_token: str):
+    return client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_rotation_issues_a_working_pair_and_retires_the_old_refresh_token(client):
+    tokens = login(client, "bench1")
+    rotated = refresh(client, tokens["refresh_token"])
+    assert rotated.status_code == 200
+    assert client.get("/auth/me", headers=bearer(rotated.json())).json()["username"] == "bench1"
+
+    assert refresh(client, tokens["refresh_token"]).status_code == 401  # Reuse is rejected
+    assert refresh(client, rotated.json()["refresh_token"]).status_code == 200
+
+
+def test_concurrent_reuse_rotates_only_once(client):
+    tokens = login(client, "bench1")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(lambda _: refresh(client, tokens["refresh_token"]).status_code, range(8)))
+    assert sorted(statuses) == [200] + [401] * 7
+
+
+def test_token_types_are_not_interchangeable(client):
+    tokens = login(client, "bench1")
+    assert refresh(client, tokens["access_token"]).status_code == 401
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {tokens['refresh_token']}"}).status_code == 401
+
+
+def test_logout_revokes_the_access_and_refresh_tokens(client):
+    tokens = login(client, "bench2")
+    headers = bearer(tokens)
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    response = client.post("/auth/logout", headers=headers, json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 204
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+
+
+def test_logout_with_another_users_refresh_token_revokes_nothing(client):
+    mine, theirs = login(client, "bench2"), login(client, "bench3")
+    response = client.post("/auth/logout", headers=bearer(mine), json={"refresh_token": theirs["refresh_token"]})
+    assert response.status_code == 401
+    assert client.get("/auth/me", headers=bearer(mine)).status_code == 200
+    assert refresh(client, theirs["refresh_token"]).status_code == 200
+
+
+def test_deactivated_users_cannot_refresh(client):
+    user = create_user(client, "refresh-deactivated")
+    tokens = login(client, "refresh-deactivated")
+    assert client.put(f"/user/update/{user['user_id']}", json={"is_active": False}).status_code == 200
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
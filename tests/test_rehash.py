@@ -0,0 +1,35 @@
+"""Logins migrate stored hashes to the current hashing policy."""
+import pytest
+
+from conftest import create_user, login
+from security.HashingPolicy import HashingPolicy
+
+
+def stored_hash(client, user_id: int) -> str:
+    return client.get(f"/user/read/{user_id}").json()["password_hash"]
+
+
+def test_login_rehashes_when_the_rounds_change(client):
+    user = create_user(client, "rehash-rounds")
+    old_hash = stored_hash(client, user["user_id"])
+    assert old_hash.startswith("$2b$04$")
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        from security.AuthConfig import AuthConfig
+        monkeypatch.setattr(AuthConfig().password_hasher, "pwd_context",
+                            HashingPolicy(["bcrypt"], bcrypt_rounds=5).build_context())
+        client.post("/auth/login", data={"username": "rehash-rounds", "password": "Wrong-passw0rd"})
+        assert stored_hash(client, user["user_id"]) == old_hash  # A failed login never rehashes
+
+        login(client, "rehash-rounds")
+        new_hash = stored_hash(client, user["user_id"])
+        assert new_hash.startswith("$2b$05$")
+        login(client, "rehash-rounds")
+        assert stored_hash(client, user["user_id"]) == new_hash  # Already current: left alone
+
+
+def test_current_hashes_are_not_rewritten(client):
+    user = create_user(client, "rehash-current")
+    old_hash = stored_hash(client, user["user_id"])
+    login(client, "rehash-current")
+    assert stored_hash(client, user["user_id"]) == old_hash
@@ -0,0 +1,101 @@
+"""CachedSecretProvider: single-flight refreshes and bounded staleness."""
+import threading
+import time
+
+import pytest
+
+from utils.SecretProvider import CachedSecretProvider, SecretProvider
+
+
+class SlowProvider(SecretProvider):
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+        self.failing = False
+
+    def fetch(self, secret_name: str) -> dict:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.failing:
+            raise RuntimeError("provider down")
+        return {"version": self.calls}
+
+
+def expire(cache: CachedSecretProvider, secret_name: str, age: float):
+    cache._cache[secret_name].fetched_at = time.monotonic() - age
+
+
+def fetch_concurrently(cache: CachedSecretProvider, callers: int = 20) -> list:
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.fetch("S"))) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        SecretProvider()
+
+
+def test_first_load_is_fetched_once():
+    provider = SlowProvider(delay=0.05)
+    results = fetch_concurrently(CachedSecretProvider(provider, ttl=60, refresh_ahead=0))
+    assert provider.calls == 1
+    assert results == [{"version": 1}] * 20
+
+
+def test_one_caller_refreshes_an_expired_entry():
+    provider = SlowProvider(delay=0.05)
+    cache = CachedSecretProvider(provider, ttl=60, refresh_ahead=0)
+    cache.fetch("S")
+    expire(cache, "S", 61)
+    results = fetch_concurrently(cache)
+    assert provider.calls == 2
+    assert {"version": 2} in results and {"version": 1} in results
+    assert cache.fetch("S") == {"version": 2}
+
+
+def test_failed_refresh_serves_stale_and_waits_before_retrying():
+    provider = SlowProvider()
+    cache = CachedSecretProvider(provider, ttl=60, refresh_ahead=0, max_staleness=600, retry_interval=30)
+    cache.fetch("S")
+    provider.failing = True
+    expire(cache, "S", 61)
+    assert fetch_concurrently(cache) == [{"version": 1}] * 20
+    assert provider.calls == 2
+    assert cache.get_stats()["refresh_failures"] == 1
+
+
+def test_stale_value_is_dropped_after_max_staleness():
+    provider = SlowProvider()
+    cache = CachedSecretProvider(provider, ttl=60, refresh_ahead=0, max_staleness=600)
+    cache.fetch("S")
+    provider.failing = True
+    expire(cache, "S", 661)
+    with pytest.raises(RuntimeError):
+        cache.fetch("S")
+    provider.failing = False
+    assert cache.fetch("S") == {"version": 3}
+    assert cache.get_stats()["stale_expired"] == 1
+
+
+def test_cached_secret_is_read_only():
+    provider = SlowProvider()
+    provider.fetch = lambda secret_name: {"KEY": "k", "SIGNING_KEYS": [{"kid": "a"}]}
+    cache = CachedSecretProvider(provider, ttl=60, refresh_ahead=0)
+    secret = cache.fetch("S")
+    with pytest.raises(TypeError):
+        secret["KEY"] = "changed"
+    with pytest.raises(TypeError):
+        secret["SIGNING_KEYS"][0]["kid"] = "changed"
+    assert cache.fetch("S") is secret and secret["KEY"] == "k"
+
+
+def test_factory_reads_the_retry_interval(monkeypatch):
+    from utils.SecretProvider import build_secret_provider
+    monkeypatch.setenv("SECRET_PROVIDER", "env")
+    monkeypatch.setenv("SECRET_RETRY_INTERVAL", "7")
+    assert build_secret_provider().retry_interval == 7.0
@@ -0,0 +1,48 @@
+"""The verified-token cache never outlives a token's revocation or expiry."""
+import time
+from datetime import timedelta
+
+from conftest import bearer, login
+
+
+def config():
+    from security.AuthConfig import AuthConfig
+    return AuthConfig()
+
+
+def test_revoked_token_is_rejected_although_still_cached(client):
+    tokens = login(client, "bench1")
+    headers = bearer(tokens)
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    hits = config().token_cache.get_stats()["hits"]
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert config().token_cache.get_stats()["hits"] == hits + 1
+
+    assert client.post("/auth/logout", headers=headers).status_code == 204
+    assert config().token_cache.get(tokens["access_token"], config().secret_key) is not None
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_cached_token_is_rejected_once_expired(client):
+    from security.AuthService import AuthService
+    from utils.ServerManager import ServerManager
+
+    session = ServerManager().new_session()
+    try:
+        token = AuthService(session).create_access_token({"sub": "bench1"}, timedelta(seconds=1))
+    finally:
+        session.close()
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert config().token_cache.get(token, config().secret_key) is not None
+
+    time.sleep(2.1)  # exp has whole-second precision
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    assert config().token_cache.get(token, config().secret_key) is None
+
+
+def test_claims_verified_with_a_retired_key_are_not_served():
+    cache = config().token_cache
+    cache.put("token", "old-key", {"sub": "bench1", "exp": time.time() + 60})
+    assert cache.get("token", "old-key") is not None
+    assert cache.get("token", "new-key") is None
@@ -0,0 +1,39 @@
+"""The user snapshot cache behind /auth/me is invalidated by every write to the user."""
+from conftest import bearer, create_user, login
+
+
+def cached(username: str) -> bool:
+    from security.AuthConfig import AuthConfig
+    from utils.ServerManager import ServerManager
+    return AuthConfig().user_cache.get(username, ServerManager().default_schema) is not None
+
+
+def test_update_is_visible_on_the_next_request(client):
+    user = create_user(client, "cache-update", first_name="Before")
+    headers = bearer(login(client, "cache-update"))
+    assert client.get("/auth/me", headers=headers).json()["profile"]["first_name"] == "Before"
+    assert cached("cache-update")
+
+    response = client.put(f"/user/update/{user['user_id']}", json={"first_name": "After"})
+    assert response.status_code == 200, response.text
+    assert not cached("cache-update")
+    assert client.get("/auth/me", headers=headers).json()["profile"]["first_name"] == "After"
+
+
+def test_deactivation_takes_effect_immediately(client):
+    user = create_user(client, "cache-deactivate")
+    headers = bearer(login(client, "cache-deactivate"))
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    assert client.put(f"/user/update/{user['user_id']}", json={"is_active": False}).status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_deleted_user_is_not_served_from_the_cache(client):
+    user = create_user(client, "cache-delete")
+    headers = bearer(login(client, "cache-delete"))
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    assert client.delete(f"/user/delete/{user['user_id']}").status_code == 204
+    assert not cached("cache-delete")
+    assert client.get("/auth/me", headers=headers).status_code == 401
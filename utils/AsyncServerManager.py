@@ -0,0 +1,109 @@
+import os
+import threading
+from typing import TYPE_CHECKING
+
+from utils.LoggingConfig import LoggerManager
+from utils.PoolMetrics import TimedAsyncAdaptedQueuePool, label_pool
+from utils.QueryInstrumentation import instrument_engine
+from utils.ServerManager import ServerManager
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+
+def is_async_mode() -> bool:
+    """True when the app should serve the asyncio database stack (DB_MODE=async)."""
+    return os.getenv('DB_MODE', 'sync').lower() == 'async'
+
+
+class AsyncServerManager:
+    """Asyncio counterpart of ServerManager: one async engine and an AsyncSession factory.
+
+    Only the default schema is served, from the primary; requests that select another
+    schema or ask for the primary explicitly are refused (see ServiceDependency).
+
+    Connection details come from the same secret as ServerManager and use the aiomysql
+    driver. ASYNC_DATABASE_URL overrides the URL entirely, e.g.
+    ``sqlite+aiosqlite:///./local.db`` for running locally.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        # Singleton
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(AsyncServerManager, cls).__new__(cls)
+                cls._instance._init_once()
+        return cls._instance
+
+    def _init_once(self):
+        if not hasattr(self, 'initialized'):
+            # Imported here so the sync stack (DB_MODE=sync) never loads the asyncio extension
+            from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+            self.engine = None
+            self.schema_name = None
+            # Objects stay usable after commit; async sessions cannot lazy-load expired attributes
+            self.SessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, class_=AsyncSession)
+            self.initialized = True
+
+    def get_db_url(self, schema_name=None) -> str:
+        override = os.getenv('ASYNC_DATABASE_URL')
+        if override:
+            return override
+        return ServerManager().config.get_db_url(schema_name, driver="mysql+aiomysql")
+
+    def create_engine(self, schema_name=None):
+        """Creates an async SQLAlchemy engine, optionally for a specific schema."""
+        from sqlalchemy.ext.asyncio import create_async_engine
+        db_url = self.get_db_url(schema_name)
+        try:
+            kwargs = {}
+            if not db_url.startswith('sqlite'):
+                # One engine's share of the primary's budget, reserved by ServerManager in async mode
+                server_manager = ServerManager()
+                kwargs.update(poolclass=TimedAsyncAdaptedQueuePool, pool_size=server_manager.pool_size,
+                              max_overflow=server_manager.max_overflow, pool_timeout=server_manager.pool_timeout,
+                              pool_recycle=server_manager.pool_recycle, pool_pre_ping=server_manager.pool_pre_ping)
+            engine = create_async_engine(db_url, **kwargs)
+            label_pool(engine.sync_engine, f"async/{schema_name}")
+            instrument_engine(engine.sync_engine)
+            logger.info(f"Successfully created async SQLAlchemy engine for schema: {schema_name}")
+            return engine
+        except Exception as e:
+            logger.error(f"Failed to create async SQLAlchemy engine: {e}")
+            raise e
+
+    async def set_schema(self, schema_name: str):
+        """Binds the session factory to a new async engine for the given schema."""
+        try:
+            if self.engine:
+                await self.engine.dispose()
+            self.engine = self.create_engine(schema_name)
+            self.schema_name = schema_name
+            self.SessionLocal.configure(bind=self.engine)
+            logger.info(f"Async engine bound to schema: {schema_name}")
+        except Exception as e:
+            logger.error(f"Failed to bind async engine to schema {schema_name}: {e}")
+            raise RuntimeError(f"Error switching to schema: {schema_name}") from e
+
+    def get_session(self) -> "AsyncSession":
+        """Returns a new AsyncSession; the caller is responsible for closing it."""
+        if self.engine is None:
+            raise RuntimeError("No async database engine set. Call 'set_schema' first.")
+        return self.SessionLocal()
+
+    def after_fork(self):
+        """Forget the parent's async engine in a forked worker."""
+        if self.engine is not None:
+            self.engine.sync_engine.dispose(close=False)
+            self.engine = None
+            self.schema_name = None
+
+    async def dispose(self):
+        """Closes all pooled connections."""
+        if self.engine:
+            await self.engine.dispose()
@@ -4,7 +4,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from utils.LoggingConfig import LoggerManager
 
 # Initialize logger
-logger = LoggerManager().get_logger()
+logger = LoggerManager().get_logger(__name__)
 
 
 class DatabaseConfig:
@@ -12,13 +12,20 @@ class DatabaseConfig:
     def __init__(self, secret: dict):
         self.secret = secret
 
-    def get_db_url(self, schema_name=None) -> str:
-        """Returns the database URL for creating an engine."""
-        db_url = f"mysql+pymysql://{self.secret['username']}:{self.secret['password']}@{self.secret['host']}:{self.secret.get('port', 3306)}/"
+    def get_db_url(self, schema_name=None, driver: str = "mysql+pymysql", host: str = None) -> str:
+        """Returns the database URL for creating an engine. `host` overrides the primary host (e.g. a replica)."""
+        db_url = f"{driver}://{self.secret['username']}:{self.secret['password']}@{host or self.secret['host']}:{self.secret.get('port', 3306)}/"
         if schema_name:
             db_url += schema_name
         return db_url
 
+    def replica_hosts(self) -> list:
+        """Read-replica hosts from the secret's `read_replicas` entry (a list or comma-separated string)."""
+        replicas = self.secret.get('read_replicas') or []
+        if isinstance(replicas, str):
+            replicas = replicas.split(',')
+        return [host.strip() for host in replicas if host.strip()]
+
     def schema_exists(self, schema_name: str) -> bool:
         """Checks if the specified schema exists in the database."""
         try:
@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from sqlalchemy.engine import Engine
+
+from utils.LoggingConfig import LoggerManager
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+
+class SchemaCapacityError(RuntimeError):
+    """Raised when no pool can be opened for a schema without exceeding the connection budget."""
+
+
+def engine_capacity(engine: Engine) -> int:
+    """Maximum number of connections an engine's pool may open."""
+    pool = engine.pool
+    size = pool.size() if hasattr(pool, 'size') else 1
+    return size + max(getattr(pool, '_max_overflow', 0), 0)
+
+
+class _RegisteredEngine:
+    __slots__ = ('engine', 'capacity', 'last_used', 'pinned')
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.capacity = engine_capacity(engine)
+        self.last_used = time.monotonic()
+        self.pinned = False
+
+
+class EngineRegistry:
+    """Keeps one pooled engine per schema instead of disposing and rebuilding on every switch.
+
+    Engines are kept in LRU order. Opening a new schema first evicts idle pools (no
+    checked-out connections) that have not been used for ``idle_timeout`` seconds, then,
+    if ``max_engines`` or ``max_total_connections`` would still be exceeded, the least
+    recently used idle pools. Pools with connections in use are never evicted.
+    """
+
+    def __init__(self, engine_factory: Callable[[Hashable], Engine], max_engines: int = 8,
+                 max_total_connections: int = 200, idle_timeout: float = 600.0):
+        self.engine_factory = engine_factory
+        self.max_engines = max_engines
+        self.max_total_connections = max_total_connections
+        self.idle_timeout = idle_timeout
+        self._engines: "OrderedDict[str, _RegisteredEngine]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "evicted": 0, "hits": 0}
+
+    def get(self, schema_name: str, pin: bool = False) -> Engine:
+        """Return the engine for a schema, creating its pool on first use.
+
+        Pinned engines (the default schema) are never evicted.
+        """
+        with self._lock:
+            entry = self._engines.get(schema_name)
+            if entry is not None:
+                entry.pinned = entry.pinned or pin
+                entry.last_used = time.monotonic()
+                self._engines.move_to_end(schema_name)
+                self._stats["hits"] += 1
+                return entry.engine
+
+            engine = self.engine_factory(schema_name)
+            entry = _RegisteredEngine(engine)
+            entry.pinned = pin
+            try:
+                self._make_room(entry.capacity)
+            except SchemaCapacityError:
+                engine.dispose()
+                raise
+            self._engines[schema_name] = entry
+            self._stats["created"] += 1
+            return engine
+
+    def _total_capacity(self) -> int:
+        return sum(entry.capacity for entry in self._engines.values())
+
+    def _make_room(self, needed: int):
+        """Evict idle pools until `needed` more connections fit the budget. Caller holds the lock."""
+        now = time.monotonic()
+        for schema_name, entry in list(self._engines.items()):
+            if now - entry.last_used >= self.idle_timeout and self._is_idle(entry):
+                self._evict(schema_name)
+
+        for schema_name, entry in list(self._engines.items()):
+            if (len(self._engines) < self.max_engines
+                    and self._total_capacity() + needed <= self.max_total_connections):
+                return
+            if self._is_idle(entry):
+                self._evict(schema_name)
+
+        if len(self._engines) >= self.max_engines or self._total_capacity() + needed > self.max_total_connections:
+            raise SchemaCapacityError("Connection budget exhausted: all schema pools are in use.")
+
+    @staticmethod
+    def _is_idle(entry: _RegisteredEngine) -> bool:
+        if entry.pinned:
+            return False
+        checkedout = getattr(entry.engine.pool, 'checkedout', None)
+        return checkedout is None or checkedout() == 0
+
+    def _evict(self, schema_name: str):
+        entry = self._engines.pop(schema_name)
+        entry.engine.dispose()
+        self._stats["evicted"] += 1
+        logger.info(f"Evicted idle connection pool for schema: {schema_name}")
+
+    def dispose_all(self, close: bool = True):
+        """Dispose every pool, e.g. on shutdown.
+
+        In a forked child, pass ``close=False`` to drop the inherited connections without
+        closing them, since they still belong to the parent.
+        """
+        with self._lock:
+            for entry in self._engines.values():
+                entry.engine.dispose(close=close)
+            self._engines.clear()
+
+    def unpin(self, schema_name: str):
+        with self._lock:
+            entry = self._engines.get(schema_name)
+            if entry is not None:
+                entry.pinned = False
+
+    def schemas(self) -> list:
+        with self._lock:
+            return list(self._engines)
+
+    def items(self) -> list:
+        """(key, engine) pairs for every open pool."""
+        with self._lock:
+            return [(key, entry.engine) for key, entry in self._engines.items()]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, engines=len(self._engines), total_capacity=self._total_capacity(),
+                        max_total_connections=self.max_total_connections)
+
+    def peek(self, schema_name: str) -> Optional[Engine]:
+        """Return the engine for a schema if it is already registered."""
+        with self._lock:
+            entry = self._engines.get(schema_name)
+            return entry.engine if entry else None
@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Sequence
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_header(export_format: str, columns: Sequence[str]) -> str:
+    """The text sent before the first row: the CSV header line, nothing for NDJSON."""
+    if export_format == "csv":
+        return encode_rows(export_format, columns, [columns])
+    return ""
+
+
+def encode_rows(export_format: str, columns: Sequence[str], rows: Iterable[Sequence]) -> str:
+    """Encode a batch of row tuples as one block of NDJSON or CSV text."""
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            [value.isoformat() if isinstance(value, date) else value for value in row] for row in rows
+        )
+        return buffer.getvalue()
+    return "".join(json.dumps(dict(zip(columns, row)), default=_json_default) + "\n" for row in rows)
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Gzip a stream of text blocks, flushing after each block so output is sent as it is produced."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def gzip_chunks_async(chunks: AsyncIterable[str]) -> AsyncIterator[bytes]:
+    """Async counterpart of gzip_chunks."""
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -1,10 +1,206 @@
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import random
+import sys
+import threading
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+REQUEST_ID_HEADER = os.getenv('REQUEST_ID_HEADER', 'X-Request-ID')
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - [%(request_id)s] %(name)s - %(message)s'
+
+_request_id: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, 'request_id', None),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps records with the current request ID; runs on the calling thread, before queueing."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get() or '-'
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a fraction of the records below WARNING from selected loggers (and their children).
+
+    ``rates`` maps logger names to the fraction kept, e.g. {"security.login": 0.1}.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, Optional[float]] = {}
+
+    def _rate(self, name: str) -> Optional[float]:
+        rate = self._resolved.get(name, False)
+        if rate is False:
+            rate, candidate = None, name
+            while candidate:
+                if candidate in self.rates:
+                    rate = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition('.')[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        return rate is None or random.random() < rate
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback here, but leave formatting to the listener's handler
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_sampling(value: str) -> Dict[str, float]:
+    """Parse LOG_SAMPLING, e.g. ``security.login=0.1,services=0.5``."""
+    rates = {}
+    for item in value.split(','):
+        name, _, rate = item.partition('=')
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
 
 
 class LoggerManager:
+    """Configures logging once per process and hands out named loggers.
+
+    Records are filtered and stamped with the request ID on the calling thread, then
+    put on a bounded queue; a QueueListener thread does the formatting and I/O, so
+    request threads never block on the log stream. LOG_FORMAT (json|text), LOG_LEVEL,
+    LOG_QUEUE_SIZE and LOG_SAMPLING configure it.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        # Singleton
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(LoggerManager, cls).__new__(cls)
+                cls._instance._init_once()
+        return cls._instance
+
+    def _init_once(self):
+        if not hasattr(self, 'initialized'):
+            output = logging.StreamHandler(sys.stdout)
+            if os.getenv('LOG_FORMAT', 'json').lower() == 'json':
+                output.setFormatter(JsonFormatter())
+            else:
+                output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+            self.queue_size = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+            self.queue_handler = _NonBlockingQueueHandler(queue.Queue(self.queue_size))
+            self.queue_handler.addFilter(SamplingFilter(_parse_sampling(os.getenv('LOG_SAMPLING', ''))))
+            self.queue_handler.addFilter(RequestContextFilter())
+            self.listener = QueueListener(self.queue_handler.queue, output, respect_handler_level=True)
+
+            root = logging.getLogger()
+            root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+            root.handlers = [self.queue_handler]
+            self.listener.start()
+            self.running = True
+            atexit.register(self.shutdown)
+            self.initialized = True
 
     @staticmethod
-    def get_logger():
-        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-        logging.getLogger(__name__)
-        return logging
+    def get_logger(name: str = 'project_watch') -> logging.Logger:
+        return logging.getLogger(name)
+
+    def shutdown(self):
+        """Flush queued records and stop the listener thread."""
+        if self.running:
+            self.running = False
+            self.listener.stop()
+
+    def after_fork(self):
+        """Start a listener in a forked child; the parent's listener thread does not survive the fork."""
+        self.queue_handler.queue = queue.Queue(self.queue_size)
+        self.listener = QueueListener(self.queue_handler.queue, *self.listener.handlers, respect_handler_level=True)
+        self.listener.start()
+        self.running = True
+
+    def get_stats(self) -> dict:
+        return {"queued": self.queue_handler.queue.qsize(), "dropped": self.queue_handler.dropped}
+
+
+class RequestIdMiddleware:
+    """ASGI middleware that assigns each request an ID for log correlation.
+
+    An incoming REQUEST_ID_HEADER is reused, otherwise a new ID is generated; either
+    way it is echoed on the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = REQUEST_ID_HEADER.lower().encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope.get("headers", [])).get(self.header)
+        request_id = incoming.decode('latin-1')[:128] if incoming else uuid.uuid4().hex
+        token = _request_id.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = dict(message, headers=list(message.get("headers", [])) + [
+                    (self.header, request_id.encode('latin-1'))
+                ])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_id.reset(token)
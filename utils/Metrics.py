@@ -0,0 +1,246 @@
+import bisect
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond cache hits to multi-second bulk calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_enabled() -> bool:
+    return os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Sequence[Tuple[str, object]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(list(zip(self.labelnames, key)), value))
+        return lines
+
+    def _render_sample(self, labels: list, value) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class _HistogramValue:
+    __slots__ = ('buckets', 'count', 'total')
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.count = 0
+        self.total = 0.0
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; an observation is one bisect and three additions under a lock."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = _HistogramValue(len(self.upper_bounds) + 1)
+            entry.buckets[index] += 1
+            entry.count += 1
+            entry.total += value
+
+    def _render_sample(self, labels: list, value: _HistogramValue) -> List[str]:
+        lines, cumulative = [], 0
+        for bound, count in zip(self.upper_bounds + (float('inf'),), value.buckets):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', _format_value(bound))])} {cumulative}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {value.count}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(value.total)}")
+        return lines
+
+
+class CollectedMetric:
+    """A metric family computed at scrape time by a collector, e.g. from a component's get_stats()."""
+
+    def __init__(self, name: str, kind: str, documentation: str,
+                 samples: Iterable[Tuple[dict, float]] = ()):
+        self.name = name
+        self.kind = kind
+        self.documentation = documentation
+        self.samples = list(samples)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.samples:
+            lines.append(f"{self.name}{_format_labels(list(labels.items()))} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide set of metrics rendered in the Prometheus text format.
+
+    Hot paths only update in-memory metrics; component statistics that already exist
+    (pools, caches, the hashing queue) are read by collectors when /metrics is scraped.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        # Singleton
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(MetricsRegistry, cls).__new__(cls)
+                cls._instance._init_once()
+        return cls._instance
+
+    def _init_once(self):
+        if not hasattr(self, 'initialized'):
+            self._metrics: Dict[str, _Metric] = {}
+            self._collectors: List[Callable[[], Iterable[CollectedMetric]]] = []
+            self._registry_lock = threading.Lock()
+            self.initialized = True
+
+    def _get_or_create(self, metric_class, name: str, *args, **kwargs):
+        with self._registry_lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[CollectedMetric]]):
+        with self._registry_lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._registry_lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            for family in collector():
+                lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and the number of in-flight requests.
+
+    Routes are labelled by their path template (e.g. /user/read/{user_id}) so label
+    cardinality stays bounded; requests that match no route share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        registry = MetricsRegistry()
+        self.latency = registry.histogram(
+            "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status"))
+        self.in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight.dec()
+            route = scope.get("route")
+            self.latency.observe(time.perf_counter() - start, method=scope["method"],
+                                 route=getattr(route, "path", "unmatched"), status=status_code)
+
+
+def stats_metrics(prefix: str, documentation: str, stats: Optional[dict], counters: Sequence[str] = (),
+                  gauges: Sequence[str] = (), labels: Optional[dict] = None) -> List[CollectedMetric]:
+    """Turn selected keys of a component's get_stats() dict into collected metrics."""
+    if stats is None:
+        return []
+    labels = labels or {}
+    families = [CollectedMetric(f"{prefix}_{key}_total", "counter", f"{documentation}: {key}.",
+                                [(labels, stats[key])]) for key in counters if key in stats]
+    families += [CollectedMetric(f"{prefix}_{key}", "gauge", f"{documentation}: {key}.",
+                                 [(labels, stats[key])]) for key in gauges if key in stats]
+    return families
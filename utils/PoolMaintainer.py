@@ -0,0 +1,145 @@
+import threading
+import time
+from typing import Callable, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from utils.LoggingConfig import LoggerManager
+from utils.PoolMetrics import TimedQueuePool
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+
+def _record_connect_time(dbapi_connection, connection_record):
+    connection_record.info['connected_at'] = time.monotonic()
+
+
+def track_connection_age(engine: Engine):
+    """Remember when each pooled connection was opened, so the maintainer can recycle old ones."""
+    if not event.contains(engine.pool, "connect", _record_connect_time):
+        event.listen(engine.pool, "connect", _record_connect_time)
+
+
+class PoolMaintainer:
+    """Keeps pools warm and fresh from a background thread, off the request path.
+
+    Every ``interval`` seconds each idle connection is briefly checked out, one at a
+    time: connections that will reach ``recycle`` seconds of age before the next run
+    are replaced, the rest are pinged (which also resets the server's idle timeout),
+    and the pool is topped back up to ``warm_size`` connections. Only connections already
+    idle are taken, so maintenance never opens an overflow connection or waits for one.
+    Only the sync TimedQueuePools are maintained.
+    """
+
+    def __init__(self, pools: Callable[[], List[Tuple[str, Engine]]], interval: float = 60.0,
+                 recycle: float = 1800.0, warm_size: int = 0):
+        self.pools = pools
+        self.interval = interval
+        self.recycle = recycle
+        self.warm_size = warm_size
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {"runs": 0, "pinged": 0, "recycled": 0, "broken": 0, "opened": 0, "last_run": None}
+
+    def start(self):
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pool-maintainer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for label, engine in self.pools():
+                try:
+                    self.maintain(engine)
+                except Exception as e:
+                    logger.warning(f"Maintenance of connection pool {label} failed: {e}")
+            with self._lock:
+                self._stats["runs"] += 1
+                self._stats["last_run"] = time.time()
+
+    def warm(self, engine: Engine, size: int = None) -> int:
+        """Open connections until `size` (default warm_size) are pooled; returns how many were opened."""
+        pool = engine.pool
+        if not isinstance(pool, TimedQueuePool):
+            return 0
+        size = min(self.warm_size if size is None else size, pool.size())
+        opened_before = pool.checkedin() + pool.checkedout()
+        if opened_before >= size:
+            return 0  # Nothing to open; do not drain a warm pool
+        # The pool only opens a connection when none is idle, so the idle ones are held meanwhile
+        held = []
+        try:
+            connection = pool.connect_idle()
+            while connection is not None:
+                held.append(connection)
+                connection = pool.connect_idle()
+            for _ in range(size - opened_before):
+                held.append(pool.connect())
+        finally:
+            for connection in held:
+                connection.close()
+        opened = max(pool.checkedin() + pool.checkedout() - opened_before, 0)
+        with self._lock:
+            self._stats["opened"] += opened
+        return opened
+
+    def maintain(self, engine: Engine):
+        """One pass over an engine's idle connections: recycle old ones, ping the rest, top up."""
+        pool = engine.pool
+        if not isinstance(pool, TimedQueuePool):
+            return
+        # Replace connections that would otherwise hit pool_recycle on a request before the next run
+        max_age = self.recycle - self.interval
+        pinged, recycled, broken = 0, 0, 0
+        # One connection at a time, so requests still find idle ones; the pool is FIFO, so
+        # checkedin() checkouts visit each idle connection once
+        for _ in range(pool.checkedin()):
+            connection = pool.connect_idle()
+            if connection is None:
+                break  # Requests took the remaining idle connections
+            try:
+                connected_at = connection.info.get('connected_at', time.monotonic())
+                if self.recycle > 0 and time.monotonic() - connected_at >= max_age:
+                    connection.invalidate()
+                    recycled += 1
+                    continue
+                try:
+                    engine.dialect.do_ping(connection.dbapi_connection)
+                    pinged += 1
+                except Exception:
+                    connection.invalidate()
+                    broken += 1
+            finally:
+                if connection.dbapi_connection is not None:
+                    connection.close()
+
+        with self._lock:
+            self._stats["pinged"] += pinged
+            self._stats["recycled"] += recycled
+            self._stats["broken"] += broken
+        if recycled or broken:
+            logger.info(f"Replaced {recycled} aged and {broken} broken pooled connections")
+            # Invalidated connections were returned last and reconnect on their next checkout;
+            # check them out here, again one at a time, so the reconnect is not paid by a request
+            for _ in range(recycled + broken):
+                connection = pool.connect_idle()
+                if connection is None:
+                    break
+                connection.close()
+        self.warm(engine)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, interval=self.interval, recycle=self.recycle, warm_size=self.warm_size,
+                        running=self._thread is not None)
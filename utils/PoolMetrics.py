@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import deque
+from typing import Iterable, List, Tuple
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.util import queue as sqla_queue
+
+from utils.Metrics import CollectedMetric, MetricsRegistry
+
+CHECKOUT_WAIT = MetricsRegistry().histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection.", ("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+RECENT_WAITS = 1000
+
+
+class _NoIdleConnection(Exception):
+    pass
+
+
+class _TimedCheckout:
+    """Records how long each checkout waited for a connection, including opening an overflow one.
+
+    The last RECENT_WAITS waits are also kept per pool for the /health/pool report.
+    """
+    metrics_label = "default"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.recent_waits = deque(maxlen=RECENT_WAITS)
+        self._idle_only = threading.local()
+
+    def connect_idle(self):
+        """Check out a connection that is idle in the pool, or return None; never opens one or waits."""
+        self._idle_only.active = True
+        try:
+            return self.connect()
+        except _NoIdleConnection:
+            return None
+        finally:
+            self._idle_only.active = False
+
+    def _do_get(self):
+        if getattr(self._idle_only, 'active', False):
+            try:
+                return self._pool.get(False)
+            except sqla_queue.Empty:
+                raise _NoIdleConnection()
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.recent_waits.append(elapsed)
+            CHECKOUT_WAIT.observe(elapsed, pool=self.metrics_label)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label  # engine.dispose() swaps in a recreated pool
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def label_pool(engine, label: str):
+    """Name an engine's pool in the pool metrics."""
+    pool = engine.pool
+    if isinstance(pool, _TimedCheckout):
+        pool.metrics_label = label
+
+
+def wait_summary(pool) -> dict:
+    """Checkout wait statistics over a pool's recent checkouts, in milliseconds."""
+    recent = getattr(pool, 'recent_waits', None)
+    waits = sorted(recent.copy()) if recent is not None else []  # copy() is atomic; iterating is not
+    if not waits:
+        return {"samples": 0}
+    return {
+        "samples": len(waits),
+        "avg_ms": round(sum(waits) / len(waits) * 1000, 3),
+        "p95_ms": round(waits[max(int(len(waits) * 0.95) - 1, 0)] * 1000, 3),
+        "max_ms": round(waits[-1] * 1000, 3),
+    }
+
+
+def collect_pool_metrics(engines: Iterable[Tuple[str, Engine]]) -> List[CollectedMetric]:
+    """Size and usage of each pool, read when /metrics is scraped."""
+    size = CollectedMetric("db_pool_size", "gauge", "Configured pool size.")
+    checked_out = CollectedMetric("db_pool_checked_out", "gauge", "Connections currently checked out.")
+    idle = CollectedMetric("db_pool_idle", "gauge", "Connections idle in the pool.")
+    overflow = CollectedMetric("db_pool_overflow", "gauge", "Connections open beyond the pool size.")
+    for label, engine in engines:
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        labels = {"pool": label}
+        size.samples.append((labels, pool.size()))
+        checked_out.samples.append((labels, pool.checkedout()))
+        idle.samples.append((labels, pool.checkedin()))
+        overflow.samples.append((labels, max(pool.overflow(), 0)))
+    return [size, checked_out, idle, overflow]
@@ -0,0 +1,137 @@
+import os
+import time
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from utils.LoggingConfig import LoggerManager
+from utils.Metrics import MetricsRegistry
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+SLOW_QUERY_SECONDS = float(os.getenv('SLOW_QUERY_MS', '200')) / 1000
+# A statement run this many times in one request is reported as a likely N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', '10'))
+
+_metrics = MetricsRegistry()
+QUERY_DURATION = _metrics.histogram("db_query_duration_seconds", "Duration of individual SQL statements.")
+SLOW_QUERIES = _metrics.counter("db_slow_queries_total", "SQL statements slower than SLOW_QUERY_MS.")
+REQUEST_QUERIES = _metrics.histogram(
+    "db_request_queries", "SQL statements executed per request.", ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 500),
+)
+REQUEST_DB_TIME = _metrics.histogram("db_request_time_seconds", "Total SQL time per request.", ("route",))
+N_PLUS_ONE = _metrics.counter("db_n_plus_one_suspected_total", "Requests that repeated one statement "
+                                                                "N_PLUS_ONE_THRESHOLD times or more.", ("route",))
+
+
+def instrumentation_enabled() -> bool:
+    return os.getenv('DB_INSTRUMENTATION', 'true').lower() == 'true'
+
+
+class RequestQueryStats:
+    """SQL statements and time spent in the database by one request."""
+    __slots__ = ('count', 'seconds', 'statements')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = StatementCounter()
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar('request_query_stats', default=None)
+
+
+def redact_parameters(parameters):
+    """Keep the shape of bound parameters for logging, never their values."""
+    if isinstance(parameters, dict):
+        return {key: "?" for key in parameters}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} parameter sets>"
+        return ["?"] * len(parameters)
+    return "?" if parameters is not None else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start_time'].pop()
+    QUERY_DURATION.observe(elapsed)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.statements[statement] += 1
+    if elapsed >= SLOW_QUERY_SECONDS:
+        SLOW_QUERIES.inc()
+        logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {statement} "
+                       f"parameters={redact_parameters(parameters)}")
+
+
+def _handle_error(exception_context):
+    # The failed statement never reaches after_cursor_execute; drop its start time
+    starts = exception_context.connection.info.get('query_start_time') if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine):
+    """Attach the timing listeners to an engine (for async engines, pass engine.sync_engine)."""
+    if not instrumentation_enabled() or event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _report_request(route: str, stats: RequestQueryStats):
+    REQUEST_QUERIES.observe(stats.count, route=route)
+    REQUEST_DB_TIME.observe(stats.seconds, route=route)
+    if not stats.statements:
+        return
+    statement, repeats = stats.statements.most_common(1)[0]
+    if repeats >= N_PLUS_ONE_THRESHOLD:
+        N_PLUS_ONE.inc(route=route)
+        logger.warning(f"Possible N+1 on {route}: statement ran {repeats} times in one request: {statement}")
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware that totals SQL statements and DB time per request.
+
+    The totals so far are sent as ``X-DB-Query-Count`` and ``Server-Timing: db;dur=<ms>``
+    headers (statements run while a streaming body is sent are counted in the metrics
+    only), recorded per route in the metrics, and checked for repeated statements.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append((b"server-timing", f"db;dur={stats.seconds * 1000:.1f}".encode()))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            route = scope.get("route")
+            _report_request(getattr(route, "path", "unmatched"), stats)
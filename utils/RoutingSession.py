@@ -0,0 +1,38 @@
+import random
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Delete, Insert, Update
+
+
+class RoutingSession(Session):
+    """Session that sends plain reads to a read replica and everything else to the primary.
+
+    The replica engines are passed in ``info["replicas"]``. A session stays on the primary
+    when ``info["use_primary"]`` is set (explicit read-your-writes), and automatically once
+    it has flushed anything, so reads that follow a write in the same request see it.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replicas = self.info.get("replicas")
+        if not replicas or self.info.get("use_primary") or self.info.get("wrote") or self._flushing:
+            return super().get_bind(mapper, clause=clause, **kw)
+        if isinstance(clause, (Insert, Update, Delete)):
+            return super().get_bind(mapper, clause=clause, **kw)
+        if getattr(clause, "_for_update_arg", None) is not None:
+            return super().get_bind(mapper, clause=clause, **kw)  # Locking reads belong on the primary
+
+        replica = self.info.get("replica")
+        if replica is None:
+            # Pin one replica per session so its reads are consistent with each other
+            replica = self.info["replica"] = random.choice(replicas)
+        return replica
+
+    def use_primary(self):
+        """Route every following statement of this session to the primary."""
+        self.info["use_primary"] = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_written(session, flush_context):
+    session.info["wrote"] = True
@@ -0,0 +1,239 @@
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from utils.LoggingConfig import LoggerManager
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+
+class SecretProvider(ABC):
+    """Base class for anything that can resolve a secret name to a dict."""
+
+    @abstractmethod
+    def fetch(self, secret_name: str) -> dict:
+        """The secret's contents; raises when it cannot be retrieved."""
+
+
+class AwsSecretProvider(SecretProvider):
+    """Reads secrets from AWS Secrets Manager, reusing a single client."""
+
+    def __init__(self, region_name: Optional[str] = None):
+        self.region_name = region_name
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    def _get_client(self):
+        with self._client_lock:
+            if self._client is None:
+                import boto3  # Imported on first use; it is slow to import and unused by other providers
+                session = boto3.session.Session()
+                self._client = session.client(service_name='secretsmanager', region_name=self.region_name)
+            return self._client
+
+    def fetch(self, secret_name: str) -> dict:
+        client = self._get_client()
+        from botocore.exceptions import ClientError
+        try:
+            response = client.get_secret_value(SecretId=str(secret_name))
+            secret = response.get('SecretString', '{}')
+            logger.info("Successfully retrieved secret from AWS Secrets Manager.")
+            return json.loads(secret)
+        except ClientError as e:
+            logger.error(f"Failed to retrieve secret: {e}")
+            raise RuntimeError("Error retrieving secret from AWS Secrets Manager.") from e
+
+
+class EnvSecretProvider(SecretProvider):
+    """Reads secrets from environment variables or JSON files, for offline use.
+
+    A secret named ``Project_Watch`` is looked up in ``SECRET_PROJECT_WATCH`` first,
+    then in ``<secret_dir>/Project_Watch.json``.
+    """
+
+    def __init__(self, secret_dir: Optional[str] = None):
+        self.secret_dir = secret_dir
+
+    @staticmethod
+    def env_key(secret_name: str) -> str:
+        return "SECRET_" + re.sub(r'[^A-Za-z0-9]', '_', str(secret_name)).upper()
+
+    def fetch(self, secret_name: str) -> dict:
+        raw = os.getenv(self.env_key(secret_name))
+        if raw is None and self.secret_dir:
+            path = os.path.join(self.secret_dir, f"{secret_name}.json")
+            if os.path.isfile(path):
+                with open(path) as f:
+                    raw = f.read()
+        if raw is None:
+            raise RuntimeError(f"Secret '{secret_name}' not found in environment or secret directory.")
+        try:
+            return json.loads(raw)
+        except ValueError as e:
+            raise RuntimeError(f"Secret '{secret_name}' is not valid JSON.") from e
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only view of a parsed secret: mappings become MappingProxyType and lists tuples, recursively."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class _CachedSecret:
+    __slots__ = ('value', 'fetched_at', 'retry_at', 'refreshing')
+
+    def __init__(self, value: Mapping, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.retry_at = 0.0
+        self.refreshing = False
+
+
+class CachedSecretProvider(SecretProvider):
+    """Caches another provider's secrets in process with a TTL.
+
+    Entries older than ``ttl - refresh_ahead`` are refreshed on a background thread
+    while the cached value keeps being served. Once an entry has expired, the first
+    caller refreshes it and the others get the cached value meanwhile. A failed refresh
+    is retried after ``retry_interval`` seconds, and the last good value is served for
+    at most ``max_staleness`` seconds past the TTL; after that callers fetch the secret
+    themselves, one at a time, and see the provider's error if it is still failing.
+
+    Cached secrets are shared by every caller, so they are returned read-only; the same
+    object is returned until the secret is refetched.
+    """
+
+    def __init__(self, provider: SecretProvider, ttl: float = 300.0, refresh_ahead: float = 30.0,
+                 max_staleness: float = 3600.0, retry_interval: float = 30.0):
+        self.provider = provider
+        self.ttl = ttl
+        self.refresh_ahead = min(refresh_ahead, ttl)
+        self.max_staleness = max_staleness
+        self.retry_interval = retry_interval
+        self._cache: Dict[str, _CachedSecret] = {}
+        self._loading: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "fetches": 0, "refreshes": 0, "refresh_failures": 0,
+                       "stale_served": 0, "stale_expired": 0}
+
+    def fetch(self, secret_name: str) -> Mapping:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(secret_name)
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < self.ttl - self.refresh_ahead:
+                    self._stats["hits"] += 1
+                    return entry.value
+                if age < self.ttl:
+                    self._stats["hits"] += 1
+                    self._schedule_refresh(secret_name, entry, now)
+                    return entry.value
+                if age < self.ttl + self.max_staleness:
+                    if entry.refreshing or now < entry.retry_at:
+                        self._stats["stale_served"] += 1
+                        return entry.value
+                    # This caller refreshes; the others keep getting the cached value meanwhile
+                    entry.refreshing = True
+                else:
+                    self._stats["stale_expired"] += 1
+                    del self._cache[secret_name]
+                    entry = None
+            self._stats["misses"] += 1
+
+        if entry is None:
+            return self._load_once(secret_name)
+
+        try:
+            value = self._load(secret_name)
+            with self._lock:
+                self._stats["refreshes"] += 1
+            return value
+        except Exception as e:
+            with self._lock:
+                self._stats["refresh_failures"] += 1
+                self._stats["stale_served"] += 1
+                entry.retry_at = time.monotonic() + self.retry_interval
+            logger.warning(f"Serving stale secret '{secret_name}' after refresh failure: {e}")
+            return entry.value
+        finally:
+            entry.refreshing = False
+
+    def _load(self, secret_name: str) -> Mapping:
+        value = _freeze(self.provider.fetch(secret_name))
+        with self._lock:
+            self._stats["fetches"] += 1
+            self._cache[secret_name] = _CachedSecret(value, time.monotonic())
+        return value
+
+    def _load_once(self, secret_name: str) -> Mapping:
+        """Fetch a secret with no usable cached value, one caller per secret at a time."""
+        with self._lock:
+            loading = self._loading.setdefault(secret_name, threading.Lock())
+        with loading:
+            # Another caller may have loaded it while this one waited
+            with self._lock:
+                entry = self._cache.get(secret_name)
+                if entry is not None and time.monotonic() - entry.fetched_at < self.ttl:
+                    return entry.value
+            return self._load(secret_name)
+
+    def _schedule_refresh(self, secret_name: str, entry: _CachedSecret, now: float):
+        """Start a background refresh for an entry nearing expiry. Caller holds the lock."""
+        if entry.refreshing or now < entry.retry_at:
+            return
+        entry.refreshing = True
+        threading.Thread(target=self._refresh, args=(secret_name, entry), daemon=True).start()
+
+    def _refresh(self, secret_name: str, entry: _CachedSecret):
+        try:
+            self._load(secret_name)
+            with self._lock:
+                self._stats["refreshes"] += 1
+        except Exception as e:
+            with self._lock:
+                self._stats["refresh_failures"] += 1
+                entry.retry_at = time.monotonic() + self.retry_interval
+            logger.warning(f"Background refresh of secret '{secret_name}' failed: {e}")
+        finally:
+            entry.refreshing = False
+
+    def invalidate(self, secret_name: Optional[str] = None):
+        """Drop one cached secret, or all of them."""
+        with self._lock:
+            if secret_name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(secret_name, None)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, cached=len(self._cache))
+
+
+def build_secret_provider(region_name: Optional[str] = None) -> CachedSecretProvider:
+    """Build the secret provider selected by the SECRET_PROVIDER environment variable."""
+    provider_name = os.getenv('SECRET_PROVIDER', 'aws').lower()
+    if provider_name == 'aws':
+        provider = AwsSecretProvider(region_name)
+    elif provider_name in ('env', 'file'):
+        provider = EnvSecretProvider(os.getenv('SECRET_DIR'))
+    else:
+        raise RuntimeError(f"Unknown secret provider: {provider_name}")
+
+    return CachedSecretProvider(
+        provider,
+        ttl=float(os.getenv('SECRET_CACHE_TTL', '300')),
+        refresh_ahead=float(os.getenv('SECRET_REFRESH_AHEAD', '30')),
+        max_staleness=float(os.getenv('SECRET_MAX_STALENESS', '3600')),
+        retry_interval=float(os.getenv('SECRET_RETRY_INTERVAL', '30')),
+    )
@@ -1,20 +1,29 @@
-import json
-import boto3
-from botocore.exceptions import ClientError
-from dotenv import load_dotenv
 import os
-from sqlalchemy import create_engine, QueuePool
+from typing import Optional
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
 
 from utils.DatabaseConfig import DatabaseConfig
+from utils.EngineRegistry import EngineRegistry
+from utils.RoutingSession import RoutingSession
 from utils.LoggingConfig import LoggerManager
+from utils.PoolMaintainer import PoolMaintainer, track_connection_age
+from utils.PoolMetrics import TimedQueuePool, label_pool
+from utils.QueryInstrumentation import instrument_engine
+from utils.SecretProvider import build_secret_provider
+from utils.WorkerRuntime import split_pool, worker_connection_budget
 import threading
 
-# Load environment variables
-load_dotenv()
-
 # Initialize logger
-logger = LoggerManager().get_logger()
+logger = LoggerManager().get_logger(__name__)
+
+# Server schemas that are never served to clients, even when listed in ALLOWED_SCHEMAS
+SYSTEM_SCHEMAS = frozenset(('mysql', 'sys', 'information_schema', 'performance_schema'))
+
+
+def session_schema(session) -> Optional[str]:
+    """Name of the schema (database) a session is bound to."""
+    return session.get_bind().url.database
 
 
 class ServerManager:
@@ -34,30 +43,71 @@ class ServerManager:
         if not hasattr(self, 'initialized'):
             self.secret_name = secret_name or os.getenv('SECRET_NAME')
             self.region_name = region_name or os.getenv('REGION_NAME')
-            self.secret = self.get_secret(os.getenv('SECRET_NAME'))
+            self.secret_provider = build_secret_provider(self.region_name)
+            self.secret = self.get_secret(self.secret_name)
             self.config = DatabaseConfig(self.secret)
 
             # Session and engine setup
             self.engine = None
-            self.SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+            self.default_schema = None
+            # DB_MAX_TOTAL_CONNECTIONS is shared by all workers on the host; each pool fits this worker's share
+            self.connection_budget = worker_connection_budget(int(os.getenv('DB_MAX_TOTAL_CONNECTIONS', '200')))
+            # Optional read replicas (secret entry `read_replicas`), one pool per replica and schema
+            self.replica_hosts = self.config.replica_hosts()
+            # The primary and each replica get an equal part of the budget, shared by their schema pools
+            self.host_budget = max(self.connection_budget // (1 + len(self.replica_hosts)), 1)
+            # In async mode the async engine takes one more engine's share of the primary's budget
+            from utils.AsyncServerManager import is_async_mode  # Imported here; that module imports this one
+            self.async_slots = 1 if is_async_mode() else 0
+            self.engine_budget = max(self.host_budget // (self.schema_slots() + self.async_slots),
+                                     int(os.getenv('DB_POOL_MIN_PER_SCHEMA', '2')))
+            self.pool_size, self.max_overflow = split_pool(self.engine_budget,
+                                                           int(os.getenv('DB_POOL_SIZE', '10')),
+                                                           int(os.getenv('DB_MAX_OVERFLOW', '20')))
+            self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+            # Recycle below the server's wait_timeout so no pooled connection is closed under us
+            self.pool_recycle = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+            self.pool_pre_ping = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+            self.engines = EngineRegistry(
+                self.create_engine,
+                max_engines=int(os.getenv('DB_MAX_SCHEMAS', '8')),
+                max_total_connections=max(self.host_budget - self.async_slots * self.engine_budget,
+                                          self.engine_budget),
+                idle_timeout=float(os.getenv('DB_SCHEMA_IDLE_TIMEOUT', '600')),
+            )
+            self.replica_engines = EngineRegistry(
+                lambda key: self.create_engine(key[1], host=key[0]),
+                max_engines=int(os.getenv('DB_MAX_SCHEMAS', '8')) * max(len(self.replica_hosts), 1),
+                max_total_connections=self.connection_budget - self.host_budget,
+                idle_timeout=float(os.getenv('DB_SCHEMA_IDLE_TIMEOUT', '600')),
+            )
+            self.pool_maintainer = self._build_pool_maintainer()
+            self.SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
             self.scoped_session = None
             self.initialized = True
 
-    def create_engine(self, schema_name=None):
-        """Creates a SQLAlchemy engine, optionally for a specific schema."""
+    def create_engine(self, schema_name=None, host=None):
+        """Creates a SQLAlchemy engine, optionally for a specific schema and host (e.g. a read replica)."""
 
         # Generate the database URL using the DatabaseConfig class
-        db_url = self.config.get_db_url(schema_name)
+        db_url = self.config.get_db_url(schema_name, host=host)
 
         try:
             # Create and return the SQLAlchemy engine
             engine = create_engine(
                 db_url,  # The database URL for connection
-                poolclass=QueuePool,  # Use QueuePool for connection pooling
-                pool_size=10,  # The number of connections to keep open in the pool
-                max_overflow=20,  # The maximum number of connections to create beyond pool_size
-                echo=True  # Log all SQL statements (useful for debugging)
+                poolclass=TimedQueuePool,  # QueuePool that records checkout wait time
+                pool_size=self.pool_size,  # The number of connections to keep open in the pool
+                max_overflow=self.max_overflow,  # The maximum number of connections to create beyond pool_size
+                pool_timeout=self.pool_timeout,  # Seconds to wait for a connection before giving up
+                pool_recycle=self.pool_recycle,  # Replace connections older than this (the maintainer does it first)
+                pool_pre_ping=self.pool_pre_ping,  # Test connections on checkout
+                # SQL logging for local debugging only; QueryInstrumentation times and reports statements
+                echo=os.getenv('DB_ECHO', 'false').lower() == 'true'
             )
+            label_pool(engine, f"{host or 'primary'}/{schema_name}")
+            track_connection_age(engine)
+            instrument_engine(engine)
             logger.info(f"Successfully created SQLAlchemy engine for schema: {schema_name}")
             return engine
         except Exception as e:
@@ -74,41 +124,109 @@ class ServerManager:
             raise RuntimeError("No default schema provided.")
 
     def switch_schema(self, schema_name: str):
-        """Switches to a different schema."""
+        """Switches the default schema. Pools for other schemas stay open in the registry."""
         try:
             logger.info(f"Switching to schema: {schema_name}")
-            self.close_session()
-            if self.engine:
-                self.engine.dispose()  # Dispose of the current engine (unbind)
-            self.engine = self.create_engine(schema_name)
+            engine = self.engines.get(schema_name, pin=True)
+            if self.default_schema and self.default_schema != schema_name:
+                self.engines.unpin(self.default_schema)
+            self.engine = engine
+            self.default_schema = schema_name
             self.SessionLocal.configure(bind=self.engine)
-            self.scoped_session = scoped_session(self.SessionLocal)
+            if self.scoped_session is None:
+                self.scoped_session = scoped_session(self.SessionLocal)
             logger.info(f"Successfully switched to schema: {schema_name}")
         except Exception as e:
             logger.error(f"Failed to switch to schema {schema_name}: {e}")
             raise RuntimeError(f"Error switching to schema: {schema_name}") from e
 
+    def _build_pool_maintainer(self) -> PoolMaintainer:
+        return PoolMaintainer(
+            self.pools,
+            interval=float(os.getenv('DB_POOL_MAINTENANCE_INTERVAL', '60')),
+            recycle=self.pool_recycle,
+            warm_size=min(int(os.getenv('DB_POOL_WARM_SIZE', str(self.pool_size))), self.pool_size),
+        )
+
+    def start_pool_maintenance(self, warm: bool = True):
+        """Pre-warm the default schema's pool and start recycling connections in the background.
+
+        Without `warm` the pools are only maintained; in async mode requests use the async
+        engine, and the sync pools open connections only when something needs them.
+        """
+        if warm:
+            opened = self.pool_maintainer.warm(self.engine)
+            logger.info(f"Pre-warmed {opened} connections for schema: {self.default_schema}")
+        self.pool_maintainer.start()
+
     def get_session(self):
         """Retrieves a new session from the current engine."""
         if self.scoped_session is None:
             raise RuntimeError("No database engine set. Call 'switch_schema' first.")
         return self.scoped_session()
 
+    def new_session(self, schema_name=None, use_primary: bool = False):
+        """Creates a standalone session outside the scoped registry, bound to the given schema
+        (or the default one). Reads go to a replica when replicas are configured, unless
+        `use_primary` is set."""
+        if self.scoped_session is None:
+            raise RuntimeError("No database engine set. Call 'switch_schema' first.")
+        schema_name = schema_name or self.default_schema
+        info = {"replicas": self.get_replica_engines(schema_name), "use_primary": use_primary}
+        if schema_name != self.default_schema:
+            return self.SessionLocal(bind=self.engines.get(schema_name), info=info)
+        return self.SessionLocal(info=info)
+
+    def get_replica_engines(self, schema_name) -> list:
+        """Pooled engines for every configured read replica of a schema."""
+        return [self.replica_engines.get((host, schema_name)) for host in self.replica_hosts]
+
+    @staticmethod
+    def allowed_schemas() -> set:
+        """Schemas listed in ALLOWED_SCHEMAS, besides the default one."""
+        return {name.strip() for name in os.getenv('ALLOWED_SCHEMAS', '').split(',') if name.strip()}
+
+    def schema_slots(self) -> int:
+        """How many schema pools this worker may hold at once: the default plus the allowlisted ones."""
+        return max(min(int(os.getenv('DB_MAX_SCHEMAS', '8')), len(self.allowed_schemas()) + 1), 1)
+
+    def is_known_schema(self, schema_name: str) -> bool:
+        """Checks a requested schema against ALLOWED_SCHEMAS; without that allowlist only the default schema is served."""
+        if schema_name.lower() in SYSTEM_SCHEMAS:
+            return False
+        return schema_name == self.default_schema or schema_name in self.allowed_schemas()
+
     def close_session(self):
         """Closes and removes the current session."""
         if self.scoped_session:
             self.scoped_session.remove()
 
+    def dispose(self):
+        """Closes every schema's connection pool."""
+        self.pool_maintainer.stop()
+        self.close_session()
+        self.engines.dispose_all()
+        self.replica_engines.dispose_all()
+
+    def after_fork(self):
+        """Forget the parent's engines in a forked worker; the lifespan then builds the worker's own."""
+        self.pool_maintainer = self._build_pool_maintainer()  # The parent's thread did not survive the fork
+        self.engines.dispose_all(close=False)
+        self.replica_engines.dispose_all(close=False)
+        self.engine = None
+        self.default_schema = None
+        self.scoped_session = None
+        self.SessionLocal.configure(bind=None)
+
     def get_secret(self, secret_name):
-        """Retrieves the secret from AWS Secrets Manager."""
-        session = boto3.session.Session()
-        client = session.client(service_name='secretsmanager', region_name=self.region_name)
+        """Retrieves a secret through the cached secret provider."""
+        return self.secret_provider.fetch(str(secret_name))
 
-        try:
-            response = client.get_secret_value(SecretId=str(secret_name))
-            secret = response.get('SecretString', '{}')
-            logger.info("Successfully retrieved secret from AWS Secrets Manager.")
-            return json.loads(secret)
-        except ClientError as e:
-            logger.error(f"Failed to retrieve secret: {e}")
-            raise RuntimeError("Error retrieving secret from AWS Secrets Manager.") from e
+    def pools(self) -> list:
+        """(label, engine) for every open primary and replica pool."""
+        return ([(f"primary/{schema}", engine) for schema, engine in self.engines.items()]
+                + [(f"{host}/{schema}", engine) for (host, schema), engine in self.replica_engines.items()])
+
+    def get_secret_stats(self) -> dict:
+        """Returns hit/miss/refresh counters for the secret cache."""
+        return self.secret_provider.get_stats()
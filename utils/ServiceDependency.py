@@ -1,24 +1,68 @@
-from fastapi import Depends
-from typing import Type, TypeVar, Generic
+import os
+import re
+from fastapi import Depends, HTTPException, Request, status
+from typing import Type, TypeVar, Generic, Optional
+from utils.AsyncServerManager import AsyncServerManager
+from utils.EngineRegistry import SchemaCapacityError
 from utils.ServerManager import ServerManager
 from sqlalchemy.orm import Session
 
 T = TypeVar('T')
 
+# Header a client sends to have its request served from another schema (tenant)
+SCHEMA_HEADER = os.getenv('SCHEMA_HEADER', 'X-Schema')
+_SCHEMA_NAME = re.compile(r'^[A-Za-z0-9_]{1,64}$')
+
+# Header a client sends to read from the primary instead of a replica (read-your-writes)
+READ_PRIMARY_HEADER = os.getenv('READ_PRIMARY_HEADER', 'X-Read-Primary')
+
 
 class GenericDependencies(Generic[T]):
     def __init__(self, service_class: Type[T], db_manager: ServerManager, session: Session):
         self.db_manager = db_manager
-        self.service = service_class(session)  # Pass the session directly to the service
+        # Services only bind the session; their password context and token settings are
+        # process-wide singletons (see security.AuthConfig), so this is cheap per request.
+        self.service = service_class(session)
 
     def get_service(self) -> T:
         return self.service
 
 
+def get_server_manager() -> ServerManager:
+    return ServerManager()
+
+
+def resolve_request_schema(request: Request) -> Optional[str]:
+    """Return the schema requested through SCHEMA_HEADER, or None for the default schema."""
+    schema_name = request.headers.get(SCHEMA_HEADER)
+    if not schema_name:
+        return None
+    if not _SCHEMA_NAME.match(schema_name) or not ServerManager().is_known_schema(schema_name):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown schema '{schema_name}'")
+    return schema_name
+
+
+def wants_primary(request: Request) -> bool:
+    """True when the client asked for read-your-writes through READ_PRIMARY_HEADER."""
+    return request.headers.get(READ_PRIMARY_HEADER, '').lower() in ('1', 'true', 'yes')
+
+
+def open_request_session(db_manager: ServerManager, schema_name: Optional[str], use_primary: bool = False):
+    """Open a session on the schema's pooled engine, mapping an exhausted budget to 503."""
+    try:
+        return db_manager.new_session(schema_name, use_primary=use_primary)
+    except SchemaCapacityError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e),
+                            headers={"Retry-After": "1"})
+
+
 # Factory function to create the dependency with the specific service class
 def get_service_dependency(service_class: Type[T]):
-    def _get_dependency(db_manager: ServerManager = Depends(lambda: ServerManager())) -> GenericDependencies[T]:
-        session = db_manager.get_session()  # Get the session from the ServerManager
+    def _get_dependency(request: Request,
+                        db_manager: ServerManager = Depends(get_server_manager)) -> GenericDependencies[T]:
+        # A dedicated session per request: the thread-local scoped session can be shared by
+        # concurrent requests because dependencies and endpoints run on different pool threads
+        session = open_request_session(db_manager, resolve_request_schema(request), wants_primary(request))
         try:
             deps = GenericDependencies(service_class, db_manager, session)
             yield deps
@@ -28,3 +72,34 @@ def get_service_dependency(service_class: Type[T]):
     return _get_dependency
 
 
+def get_async_server_manager() -> AsyncServerManager:
+    return AsyncServerManager()
+
+
+def reject_async_routing(request: Request):
+    """Refuse SCHEMA_HEADER and READ_PRIMARY_HEADER in async mode, which has one engine for the default schema.
+
+    Serving such a request from the default schema would silently cross tenants.
+    """
+    schema_name = request.headers.get(SCHEMA_HEADER)
+    if schema_name and schema_name != AsyncServerManager().schema_name:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"{SCHEMA_HEADER} is not supported with DB_MODE=async")
+    if request.headers.get(READ_PRIMARY_HEADER) is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"{READ_PRIMARY_HEADER} is not supported with DB_MODE=async")
+
+
+# Async variant: binds an AsyncSession from the AsyncServerManager for the request
+def get_async_service_dependency(service_class: Type[T]):
+    async def _get_dependency(
+            request: Request,
+            db_manager: AsyncServerManager = Depends(get_async_server_manager)) -> GenericDependencies[T]:
+        reject_async_routing(request)
+        session = db_manager.get_session()
+        try:
+            yield GenericDependencies(service_class, db_manager, session)
+        finally:
+            await session.close()
+
+    return _get_dependency
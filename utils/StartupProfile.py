@@ -0,0 +1,134 @@
+"""Cold-start profiling: import time of the application and the duration of each startup phase.
+
+The phases recorded by the application lifespan are logged once startup completes and
+exported as ``app_startup_seconds{phase=...}``. Run as a module for an import-time report
+of a fresh interpreter (no database or secrets are touched while importing):
+
+    python -m utils.StartupProfile --top 25
+    python -m utils.StartupProfile --json > startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from utils.LoggingConfig import LoggerManager
+from utils.Metrics import MetricsRegistry
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+STARTUP_SECONDS = MetricsRegistry().gauge("app_startup_seconds", "Duration of each application startup phase.",
+                                          ("phase",))
+
+
+class StartupProfile:
+    """Wall-clock time of the startup phases, measured from when this module was first imported."""
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        # Singleton
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(StartupProfile, cls).__new__(cls)
+                cls._instance._init_once()
+        return cls._instance
+
+    def _init_once(self):
+        if not hasattr(self, 'initialized'):
+            self.started = time.perf_counter()
+            self.phases: Dict[str, float] = {}
+            self.initialized = True
+
+    def record(self, phase: str, seconds: float):
+        self.phases[phase] = seconds
+        STARTUP_SECONDS.set(seconds, phase=phase)
+
+    def mark_imported(self):
+        """Record the time spent importing the application, up to the caller."""
+        self.record("imports", time.perf_counter() - self.started)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def report(self):
+        """Log the phases and record the total time since the first import."""
+        self.record("total", time.perf_counter() - self.started)
+        summary = ", ".join(f"{phase}={seconds * 1000:.0f}ms" for phase, seconds in self.phases.items())
+        logger.info(f"Startup profile: {summary}")
+
+
+def parse_importtime(output: str) -> List[dict]:
+    """Parse ``python -X importtime`` output into one entry per module (times in seconds)."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append({"module": name.strip(), "self": int(self_us) / 1e6,
+                        "cumulative": int(cumulative_us) / 1e6, "depth": (len(name) - len(name.lstrip())) // 2})
+    return modules
+
+
+def profile_imports(module: str) -> List[dict]:
+    """Import `module` in a fresh interpreter with -X importtime and return the parsed timings."""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, cwd=os.getcwd())
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Report where cold-start import time goes.")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--top", type=int, default=20, help="Number of modules to list")
+    parser.add_argument("--json", action="store_true", help="Print a JSON report instead of a table")
+    args = parser.parse_args(argv)
+
+    modules = profile_imports(args.module)
+    total = sum(entry["cumulative"] for entry in modules if entry["depth"] == 0)
+    application = [entry for entry in modules if entry["module"] == args.module]
+    slowest = sorted(modules, key=lambda entry: entry["self"], reverse=True)[:args.top]
+    # Top-level packages (e.g. sqlalchemy, boto3) by the import time of their outermost module
+    packages: Dict[str, float] = {}
+    for entry in modules:
+        package = entry["module"].split(".")[0]
+        if package == args.module.split(".")[0]:
+            continue
+        if entry["cumulative"] > packages.get(package, 0):
+            packages[package] = entry["cumulative"]
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    if args.json:
+        print(json.dumps({
+            "module": args.module,
+            "total_seconds": round(total, 4),
+            "module_seconds": round(application[0]["cumulative"], 4) if application else None,
+            "packages": [{"package": name, "cumulative": round(seconds, 4)} for name, seconds in heaviest],
+            "slowest_modules": [{"module": entry["module"], "self": round(entry["self"], 4)} for entry in slowest],
+        }, indent=2))
+        return
+
+    print(f"Importing {args.module}: {total * 1000:.1f} ms in total ({len(modules)} modules)\n")
+    print("Heaviest packages (cumulative):")
+    for name, seconds in heaviest:
+        print(f"  {seconds * 1000:9.1f} ms  {name}")
+    print("\nSlowest modules (self):")
+    for entry in slowest:
+        print(f"  {entry['self'] * 1000:9.1f} ms  {entry['module']}")
+
+
+if __name__ == "__main__":
+    main()
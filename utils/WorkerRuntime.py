@@ -0,0 +1,81 @@
+import os
+import time
+from typing import Tuple
+
+from utils.LoggingConfig import LoggerManager
+
+# Initialize logger
+logger = LoggerManager().get_logger(__name__)
+
+_started_at = time.time()
+
+# anyio's default number of threads for sync routes
+DEFAULT_THREADPOOL_SIZE = 40
+
+
+def worker_count() -> int:
+    """Number of server worker processes sharing this host's connection budget (WEB_CONCURRENCY)."""
+    return max(int(os.getenv('WEB_CONCURRENCY', '1')), 1)
+
+
+def worker_connection_budget(total_connections: int) -> int:
+    """This worker's share of a connection budget meant for all workers together."""
+    return max(total_connections // worker_count(), 1)
+
+
+def worker_cpu_share() -> int:
+    """This worker's share of the host's CPUs, for sizing per-worker process pools."""
+    return max((os.cpu_count() or 1) // worker_count(), 1)
+
+
+def split_pool(budget: int, pool_size: int, max_overflow: int) -> Tuple[int, int]:
+    """Shrink a pool's size and overflow so that together they fit `budget` connections."""
+    pool_size = max(min(pool_size, budget), 1)
+    return pool_size, max(min(max_overflow, budget - pool_size), 0)
+
+
+def size_threadpool(reserved: int) -> int:
+    """Size the threadpool that runs sync routes to the default plus `reserved` threads (THREADPOOL_SIZE overrides).
+
+    Must be called from the event loop, e.g. in the lifespan.
+    """
+    from anyio import to_thread
+
+    limiter = to_thread.current_default_thread_limiter()
+    limiter.total_tokens = int(os.getenv('THREADPOOL_SIZE', str(DEFAULT_THREADPOOL_SIZE + reserved)))
+    return limiter.total_tokens
+
+
+def after_fork():
+    """Drop the resources a forked worker inherited from its parent.
+
+    Connections, the logging thread and the hashing pool belong to the parent process;
+    the worker builds its own on first use (engines are rebuilt by the lifespan). Only
+    singletons that already exist are touched.
+    """
+    global _started_at
+    _started_at = time.time()
+
+    from security.AuthConfig import AuthConfig
+    from utils.AsyncServerManager import AsyncServerManager
+    from utils.ServerManager import ServerManager
+
+    if LoggerManager._instance is not None:
+        LoggerManager._instance.after_fork()
+    if ServerManager._instance is not None:
+        ServerManager._instance.after_fork()
+    if AsyncServerManager._instance is not None:
+        AsyncServerManager._instance.after_fork()
+    if AuthConfig._instance is not None:
+        AuthConfig._instance.password_hasher.after_fork()
+        AuthConfig._instance.revocation_store.after_fork()
+    logger.info(f"Worker {os.getpid()} reset inherited connections and thread pools after fork")
+
+
+def worker_info() -> dict:
+    """Identity of the current worker process, for per-worker health reports."""
+    return {
+        "pid": os.getpid(),
+        "workers": worker_count(),
+        "uptime_seconds": round(time.time() - _started_at, 1),
+    }